@@ -0,0 +1,47 @@
+#!/usr/bin/python3
+"""Benchmark of the aggregate command with each way of computing it.
+
+Usage: python3 -m benchmarks.bench_aggregate [number of places]
+"""
+import os
+import sys
+import tempfile
+import time
+from console import HBNBCommand
+from models import storage
+from models.engine.file_storage import FileStorage
+
+specs = [("avg", "price_by_night"), ("count", None)]
+
+
+def measure(n, columnar, aggregated, repeat=20):
+    """Returns the plan and seconds per aggregate over n places."""
+    FileStorage._FileStorage__columnar = ["Place"] if columnar else []
+    FileStorage._FileStorage__aggregated = (
+        {"Place": [(name, "city_id") for function, name in specs]}
+        if aggregated else {})
+    FileStorage._FileStorage__objects = {}
+    for i in range(n):
+        p = storage.classes()["Place"]()
+        p.city_id = "city {}".format(i % 100)
+        p.price_by_night = i % 500
+    console = HBNBCommand()
+    start = time.perf_counter()
+    for i in range(repeat):
+        plan, results = console._aggregate("Place", specs, "city_id", [])
+    return plan, (time.perf_counter() - start) / repeat
+
+
+def main(n):
+    """Prints the time of avg and count by city for each way."""
+    with tempfile.TemporaryDirectory() as tmp:
+        FileStorage._FileStorage__file_path = os.path.join(tmp, "file.json")
+        print("{:<12} {:>12}".format("plan", "ms"))
+        for columnar, aggregated in ((False, False), (True, False),
+                                     (False, True)):
+            plan, seconds = measure(n, columnar, aggregated)
+            print("{:<12} {:>12.3f}".format(plan, seconds * 1000))
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
@@ -0,0 +1,76 @@
+#!/usr/bin/python3
+"""Benchmark of the all command printing a list, and streaming it.
+
+Usage: python3 -m benchmarks.bench_all [number of objects]
+"""
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from console import HBNBCommand
+from models import storage
+from models.engine.file_storage import FileStorage
+
+
+class Output:
+
+    """Class for an output recording the time of the first write."""
+
+    def __init__(self):
+        """Initialization of an Output."""
+        self.first = None
+        self.size = 0
+
+    def write(self, s):
+        """Records the write of s."""
+        if self.first is None:
+            self.first = time.perf_counter()
+        self.size += len(s)
+
+    def flush(self):
+        """Does nothing."""
+        pass
+
+
+def listed(line):
+    """Runs the all command as it was, building the list to print."""
+    l = [str(obj) for obj in storage.all(line or None).values()]
+    print(l)
+
+
+def measure(command, line):
+    """Returns the time to the first byte, total time and peak memory."""
+    out = Output()
+    stdout = sys.stdout
+    tracemalloc.start()
+    start = time.perf_counter()
+    sys.stdout = out
+    try:
+        command(line)
+    finally:
+        sys.stdout = stdout
+    end = time.perf_counter()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return out.first - start, end - start, peak
+
+
+def main(n):
+    """Prints the measures of both ways for n places."""
+    with tempfile.TemporaryDirectory() as tmp:
+        FileStorage._FileStorage__file_path = os.path.join(tmp, "file.json")
+        FileStorage._FileStorage__objects = {}
+        for i in range(n):
+            storage.classes()["Place"]().name = "Place {}".format(i)
+        print("{:<10} {:>12} {:>10} {:>10}".format(
+            "all", "first byte", "total", "peak MB"))
+        for name, command in (("list", listed),
+                              ("stream", HBNBCommand().do_all)):
+            first, total, peak = measure(command, "Place")
+            print("{:<10} {:>11.4f}s {:>9.3f}s {:>10.1f}".format(
+                name, first, total, peak / 2 ** 20))
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
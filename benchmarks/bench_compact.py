@@ -0,0 +1,50 @@
+#!/usr/bin/python3
+"""Memory benchmark of the regular and the compact model classes.
+
+Usage: python3 -m benchmarks.bench_compact [number of objects]
+"""
+import sys
+import tracemalloc
+from datetime import datetime
+from models import storage
+from models.engine.compact import compact_classes
+
+
+def record(classname, i):
+    """Returns a dictionary as stored in file.json for classname."""
+    d = {"id": "{:032x}".format(i),
+         "created_at": datetime.now().isoformat(),
+         "updated_at": datetime.now().isoformat(),
+         "__class__": classname}
+    for name, kind in storage.attributes()[classname].items():
+        if kind is str:
+            d[name] = "{}-{}".format(name, i)
+        elif kind in (int, float):
+            d[name] = kind(i)
+    return d
+
+
+def measure(cls, records):
+    """Returns the memory in bytes per instance of cls built from records."""
+    tracemalloc.start()
+    objs = [cls(**r) for r in records]
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del objs
+    return size / len(records)
+
+
+def main(n):
+    """Prints the memory per object of both representations."""
+    classes = storage.classes()
+    compact = compact_classes(classes, storage.attributes())
+    print("{:<10} {:>10} {:>10}".format("class", "regular", "compact"))
+    for classname, cls in classes.items():
+        records = [record(classname, i) for i in range(n)]
+        print("{:<10} {:>8.0f} B {:>8.0f} B".format(
+            classname, measure(cls, records),
+            measure(compact[classname], records)))
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 50000)
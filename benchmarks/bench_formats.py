@@ -0,0 +1,51 @@
+#!/usr/bin/python3
+"""Benchmark of the JSON and binary snapshot formats.
+
+Usage: python3 -m benchmarks.bench_formats [number of objects]
+"""
+import os
+import sys
+import tempfile
+import time
+from models import storage
+from models.engine.file_storage import FileStorage
+from models.engine.serializers import serializers
+from benchmarks.bench_compact import record
+
+
+def measure(serializer):
+    """Returns the size, save time and reload time of a format."""
+    FileStorage._FileStorage__serializer = serializer
+    storage.save()
+    obj = next(iter(storage.all().values()))
+    obj.name = serializer.name
+    start = time.perf_counter()
+    storage.save()
+    saved = time.perf_counter() - start
+    start = time.perf_counter()
+    storage.reload()
+    reloaded = time.perf_counter() - start
+    path = os.path.splitext(FileStorage._FileStorage__file_path)[0]
+    return os.path.getsize(path + serializer.extension), saved, reloaded
+
+
+def main(n):
+    """Prints the size, save and reload times of every format."""
+    with tempfile.TemporaryDirectory() as tmp:
+        FileStorage._FileStorage__file_path = os.path.join(tmp, "file.json")
+        FileStorage._FileStorage__objects = {}
+        classes = storage.classes()
+        names = ["Place"] * 3 + list(classes)
+        for i in range(n):
+            d = record(names[i % len(names)], i)
+            storage.new(classes[d["__class__"]](**d))
+        print("{:<8} {:>10} {:>8} {:>8}".format(
+            "format", "size", "save", "reload"))
+        for serializer in serializers.values():
+            size, saved, reloaded = measure(serializer)
+            print("{:<8} {:>8.1f}MB {:>7.2f}s {:>7.2f}s".format(
+                serializer.name, size / 1e6, saved, reloaded))
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
@@ -0,0 +1,45 @@
+#!/usr/bin/python3
+"""Throughput benchmark of console commands with and without group commit.
+
+Usage: python3 -m benchmarks.bench_group_commit [number of commands]
+"""
+import io
+import os
+import sys
+import tempfile
+import time
+from contextlib import redirect_stdout
+from console import HBNBCommand
+from models import storage
+from models.engine.file_storage import FileStorage
+
+
+def measure(group_commit, n):
+    """Returns the commands per second of n create and update commands."""
+    FileStorage._FileStorage__objects = {}
+    FileStorage._FileStorage__group_commit = group_commit
+    console = HBNBCommand()
+    start = time.perf_counter()
+    with redirect_stdout(io.StringIO()) as out:
+        for i in range(n // 2):
+            console.onecmd("create Place")
+            uid = out.getvalue().rsplit("\n", 2)[-2]
+            console.onecmd("update Place {} name \"{}\"".format(uid, i))
+        console.onecmd("quit")
+    return n / (time.perf_counter() - start)
+
+
+def main(n):
+    """Prints the throughput of both modes."""
+    with tempfile.TemporaryDirectory() as tmp:
+        FileStorage._FileStorage__file_path = os.path.join(tmp, "file.json")
+        print("{:<14} {:>12}".format("mode", "commands/s"))
+        for group_commit in (False, True):
+            print("{:<14} {:>12.0f}".format(
+                "group commit" if group_commit else "save",
+                measure(group_commit, n)))
+        storage.flush()
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
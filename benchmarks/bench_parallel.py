@@ -0,0 +1,48 @@
+#!/usr/bin/python3
+"""Benchmark of reload() with an increasing number of worker processes.
+
+Usage: python3 -m benchmarks.bench_parallel [number of objects]
+"""
+import os
+import sys
+import tempfile
+import time
+from models import storage
+from models.engine.file_storage import FileStorage
+from benchmarks.bench_compact import record
+
+
+def measure(workers):
+    """Returns the seconds reload() takes with workers processes."""
+    FileStorage._FileStorage__workers = workers
+    start = time.perf_counter()
+    storage.reload()
+    return time.perf_counter() - start
+
+
+def main(n):
+    """Prints the reload time and speedup for 1 to cpu_count workers."""
+    with tempfile.TemporaryDirectory() as tmp:
+        FileStorage._FileStorage__file_path = os.path.join(tmp, "file.json")
+        classes = storage.classes()
+        FileStorage._FileStorage__objects = {}
+        for i in range(n):
+            classname = list(classes)[i % len(classes)]
+            d = record(classname, i)
+            storage.new(classes[classname](**d))
+        storage.save()
+        counts = [1]
+        while counts[-1] * 2 <= (os.cpu_count() or 1):
+            counts.append(counts[-1] * 2)
+        if counts[-1] != os.cpu_count():
+            counts.append(os.cpu_count() or 1)
+        base = measure(0)
+        print("{:<8} {:>10} {:>8}".format("workers", "reload", "speedup"))
+        print("{:<8} {:>9.2f}s {:>7.2f}x".format("none", base, 1))
+        for workers in counts:
+            t = measure(workers)
+            print("{:<8} {:>9.2f}s {:>7.2f}x".format(workers, t, base / t))
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200000)
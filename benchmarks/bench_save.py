@@ -0,0 +1,48 @@
+#!/usr/bin/python3
+"""Latency benchmark of save() under each fsync policy.
+
+Usage: python3 -m benchmarks.bench_save [number of objects] [saves]
+"""
+import os
+import sys
+import tempfile
+import time
+from models import storage
+from models.base_model import BaseModel
+from models.engine.file_storage import FileStorage
+
+
+def measure(policy, objs, saves):
+    """Returns the sorted latencies in seconds of saves with policy."""
+    FileStorage._FileStorage__fsync = policy
+    FileStorage._FileStorage__synced = None
+    latencies = []
+    for i in range(saves):
+        objs[i % len(objs)].number = i
+        start = time.perf_counter()
+        storage.save()
+        latencies.append(time.perf_counter() - start)
+    return sorted(latencies)
+
+
+def main(n, saves):
+    """Prints the save latencies of every policy."""
+    with tempfile.TemporaryDirectory() as tmp:
+        FileStorage._FileStorage__file_path = os.path.join(tmp, "file.json")
+        FileStorage._FileStorage__objects = {}
+        objs = [BaseModel() for i in range(n)]
+        storage.save()
+        print("{:<8} {:>10} {:>10} {:>10} {:>10}".format(
+            "policy", "mean", "p50", "p99", "saves/s"))
+        for policy in ("never", "batched", "always"):
+            latencies = measure(policy, objs, saves)
+            mean = sum(latencies) / len(latencies)
+            print("{:<8} {:>8.2f}ms {:>8.2f}ms {:>8.2f}ms {:>10.0f}".format(
+                policy, mean * 1000,
+                latencies[len(latencies) // 2] * 1000,
+                latencies[int(len(latencies) * 0.99)] * 1000, 1 / mean))
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1000,
+         int(sys.argv[2]) if len(sys.argv) > 2 else 200)
@@ -0,0 +1,58 @@
+#!/usr/bin/python3
+"""Throughput benchmark of the shared mode with several writer processes.
+
+Usage: python3 -m benchmarks.bench_shared [saves per writer] [objects]
+"""
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+from models import storage
+from models.base_model import BaseModel
+from models.engine.file_storage import FileStorage
+
+
+def writer(saves):
+    """Creates and updates objects, saving after each change."""
+    storage.reload()
+    for i in range(saves):
+        o = BaseModel()
+        o.save()
+        o.number = i
+        o.save()
+
+
+def measure(writers, saves):
+    """Returns the saves per second of writers processes."""
+    context = multiprocessing.get_context("fork")
+    processes = [context.Process(target=writer, args=(saves,))
+                 for i in range(writers)]
+    start = time.perf_counter()
+    for p in processes:
+        p.start()
+    for p in processes:
+        p.join()
+    return writers * saves * 2 / (time.perf_counter() - start)
+
+
+def main(saves, n):
+    """Prints the throughput and lost objects for 1 to 8 writers."""
+    with tempfile.TemporaryDirectory() as tmp:
+        FileStorage._FileStorage__file_path = os.path.join(tmp, "file.json")
+        FileStorage._FileStorage__shared = True
+        FileStorage._FileStorage__objects = {}
+        for i in range(n):
+            BaseModel()
+        storage.save()
+        print("{:<8} {:>8} {:>8}".format("writers", "saves/s", "lost"))
+        for writers in (1, 2, 4, 8):
+            before = storage.count()
+            rate = measure(writers, saves)
+            lost = before + writers * saves - storage.count()
+            print("{:<8} {:>8.0f} {:>8}".format(writers, rate, lost))
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 50,
+         int(sys.argv[2]) if len(sys.argv) > 2 else 1000)
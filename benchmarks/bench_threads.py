@@ -0,0 +1,63 @@
+#!/usr/bin/python3
+"""Stress benchmark of the thread-safe mode with many threads.
+
+Usage: python3 -m benchmarks.bench_threads [operations per thread]
+"""
+import os
+import sys
+import tempfile
+import threading
+import time
+from models import storage
+from models.engine.file_storage import FileStorage
+
+
+def worker(classname, operations, errors):
+    """Creates, updates and destroys objects, saving now and then."""
+    cls = storage.classes()[classname]
+    try:
+        for i in range(operations):
+            o = cls()
+            o.number = i
+            if i % 2:
+                storage.delete(o)
+            if i % 50 == 0:
+                storage.save()
+    except Exception as e:
+        errors.append(e)
+
+
+def measure(threads, operations):
+    """Returns the operations per second and the errors of threads."""
+    FileStorage._FileStorage__objects = {}
+    classes = sorted(storage.classes())
+    errors = []
+    workers = [threading.Thread(target=worker,
+                                args=(classes[i % len(classes)],
+                                      operations, errors))
+               for i in range(threads)]
+    start = time.perf_counter()
+    for t in workers:
+        t.start()
+    for t in workers:
+        t.join()
+    storage.save()
+    return threads * operations / (time.perf_counter() - start), errors
+
+
+def main(operations):
+    """Prints the throughput and errors for 1 to 32 threads."""
+    with tempfile.TemporaryDirectory() as tmp:
+        FileStorage._FileStorage__file_path = os.path.join(tmp, "file.json")
+        FileStorage._FileStorage__threadsafe = True
+        print("{:<8} {:>8} {:>8}".format("threads", "ops/s", "errors"))
+        for threads in (1, 4, 16, 32):
+            rate, errors = measure(threads, operations)
+            expected = threads * ((operations + 1) // 2)
+            if storage.count() != expected:
+                errors.append("lost objects")
+            print("{:<8} {:>8.0f} {:>8}".format(threads, rate, len(errors)))
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 500)
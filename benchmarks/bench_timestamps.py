@@ -0,0 +1,61 @@
+#!/usr/bin/python3
+"""Micro-benchmark of the per-object cost of reload().
+
+Usage: python3 -m benchmarks.bench_timestamps [number of objects]
+"""
+import sys
+import timeit
+from datetime import datetime
+from models import storage
+
+
+def records(n):
+    """Returns n dictionaries as stored in file.json, for every class."""
+    records = []
+    for classname, cls in storage.classes().items():
+        for i in range(n // len(storage.classes())):
+            o = cls.__new__(cls)
+            o.__dict__.update({"id": "{:032x}".format(i),
+                               "created_at": datetime.now(),
+                               "updated_at": datetime.now()})
+            records.append(o.to_dict())
+    return records
+
+
+def strptime_init(obj, **kwargs):
+    """Builds obj from kwargs the way BaseModel did with strptime."""
+    for key in kwargs:
+        if key == "created_at":
+            obj.__dict__["created_at"] = datetime.strptime(
+                kwargs["created_at"], "%Y-%m-%dT%H:%M:%S.%f")
+        elif key == "updated_at":
+            obj.__dict__["updated_at"] = datetime.strptime(
+                kwargs["updated_at"], "%Y-%m-%dT%H:%M:%S.%f")
+        else:
+            obj.__dict__[key] = kwargs[key]
+
+
+def before(records, classes):
+    """Builds instances with strptime."""
+    for r in records:
+        cls = classes[r["__class__"]]
+        strptime_init(cls.__new__(cls), **r)
+
+
+def after(records, classes):
+    """Builds instances with BaseModel.__init__."""
+    for r in records:
+        classes[r["__class__"]](**r)
+
+
+def main(n):
+    """Prints the cost per object of both decoding paths."""
+    data = records(n)
+    classes = storage.classes()
+    for name, fn in (("strptime", before), ("fromisoformat", after)):
+        t = min(timeit.repeat(lambda: fn(data, classes), number=1, repeat=5))
+        print("{:<14} {:8.2f} us/object".format(name, t / len(data) * 1e6))
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 70000)
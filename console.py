@@ -2,10 +2,19 @@
 """Module for the entry point of the command interpreter."""
 
 import cmd
+import contextlib
+import csv
+import itertools
+from datetime import datetime
+from io import StringIO
 from models.base_model import BaseModel
 from models import storage
+from models.engine.aggregates import Aggregate, functions
+from models.engine.columns import operators
 import re
 import json
+import sys
+import uuid
 
 
 class HBNBCommand(cmd.Cmd):
@@ -13,6 +22,9 @@ class HBNBCommand(cmd.Cmd):
     """Class for the command interpreter."""
 
     prompt = "(hbnb) "
+    chunk_size = 10000
+    _undo = None
+    _failed = False
 
     def default(self, line):
         """Catch commands if nothing else matches then."""
@@ -22,7 +34,7 @@ class HBNBCommand(cmd.Cmd):
     def _precmd(self, line):
         """Intercepts commands to test for class.syntax()"""
         # print("PRECMD:::", line)
-        match = re.search(r"^(\w*)\.(\w+)(?:\(([^)]*)\))$", line)
+        match = re.search(r"^(\w*)\.(\w+)(?:\((.*)\))$", line)
         if not match:
             return line
         classname = match.group(1)
@@ -62,26 +74,32 @@ class HBNBCommand(cmd.Cmd):
         elif uid is None:
             print("** instance id missing **")
         else:
-            key = "{}.{}".format(classname, uid)
-            if key not in storage.all():
+            obj = storage.get(classname, uid)
+            if obj is None:
                 print("** no instance found **")
             else:
                 attributes = storage.attributes()[classname]
+                self._touch(obj)
                 for attribute, value in d.items():
                     if attribute in attributes:
                         value = attributes[attribute](value)
-                    setattr(storage.all()[key], attribute, value)
-                storage.all()[key].save()
+                    setattr(obj, attribute, value)
+                try:
+                    self._save(obj)
+                except PermissionError:
+                    print("** storage is read-only **")
 
     def do_EOF(self, line):
         """Handles End Of File character.
         """
+        storage.flush()
         print()
         return True
 
     def do_quit(self, line):
         """Exits the program.
         """
+        storage.flush()
         return True
 
     def emptyline(self):
@@ -97,8 +115,13 @@ class HBNBCommand(cmd.Cmd):
         elif line not in storage.classes():
             print("** class doesn't exist **")
         else:
-            b = storage.classes()[line]()
-            b.save()
+            try:
+                b = storage.classes()[line]()
+                self._touch(b, True)
+                self._save(b)
+            except PermissionError:
+                print("** storage is read-only **")
+                return
             print(b.id)
 
     def do_show(self, line):
@@ -113,11 +136,11 @@ class HBNBCommand(cmd.Cmd):
             elif len(words) < 2:
                 print("** instance id missing **")
             else:
-                key = "{}.{}".format(words[0], words[1])
-                if key not in storage.all():
+                obj = storage.get(words[0], words[1])
+                if obj is None:
                     print("** no instance found **")
                 else:
-                    print(storage.all()[key])
+                    print(obj)
 
     def do_destroy(self, line):
         """Deletes an instance based on the class name and id.
@@ -131,27 +154,256 @@ class HBNBCommand(cmd.Cmd):
             elif len(words) < 2:
                 print("** instance id missing **")
             else:
-                key = "{}.{}".format(words[0], words[1])
-                if key not in storage.all():
+                obj = storage.get(words[0], words[1])
+                if obj is None:
                     print("** no instance found **")
                 else:
-                    del storage.all()[key]
-                    storage.save()
+                    self._touch(obj)
+                    try:
+                        storage.delete(obj)
+                        if self._undo is None:
+                            storage.save()
+                    except PermissionError:
+                        print("** storage is read-only **")
 
     def do_all(self, line):
         """Prints all string representation of all instances.
         """
-        if line != "":
-            words = line.split(' ')
-            if words[0] not in storage.classes():
-                print("** class doesn't exist **")
+        words = line.split()
+        options = {"--limit": None, "--offset": 0}
+        while len(words) >= 2 and words[-2] in options:
+            try:
+                options[words[-2]] = int(words[-1])
+            except ValueError:
+                options[words[-2]] = -1
+            if options[words[-2]] < 0:
+                print("** invalid {} **".format(words[-2][2:]))
+                return
+            del words[-2:]
+        if words and words[0] not in storage.classes():
+            print("** class doesn't exist **")
+            return
+        objs = storage.all(words[0] if words else None).values()
+        offset = options["--offset"]
+        limit = options["--limit"]
+        self._print_list(
+            str(obj) for obj in itertools.islice(
+                objs, offset, None if limit is None else offset + limit))
+
+    def _print_list(self, items):
+        """Prints the strings of items like print(list(items)), one at a
+        time without building the list."""
+        write = sys.stdout.write
+        separator = "["
+        for item in items:
+            write(separator + repr(item))
+            separator = ", "
+        write("[]\n" if separator == "[" else "]\n")
+
+    def do_where(self, line):
+        """Prints the instances of a class matching conditions.
+        """
+        query = self._parse_query(line)
+        if query is None:
+            return
+        classname, conditions, fields = query
+        plan, candidates, objs = self._query(classname, conditions)
+        if fields:
+            self._print_list({name: d.get(name) for name in fields}
+                             for d in (obj.to_dict() for obj in objs))
+        else:
+            self._print_list(str(obj) for obj in objs)
+
+    def do_explain(self, line):
+        """Prints how where would find the instances matching conditions.
+        """
+        query = self._parse_query(line)
+        if query is None:
+            return
+        classname, conditions, fields = query
+        plan, candidates, objs = self._query(classname, conditions)
+        print("{}: {} candidates, {} matches".format(
+            plan, candidates, sum(1 for obj in objs)))
+
+    def _parse_query(self, line):
+        """Returns the class name, conditions and projected fields of line.
+
+        line holds a class name, then comma-separated conditions like
+        price_by_night<100 and names of attributes to print. Values are
+        cast to the type of their attribute, and strings may be quoted.
+        Attributes holding lists can't be compared. Prints an error and
+        returns None if line is invalid.
+        """
+        words = line.split(' ', 1)
+        if not words[0]:
+            print("** class name missing **")
+            return None
+        if words[0] not in storage.classes():
+            print("** class doesn't exist **")
+            return None
+        classname = words[0]
+        attributes = storage.attributes()[classname]
+        conditions = []
+        fields = []
+        for token in self._tokens(words[1] if len(words) > 1 else ""):
+            if re.search(r'^\w+$', token):
+                fields.append(token)
+                continue
+            match = re.search(r'^(\w+)\s*(<=|>=|==|!=|<|>|=)\s*(.+)$', token)
+            if not match:
+                print("** invalid condition: {} **".format(token))
+                return None
+            name, op, value = match.groups()
+            if attributes.get(name) is list:
+                print("** invalid condition: {} **".format(token))
+                return None
+            if re.search('^".*"$', value):
+                value = value[1:-1]
+                cast = attributes.get(name, str)
+            else:
+                cast = attributes.get(name)
+                if cast is None:
+                    cast = float if '.' in value else int
+            try:
+                value = cast(value)
+            except (TypeError, ValueError):
+                if name in attributes:
+                    print("** invalid condition: {} **".format(token))
+                    return None
+            conditions.append((name, "==" if op == "=" else op, value))
+        return classname, conditions, fields
+
+    def _tokens(self, text):
+        """Returns the non-empty comma-separated tokens of text.
+
+        Commas between double quotes don't separate tokens.
+        """
+        tokens = re.findall(r'(?:[^,"]|"[^"]*"?)+', text)
+        return [token.strip() for token in tokens if token.strip()]
+
+    def _query(self, classname, conditions):
+        """Returns the plan, number of candidates and matching instances.
+
+        Equality conditions on indexed attributes are looked up through
+        storage.find(). Otherwise, when the class has columns holding
+        every attribute of the conditions, they filter the arrays.
+        Otherwise every instance of the class is scanned. The matching
+        instances are returned as an iterator.
+        """
+        indexes = storage.indexes() if hasattr(storage, "indexes") else {}
+        equal = {name: value for name, op, value in conditions
+                 if op == "==" and name in indexes.get(classname, ())}
+        columns = (storage.columns(classname)
+                   if hasattr(storage, "columns") else None)
+        if equal:
+            plan = "index ({})".format(", ".join(equal))
+            objs = storage.find(classname, **equal).values()
+        elif (columns is not None and conditions and
+              all(name in columns.numeric or
+                  (name in columns.groups and op in ("==", "!="))
+                  for name, op, value in conditions)):
+            plan = "columns ({})".format(
+                ", ".join(dict.fromkeys(c[0] for c in conditions)))
+            return (plan, len(columns),
+                    iter(columns.filter(*conditions).values()))
+        else:
+            plan = "scan"
+            objs = storage.all(classname).values()
+        return plan, len(objs), (obj for obj in objs
+                                 if self._match(obj, conditions))
+
+    def _match(self, obj, conditions):
+        """Returns True if obj matches all conditions."""
+        for name, op, value in conditions:
+            try:
+                if not operators[op](getattr(obj, name), value):
+                    return False
+            except (AttributeError, TypeError):
+                return False
+        return True
+
+    def do_aggregate(self, line):
+        """Prints count, sum, avg, min or max of attributes of a class.
+        """
+        words = line.split(' ', 1)
+        specs = []
+        by = None
+        tokens = []
+        for token in self._tokens(words[1] if len(words) > 1 else ""):
+            match = re.search(r'^(\w+)\((\w*)\)$', token)
+            if match:
+                function, name = match.group(1), match.group(2) or None
+                if (function not in functions or
+                        (name is None and function != "count")):
+                    print("** invalid function: {} **".format(token))
+                    return
+                specs.append((function, name))
+                continue
+            match = re.search(r'^by\s*=\s*(\w+)$', token)
+            if match:
+                by = match.group(1)
             else:
-                l = [str(obj) for key, obj in storage.all().items()
-                     if type(obj).__name__ == words[0]]
-                print(l)
+                tokens.append(token)
+        query = self._parse_query(words[0] + " " + ", ".join(tokens))
+        if query is None:
+            return
+        classname, conditions, fields = query
+        if fields:
+            print("** invalid condition: {} **".format(fields[0]))
+        elif not specs:
+            print("** function missing **")
         else:
-            l = [str(obj) for key, obj in storage.all().items()]
-            print(l)
+            plan, results = self._aggregate(classname, specs, by, conditions)
+            if len(results) == 1:
+                print(results[0])
+            else:
+                print({"{}({})".format(f, n or ""): r
+                       for (f, n), r in zip(specs, results)})
+
+    def _aggregate(self, classname, specs, by, conditions):
+        """Returns the plan and the results of specs over classname.
+
+        specs is a list of function and attribute names, computed over
+        the instances matching conditions, grouped by the attribute by.
+        They're read from the aggregates maintained by the storage when
+        it has them all and there are no conditions. Otherwise they're
+        computed from the columns of the class when it has the
+        attributes, and else in a single pass over the instances.
+        """
+        if not conditions and hasattr(storage, "aggregates"):
+            aggregates = storage.aggregates(classname)
+            if all((name, by) in aggregates for function, name in specs):
+                return "aggregates", [
+                    self._sorted(aggregates[(name, by)].result(function))
+                    for function, name in specs]
+        columns = (storage.columns(classname)
+                   if hasattr(storage, "columns") else None)
+        if (columns is not None and (by is None or by in columns.groups) and
+                all(name is None or name in columns.numeric
+                    for function, name in specs) and
+                all(name in columns.numeric or
+                    (name in columns.groups and op in ("==", "!="))
+                    for name, op, value in conditions)):
+            return "columns", [
+                self._sorted(columns.aggregate(function, name, by,
+                                               conditions))
+                for function, name in specs]
+        plan, candidates, objs = self._query(classname, conditions)
+        aggregates = {name: Aggregate(name, by) for function, name in specs}
+        for obj in objs:
+            for aggregate in aggregates.values():
+                aggregate.add(None, obj)
+        return plan, [self._sorted(aggregates[name].result(function))
+                      for function, name in specs]
+
+    def _sorted(self, result):
+        """Returns result with its groups sorted, when they can be."""
+        if not isinstance(result, dict):
+            return result
+        try:
+            return dict(sorted(result.items()))
+        except TypeError:
+            return result
 
     def do_count(self, line):
         """Counts the instances of a class.
@@ -162,10 +414,7 @@ class HBNBCommand(cmd.Cmd):
         elif words[0] not in storage.classes():
             print("** class doesn't exist **")
         else:
-            matches = [
-                k for k in storage.all() if k.startswith(
-                    words[0] + '.')]
-            print(len(matches))
+            print(storage.count(words[0]))
 
     def do_update(self, line):
         """Updates an instance by adding or updating attribute.
@@ -187,8 +436,8 @@ class HBNBCommand(cmd.Cmd):
         elif uid is None:
             print("** instance id missing **")
         else:
-            key = "{}.{}".format(classname, uid)
-            if key not in storage.all():
+            obj = storage.get(classname, uid)
+            if obj is None:
                 print("** no instance found **")
             elif not attribute:
                 print("** attribute name missing **")
@@ -211,9 +460,265 @@ class HBNBCommand(cmd.Cmd):
                         value = cast(value)
                     except ValueError:
                         pass  # fine, stay a string then
-                setattr(storage.all()[key], attribute, value)
-                storage.all()[key].save()
+                self._touch(obj)
+                setattr(obj, attribute, value)
+                try:
+                    self._save(obj)
+                except PermissionError:
+                    print("** storage is read-only **")
+
+    def do_import(self, line):
+        """Imports instances of a class from a JSON Lines or CSV file.
+        """
+        words = line.split(' ')
+        if not words[0]:
+            print("** class name missing **")
+        elif words[0] not in storage.classes():
+            print("** class doesn't exist **")
+        elif len(words) < 2:
+            print("** file name missing **")
+        else:
+            classname, path = words[0], words[1]
+            try:
+                f = open(path, "r", encoding="utf-8", newline="")
+            except OSError:
+                print("** file doesn't exist **")
+                return
+            with f:
+                self.import_records(classname, path, f)
+
+    def import_records(self, classname, path, f):
+        """Creates the instances of classname read from the file f.
+
+        The file is read one line at a time, as CSV with a header if
+        path ends with .csv, or else as JSON Lines. The values are cast
+        to the types of the attributes of the class, and the storage is
+        saved once every chunk_size instances. Records with the id of
+        an existing instance replace it.
+
+        Prints the number of instances imported, or stops at the first
+        invalid record.
+        """
+        if path.endswith(".csv"):
+            records = self._csv_records(f)
+        else:
+            records = (json.loads(line) for line in f if line.strip())
+        cls = storage.classes()[classname]
+        attributes = dict(storage.attributes()["BaseModel"])
+        attributes.update(storage.attributes()[classname])
+        count = 0
+        try:
+            for record in records:
+                obj = cls(**self._typed(classname, record, attributes))
+                old = storage.get(classname, obj.id)
+                self._touch(obj if old is None else old, old is None)
+                storage.new(obj)
+                count += 1
+                if count % self.chunk_size == 0 and self._undo is None:
+                    storage.save()
+        except (TypeError, ValueError):
+            print("** {}: record {} is invalid **".format(path, count + 1))
+        except csv.Error:
+            print("** invalid file **")
+        except PermissionError:
+            print("** storage is read-only **")
+        finally:
+            if count % self.chunk_size and self._undo is None:
+                storage.save()
+        print(count)
+
+    def _csv_records(self, f):
+        """Yields the records of the rows of the CSV file f.
+
+        Empty cells are left out, and cells starting with a double quote
+        are JSON strings. Raises ValueError for a row with more cells
+        than the header.
+        """
+        for row in csv.DictReader(f):
+            if None in row:
+                raise ValueError("more cells than columns")
+            yield {k: json.loads(v) if v.startswith('"') else v
+                   for k, v in row.items() if v}
+
+    def _typed(self, classname, record, attributes):
+        """Returns the attributes of an imported record of classname.
+
+        Raises ValueError if the record can't be an instance of it.
+        """
+        if (not isinstance(record, dict) or
+                record.pop("__class__", classname) != classname):
+            raise ValueError("not a {}".format(classname))
+        d = {}
+        for k, v in record.items():
+            t = attributes.get(k)
+            if t is list and isinstance(v, str):
+                v = json.loads(v)
+            elif t in (int, float) and type(v) is not t:
+                v = t(v)
+            elif t is datetime:
+                datetime.fromisoformat(v)
+            elif t is not None and not isinstance(v, t):
+                raise ValueError(k)
+            d[k] = v
+        now = datetime.now().isoformat()
+        d.setdefault("id", str(uuid.uuid4()))
+        d.setdefault("created_at", now)
+        d.setdefault("updated_at", now)
+        return d
+
+    def do_export(self, line):
+        """Exports instances of a class to a JSON Lines or CSV file.
+        """
+        words = line.split(' ')
+        if not words[0]:
+            print("** class name missing **")
+        elif words[0] not in storage.classes():
+            print("** class doesn't exist **")
+        elif len(words) < 2:
+            print("** file name missing **")
+        else:
+            classname, path = words[0], words[1]
+            try:
+                f = open(path, "w", encoding="utf-8", newline="")
+            except OSError:
+                print("** file can't be written **")
+                return
+            with f:
+                print(self.export_records(classname, path, f))
+
+    def export_records(self, classname, path, f):
+        """Writes the instances of classname to the file f.
+
+        The file is written as CSV if path ends with .csv, with a column
+        per attribute, and lists as JSON, as well as the strings which
+        are empty or start with a double quote. It's written as JSON
+        Lines otherwise.
+
+        Returns the number of instances exported.
+        """
+        objs = storage.all(classname).values()
+        if path.endswith(".csv"):
+            names = dict.fromkeys(storage.attributes()["BaseModel"])
+            names.update(dict.fromkeys(storage.attributes()[classname]))
+            for obj in objs:
+                names.update(dict.fromkeys(obj.to_dict()))
+            names.pop("__class__", None)
+            writer = csv.DictWriter(f, list(names))
+            writer.writeheader()
+            for obj in objs:
+                d = obj.to_dict()
+                del d["__class__"]
+                writer.writerow({k: json.dumps(v)
+                                 if isinstance(v, (list, dict)) or
+                                 v == "" or str(v).startswith('"')
+                                 else v for k, v in d.items()})
+        else:
+            for obj in objs:
+                f.write(json.dumps(obj.to_dict()) + "\n")
+        return len(objs)
+
+    def do_source(self, line):
+        """Runs the commands of a file as one transaction.
+        """
+        if line == "" or line is None:
+            print("** file name missing **")
+        elif not self.source(line) and self._undo is not None:
+            self._failed = True
+
+    def source(self, path):
+        """Runs the commands of the file at path as one transaction.
+
+        The changes are only made in memory and saved once at the end.
+        If a command raises or prints an error, the following ones are
+        skipped and the changes are rolled back. Lines starting with #
+        are ignored. A file sourced by another one is part of its
+        transaction: its failure fails the outer file, which rolls back.
+
+        Returns True if the changes were saved.
+        """
+        try:
+            f = open(path, "r", encoding="utf-8")
+        except OSError:
+            print("** file doesn't exist **")
+            return False
+        outer = self._undo is None
+        if outer:
+            self._undo = {}
+            self._failed = False
+        failed = False
+        try:
+            with f:
+                for number, line in enumerate(f, 1):
+                    line = line.strip()
+                    if line.startswith("#"):
+                        continue
+                    out = StringIO()
+                    try:
+                        with contextlib.redirect_stdout(out):
+                            stop = self.onecmd(line)
+                    except Exception as e:
+                        print(out.getvalue(), end="")
+                        print("** {} **".format(e))
+                        failed = True
+                    else:
+                        print(out.getvalue(), end="")
+                        failed = (out.getvalue().startswith("** ") or
+                                  self._failed)
+                    if failed:
+                        print("** {}:{}: {} **".format(
+                            path, number, "rolled back" if outer
+                            else "failed"))
+                        break
+                    if stop:
+                        break
+        finally:
+            if outer:
+                undo = self._undo
+                self._undo = None
+                self._failed = False
+                if failed:
+                    self._rollback(undo)
+                elif undo:
+                    storage.save()
+        return not failed
+
+    def _touch(self, obj, created=False):
+        """Records the state of obj before its first change in a batch."""
+        if self._undo is not None:
+            key = "{}.{}".format(type(obj).__name__, obj.id)
+            if key not in self._undo:
+                self._undo[key] = None if created else obj.to_dict()
+
+    def _save(self, obj):
+        """Saves obj, or only updates it in memory during a batch."""
+        if self._undo is None:
+            obj.save()
+        else:
+            obj.updated_at = datetime.now()
+            storage.new(obj)
+
+    def _rollback(self, undo):
+        """Restores the objects recorded by _touch().
+
+        Nothing is restored in a read-only storage, which refused the
+        changes in the first place.
+        """
+        try:
+            for key, d in reversed(list(undo.items())):
+                classname, _, uid = key.partition(".")
+                obj = storage.get(classname, uid)
+                if obj is not None:
+                    storage.delete(obj)
+                if d is not None:
+                    storage.new(storage.classes()[classname](**d))
+        except PermissionError:
+            pass
 
 
 if __name__ == '__main__':
+    if len(sys.argv) == 3 and sys.argv[1] == "--batch":
+        console = HBNBCommand()
+        ok = console.source(sys.argv[2])
+        storage.flush()
+        sys.exit(0 if ok else 1)
     HBNBCommand().cmdloop()
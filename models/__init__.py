@@ -1,4 +1,13 @@
 """Module for FileStorage autoinit."""
-from models.engine.file_storage import FileStorage
-storage = FileStorage()
+import os
+
+if os.getenv("HBNB_TYPE_STORAGE") == "sqlite":
+    from models.engine.sqlite_storage import SQLiteStorage
+    storage = SQLiteStorage()
+elif os.getenv("HBNB_TYPE_STORAGE") == "snapshot":
+    from models.engine.snapshot_storage import SnapshotStorage
+    storage = SnapshotStorage()
+else:
+    from models.engine.file_storage import FileStorage
+    storage = FileStorage()
 storage.reload()
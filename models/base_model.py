@@ -21,21 +21,24 @@ class BaseModel:
         """
 
         if kwargs is not None and kwargs != {}:
-            for key in kwargs:
-                if key == "created_at":
-                    self.__dict__["created_at"] = datetime.strptime(
-                        kwargs["created_at"], "%Y-%m-%dT%H:%M:%S.%f")
-                elif key == "updated_at":
-                    self.__dict__["updated_at"] = datetime.strptime(
-                        kwargs["updated_at"], "%Y-%m-%dT%H:%M:%S.%f")
-                else:
-                    self.__dict__[key] = kwargs[key]
+            self.__dict__.update(kwargs)
+            if "created_at" in kwargs:
+                self.__dict__["created_at"] = datetime.fromisoformat(
+                    kwargs["created_at"])
+            if "updated_at" in kwargs:
+                self.__dict__["updated_at"] = datetime.fromisoformat(
+                    kwargs["updated_at"])
         else:
             self.id = str(uuid.uuid4())
             self.created_at = datetime.now()
             self.updated_at = datetime.now()
             storage.new(self)
 
+    def __setattr__(self, name, value):
+        """Sets an attribute and marks the instance as changed."""
+        super().__setattr__(name, value)
+        storage.changed(self, name)
+
     def __str__(self):
         """Returns a human-readable string representation
         of an instance."""
@@ -48,8 +51,18 @@ class BaseModel:
         with the current datetime."""
 
         self.updated_at = datetime.now()
+        storage.new(self)
         storage.save()
 
+    async def asave(self):
+        """Updates the updated_at attribute with the current datetime
+        and saves without blocking the event loop."""
+        from models.engine.async_storage import astorage
+
+        self.updated_at = datetime.now()
+        storage.new(self)
+        await astorage.asave()
+
     def to_dict(self):
         """Returns a dictionary representation of an instance."""
 
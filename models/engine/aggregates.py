@@ -0,0 +1,139 @@
+#!/usr/bin/python3
+"""Module for Aggregate class."""
+import math
+
+functions = ("count", "sum", "avg", "min", "max")
+
+
+class Aggregate:
+
+    """Class for the count, sum, min and max of an attribute, by group.
+
+    Each object adds its value to the totals of its group, and is
+    subtracted from them when it's changed or removed, so the results
+    are kept up to date without going through the objects again. Values
+    which aren't numbers are left out, like NULL in SQL.
+
+    When an object holding the minimum or the maximum of its group is
+    removed, they're recomputed from the remaining rows the next time
+    they're asked for.
+    """
+
+    def __init__(self, name=None, by=None):
+        """Initialization of an Aggregate instance.
+
+        Args:
+            - name: numeric attribute, or None to only count the objects
+            - by: attribute to group by, or None for a single group
+        """
+        self.name = name
+        self.by = by
+        self.rows = {}
+        self.groups = {}
+        self.stale = set()
+
+    def add(self, key, obj):
+        """Adds or refreshes the row of obj under key.
+
+        With key None, the row is added to the totals only, and can't be
+        removed.
+        """
+        if key is not None:
+            self.remove(key)
+        group = self.__group(obj)
+        value = self.__value(obj)
+        if key is not None:
+            self.rows[key] = (group, value)
+        if value is None:
+            return
+        totals = self.groups.get(group)
+        if totals is None:
+            self.groups[group] = [1, value, value, value]
+            return
+        totals[0] += 1
+        totals[1] += value
+        if group not in self.stale:
+            totals[2] = min(totals[2], value)
+            totals[3] = max(totals[3], value)
+
+    def update(self, key, obj, name=None):
+        """Refreshes the row of obj if the attribute name matters."""
+        if name is None or name in (self.name, self.by):
+            if key in self.rows:
+                self.add(key, obj)
+
+    def remove(self, key):
+        """Removes the row of key."""
+        row = self.rows.pop(key, None)
+        if row is None or row[1] is None:
+            return
+        group, value = row
+        totals = self.groups[group]
+        totals[0] -= 1
+        if totals[0] == 0:
+            del self.groups[group]
+            self.stale.discard(group)
+            return
+        totals[1] -= value
+        if value in (totals[2], totals[3]):
+            self.stale.add(group)
+
+    def result(self, function):
+        """Returns function computed over the rows.
+
+        Without by, the result is a number, or None if no row has a
+        value; count returns 0 then. With by, the result is a dict of
+        the group values and their result.
+        """
+        if function not in functions:
+            raise ValueError("unknown function {}".format(function))
+        if self.name is None and function != "count":
+            raise ValueError("{} needs an attribute".format(function))
+        if function in ("min", "max") and self.stale:
+            self.__refresh()
+        index = {"count": 0, "sum": 1, "min": 2, "max": 3}
+        if function == "avg":
+            results = {g: t[1] / t[0] for g, t in self.groups.items()}
+        else:
+            results = {g: t[index[function]] for g, t in self.groups.items()}
+        if self.by is not None:
+            return results
+        if None not in results:
+            return 0 if function == "count" else None
+        return results[None]
+
+    def __refresh(self):
+        """Recomputes the minimum and maximum of the stale groups."""
+        extremes = {}
+        for group, value in self.rows.values():
+            if group in self.stale and value is not None:
+                low, high = extremes.get(group, (value, value))
+                extremes[group] = (min(low, value), max(high, value))
+        for group, (low, high) in extremes.items():
+            self.groups[group][2:] = [low, high]
+        self.stale = set()
+
+    def __group(self, obj):
+        """Returns the group of obj."""
+        if self.by is None:
+            return None
+        group = getattr(obj, self.by, None)
+        try:
+            hash(group)
+        except TypeError:
+            group = repr(group)
+        return group
+
+    def __value(self, obj):
+        """Returns the number aggregated for obj, or None if it has none."""
+        if self.name is None:
+            return 0
+        value = getattr(obj, self.name, None)
+        if type(value) not in (int, float):
+            try:
+                value = float(value)
+            except (TypeError, ValueError):
+                return None
+        if math.isnan(value):
+            return None
+        return value
@@ -0,0 +1,90 @@
+#!/usr/bin/python3
+"""Module for AsyncStorage class."""
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from models import storage
+
+
+class AsyncStorage:
+
+    """Class for asyncio access to a storage.
+
+    The blocking calls of the storage run in an executor, a single
+    thread of its own unless one is given, so the event loop never
+    waits on the disk, and the storage, a SQLite connection included,
+    is only used by one thread at a time. Other attributes are those of
+    the storage.
+
+    The objects are serialized in the executor too, so when they can
+    change while a save runs, the storage should be a FileStorage in
+    thread-safe mode (HBNB_STORAGE_THREADSAFE=1).
+    """
+
+    def __init__(self, storage=storage, executor=None):
+        """Initialization of an AsyncStorage over storage."""
+        self.__storage = storage
+        if executor is None:
+            executor = ThreadPoolExecutor(1, "AsyncStorage")
+        self.__executor = executor
+        self.__running = None
+        self.__next = None
+
+    def __getattr__(self, name):
+        """Returns the attribute name of the storage."""
+        if name.startswith("_AsyncStorage__"):
+            raise AttributeError(name)
+        return getattr(self.__storage, name)
+
+    async def asave(self):
+        """Saves the objects without blocking the event loop.
+
+        A save started while another one runs waits for it, then saves
+        once for every call made in the meantime.
+        """
+        loop = asyncio.get_running_loop()
+        task = self.__next
+        if task is None or task.get_loop() is not loop:
+            running = self.__running
+            if running is not None and running.get_loop() is not loop:
+                running = None
+            task = loop.create_task(self.__save(running))
+            self.__next = task
+        await asyncio.shield(task)
+
+    async def __save(self, running):
+        """Saves once running, the previous save, is done."""
+        if running is not None:
+            await asyncio.wait([running])
+        task = self.__next
+        self.__running = task
+        self.__next = None
+        try:
+            await self.__call(self.__storage.save)
+        finally:
+            if self.__running is task:
+                self.__running = None
+
+    async def aflush(self):
+        """Writes the deferred saves without blocking the event loop."""
+        await self.__call(self.__storage.flush)
+
+    async def areload(self):
+        """Reloads the objects without blocking the event loop."""
+        await self.__call(self.__storage.reload)
+
+    async def aget(self, cls, id):
+        """Returns the object of class cls with id, or None if not found.
+
+        cls can be a class or a class name.
+        """
+        return await self.__call(self.__storage.get, cls, id)
+
+    async def __call(self, function, *args):
+        """Returns the result of function(*args) run in the executor."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self.__executor, functools.partial(function, *args))
+
+
+astorage = AsyncStorage()
@@ -0,0 +1,281 @@
+#!/usr/bin/python3
+"""Module for Columns class."""
+import math
+import operator
+from array import array
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+operators = {"<": operator.lt,
+             "<=": operator.le,
+             ">": operator.gt,
+             ">=": operator.ge,
+             "==": operator.eq,
+             "!=": operator.ne}
+functions = ("count", "sum", "avg", "min", "max")
+
+
+class Columns:
+
+    """Class for the attributes of the objects of a class, by column.
+
+    Numeric attributes are kept in contiguous arrays of doubles, with
+    NaN for values that aren't numbers. Group attributes, like foreign
+    keys, are kept as arrays of integer codes. Row i of every array
+    belongs to the object objs[i]; a deleted row is filled with the
+    last one, so the arrays stay dense.
+
+    Queries are vectorized with NumPy when it's installed, and loop over
+    the arrays otherwise.
+    """
+
+    def __init__(self, numeric, groups=()):
+        """Initialization of a Columns instance.
+
+        Args:
+            - numeric: dict of numeric attribute names and their types
+            - groups: list of hashable attribute names to group by
+        """
+        self.types = dict(numeric)
+        self.numeric = {name: array("d") for name in numeric}
+        self.groups = {name: array("q") for name in groups}
+        self.codes = {name: {} for name in groups}
+        self.values = {name: [] for name in groups}
+        self.keys = []
+        self.objs = []
+        self.rows = {}
+
+    def __len__(self):
+        """Returns the number of rows."""
+        return len(self.objs)
+
+    def add(self, key, obj):
+        """Adds or refreshes the row of obj under key."""
+        row = self.rows.get(key)
+        if row is not None:
+            self.objs[row] = obj
+            self.update(key, obj)
+            return
+        self.rows[key] = len(self.objs)
+        self.keys.append(key)
+        self.objs.append(obj)
+        for name, column in self.numeric.items():
+            column.append(self.__number(getattr(obj, name, None)))
+        for name, column in self.groups.items():
+            column.append(self.__code(name, getattr(obj, name, None)))
+
+    def update(self, key, obj, name=None):
+        """Copies the attribute name, or all of them, from obj to its row."""
+        row = self.rows.get(key)
+        if row is None:
+            return
+        if name is None or name in self.numeric:
+            for n in self.numeric if name is None else (name,):
+                self.numeric[n][row] = self.__number(getattr(obj, n, None))
+        if name is None or name in self.groups:
+            for n in self.groups if name is None else (name,):
+                self.groups[n][row] = self.__code(n, getattr(obj, n, None))
+
+    def remove(self, key):
+        """Removes the row of key."""
+        row = self.rows.pop(key, None)
+        if row is None:
+            return
+        last = self.keys.pop()
+        obj = self.objs.pop()
+        if last != key:
+            self.keys[row] = last
+            self.objs[row] = obj
+            self.rows[last] = row
+        for column in list(self.numeric.values()) + list(self.groups.values()):
+            value = column.pop()
+            if last != key:
+                column[row] = value
+
+    @staticmethod
+    def __number(value):
+        """Returns value as a float, or NaN if it's not a number."""
+        try:
+            return float(value)
+        except (TypeError, ValueError):
+            return math.nan
+
+    def __code(self, name, value):
+        """Returns the code of value in the group attribute name."""
+        codes = self.codes[name]
+        try:
+            code = codes.get(value)
+        except TypeError:
+            value = repr(value)
+            code = codes.get(value)
+        if code is None:
+            code = codes[value] = len(self.values[name])
+            self.values[name].append(value)
+        return code
+
+    def __column(self, name):
+        """Returns the array of name, as a NumPy array when possible."""
+        if name in self.numeric:
+            column = self.numeric[name]
+            dtype = "f8"
+        elif name in self.groups:
+            column = self.groups[name]
+            dtype = "i8"
+        else:
+            raise KeyError(name)
+        if numpy is not None and len(column):
+            return numpy.frombuffer(column, dtype=dtype)
+        return column
+
+    def __condition(self, name, op, value):
+        """Returns the column and operand to evaluate name op value."""
+        column = self.__column(name)
+        if name in self.groups:
+            if op not in ("==", "!="):
+                raise ValueError("{} only supports == and !=".format(name))
+            value = self.codes[name].get(value, -1)
+        else:
+            value = self.__number(value)
+        return column, operators[op], value
+
+    def mask(self, *conditions):
+        """Returns the rows matching all conditions.
+
+        Args:
+            - *conditions: tuples of attribute name, operator and value
+
+        The result is a NumPy boolean array when NumPy is installed, a
+        list of booleans otherwise.
+        """
+        tests = [self.__condition(*c) for c in conditions]
+        if numpy is not None:
+            mask = numpy.ones(len(self), dtype=bool)
+            for column, op, value in tests:
+                if len(column):
+                    mask &= op(column, value)
+            return mask
+        return [all(op(column[i], value) for column, op, value in tests)
+                for i in range(len(self))]
+
+    def filter(self, *conditions):
+        """Returns the objects matching all conditions, by key.
+
+        Args:
+            - *conditions: tuples of attribute name, operator and value
+        """
+        mask = self.mask(*conditions)
+        if numpy is not None:
+            rows = numpy.flatnonzero(mask).tolist()
+        else:
+            rows = [i for i, m in enumerate(mask) if m]
+        return {self.keys[i]: self.objs[i] for i in rows}
+
+    def aggregate(self, function, name=None, by=None, where=()):
+        """Returns function computed over the column name.
+
+        Args:
+            - function: one of count, sum, avg, min or max
+            - name: numeric attribute, or None to count the rows
+            - by: group attribute, or None to aggregate all the rows
+            - where: list of conditions the rows must match
+
+        NaN values are left out, like NULL in SQL. With by, the result
+        is a dict of the group values and their result; groups without
+        values are left out.
+        """
+        if function not in functions:
+            raise ValueError("unknown function {}".format(function))
+        if name is None and function != "count":
+            raise ValueError("{} needs an attribute".format(function))
+        if name is not None and name not in self.numeric:
+            raise KeyError(name)
+        mask = self.mask(*where)
+        if numpy is not None:
+            result = self.__aggregate_numpy(function, name, by, mask)
+        else:
+            result = self.__aggregate_python(function, name, by, mask)
+        if function in ("sum", "min", "max") and self.types[name] is int:
+            cast = self.__int
+        else:
+            cast = self.__float
+        if function == "count":
+            cast = int
+        if by is None:
+            if None not in result:
+                return 0 if function == "count" else None
+            return cast(result[None])
+        values = self.values[by]
+        return {values[code]: cast(v) for code, v in result.items()}
+
+    @staticmethod
+    def __int(value):
+        """Returns value as an int when it's a whole number."""
+        return int(value) if float(value).is_integer() else float(value)
+
+    @staticmethod
+    def __float(value):
+        """Returns value as a float."""
+        return float(value)
+
+    def __aggregate_python(self, function, name, by, mask):
+        """Aggregates the rows of mask by looping over the arrays."""
+        column = self.numeric[name] if name is not None else None
+        groups = self.groups[by] if by is not None else None
+        acc = {}
+        counts = {}
+        for i, m in enumerate(mask):
+            if not m:
+                continue
+            value = column[i] if column is not None else 0.0
+            if math.isnan(value):
+                continue
+            group = groups[i] if groups is not None else None
+            counts[group] = counts.get(group, 0) + 1
+            if group not in acc:
+                acc[group] = value
+            elif function == "min":
+                acc[group] = min(acc[group], value)
+            elif function == "max":
+                acc[group] = max(acc[group], value)
+            else:
+                acc[group] += value
+        if function == "count":
+            return counts
+        if function == "avg":
+            return {g: v / counts[g] for g, v in acc.items()}
+        return acc
+
+    def __aggregate_numpy(self, function, name, by, mask):
+        """Aggregates the rows of mask with NumPy."""
+        if name is not None and len(self):
+            column = self.__column(name)
+            mask = mask & ~numpy.isnan(column)
+            values = column[mask]
+        else:
+            values = numpy.zeros(int(mask.sum()))
+        if by is None:
+            if not len(values):
+                return {None: 0} if function == "count" else {}
+            return {None: {"count": len,
+                           "sum": numpy.sum,
+                           "avg": numpy.mean,
+                           "min": numpy.min,
+                           "max": numpy.max}[function](values)}
+        size = len(self.values[by])
+        codes = self.__column(by)[mask] if len(self) else values.astype("i8")
+        counts = numpy.bincount(codes, minlength=size)
+        if function == "count":
+            result = counts
+        elif function in ("sum", "avg"):
+            result = numpy.bincount(codes, weights=values, minlength=size)
+            if function == "avg":
+                result = result / numpy.maximum(counts, 1)
+        else:
+            fill = numpy.inf if function == "min" else -numpy.inf
+            result = numpy.full(size, fill)
+            ufunc = numpy.minimum if function == "min" else numpy.maximum
+            ufunc.at(result, codes, values)
+        return {code: result[code] for code in numpy.flatnonzero(counts)}
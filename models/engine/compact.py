@@ -0,0 +1,124 @@
+#!/usr/bin/python3
+"""Module for the compact, slot-based variants of the model classes."""
+from datetime import datetime
+from models import storage
+
+_variants = {}
+
+
+def compact_classes(classes, attributes):
+    """Returns the compact variant of every class of classes.
+
+    Args:
+        - classes: dict of classnames and their classes
+        - attributes: dict of classnames and their attributes schema
+    """
+    compact = {}
+    for classname, cls in classes.items():
+        if cls not in _variants:
+            names = dict(attributes["BaseModel"])
+            names.update(attributes.get(classname, {}))
+            _variants[cls] = type(classname, (CompactModel, cls),
+                                  {"__slots__": tuple(names),
+                                   "__module__": cls.__module__,
+                                   "__doc__": cls.__doc__})
+        compact[classname] = _variants[cls]
+    return compact
+
+
+class CompactModel:
+
+    """Mixin class storing the schema attributes of a model in slots.
+
+    The attributes outside of the schema, like those set by the update
+    command, are kept in a separate dictionary created on first use.
+    The instances still have the __dict__ of the model classes, which
+    don't define __slots__, but it stays empty.
+    """
+    __slots__ = ("_CompactModel__extra",)
+
+    def __init__(self, *args, **kwargs):
+        """Initialization of a compact instance.
+
+        Args:
+            - *args: list of arguments
+            - **kwargs: dict of key-values arguments
+        """
+        object.__setattr__(self, "_CompactModel__extra", None)
+        if kwargs is not None and kwargs != {}:
+            fields = type(self).__slots__
+            for key, value in kwargs.items():
+                if key == "__class__":
+                    continue
+                if key == "created_at" or key == "updated_at":
+                    value = datetime.fromisoformat(value)
+                if key in fields:
+                    object.__setattr__(self, key, value)
+                else:
+                    self.__extras()[key] = value
+        else:
+            super().__init__(*args)
+
+    def __extras(self):
+        """Returns the dictionary of attributes outside of the schema."""
+        if self.__extra is None:
+            object.__setattr__(self, "_CompactModel__extra", {})
+        return self.__extra
+
+    def __setattr__(self, name, value):
+        """Sets an attribute, in a slot if it's part of the schema."""
+        if name in type(self).__slots__:
+            super().__setattr__(name, value)
+        else:
+            self.__extras()[name] = value
+            storage.changed(self, name)
+
+    def __getattr__(self, name):
+        """Returns attributes outside of the schema and class defaults."""
+        try:
+            extra = object.__getattribute__(self, "_CompactModel__extra")
+        except AttributeError:
+            extra = None
+        if extra is not None and name in extra:
+            return extra[name]
+        for cls in type(self).__mro__[2:]:
+            if name in cls.__dict__:
+                return cls.__dict__[name]
+        raise AttributeError("'{}' object has no attribute '{}'".format(
+            type(self).__name__, name))
+
+    def __delattr__(self, name):
+        """Deletes an attribute."""
+        if self.__extra is not None and name in self.__extra:
+            del self.__extra[name]
+        else:
+            super().__delattr__(name)
+
+    def __fields(self):
+        """Returns a dictionary of the attributes set on the instance."""
+        d = {}
+        cls = type(self)
+        for name in cls.__slots__:
+            try:
+                d[name] = getattr(cls, name).__get__(self, cls)
+            except AttributeError:
+                pass
+        if self.__extra:
+            d.update(self.__extra)
+        return d
+
+    def __str__(self):
+        """Returns a human-readable string representation
+        of an instance."""
+
+        return "[{}] ({}) {}".\
+            format(type(self).__name__, self.id, self.__fields())
+
+    def to_dict(self):
+        """Returns a dictionary representation of an instance."""
+
+        my_dict = self.__fields()
+        my_dict["__class__"] = type(self).__name__
+        my_dict["created_at"] = my_dict["created_at"].isoformat()
+        my_dict["updated_at"] = my_dict["updated_at"].isoformat()
+        return my_dict
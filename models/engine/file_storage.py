@@ -1,8 +1,50 @@
 #!/usr/bin/python3
 """Module for FileStorage class."""
+import atexit
+import contextlib
 import datetime
 import json
 import os
+import queue
+import threading
+import time
+import zlib
+from concurrent.futures import BrokenExecutor, ThreadPoolExecutor
+from models.engine.aggregates import Aggregate
+from models.engine.columns import Columns
+from models.engine.json_stream import raw_items
+from models.engine.parallel import read_parallel
+from models.engine.serializers import serializers
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+
+class ConflictError(Exception):
+
+    """Raised when a save conflicts with objects saved by another process.
+
+    Its args are the keys of the conflicting objects.
+    """
+    pass
+
+
+def _aggregated(value):
+    """Returns the aggregates declared by value, by class name.
+
+    value holds comma-separated Class[.attribute][:group] items, like
+    Place.price_by_night:city_id or Review:user_id.
+    """
+    aggregated = {}
+    for spec in value.split(","):
+        if spec:
+            target, _, by = spec.partition(":")
+            classname, _, name = target.partition(".")
+            aggregated.setdefault(classname, []).append(
+                (name or None, by or None))
+    return aggregated
 
 
 class FileStorage:
@@ -10,23 +52,1050 @@ class FileStorage:
     """Class for serializtion and deserialization of base classes."""
     __file_path = "file.json"
     __objects = {}
+    __journal = os.getenv("HBNB_STORAGE_JOURNAL", "") == "1"
+    __journal_limit = int(os.getenv("HBNB_STORAGE_JOURNAL_LIMIT", "1000"))
+    __journal_size = 0
+    __changes = {}
+    __cache = {}
+    __cached = None
+    __compactor = None
+    __by_class = {}
+    __indexed = None
+    __indexes = {"City": ["state_id"],
+                 "Place": ["city_id", "user_id"],
+                 "Review": ["place_id", "user_id"]}
+    __attr_index = {}
+    __lazy = os.getenv("HBNB_STORAGE_LAZY", "") == "1"
+    __pending = {}
+    __pending_of = None
+    __compact_models = os.getenv("HBNB_STORAGE_COMPACT", "") == "1"
+    __columnar = (["Place"] if os.getenv("HBNB_STORAGE_COLUMNAR", "") == "1"
+                  else [])
+    __columns = {}
+    __aggregated = _aggregated(os.getenv("HBNB_STORAGE_AGGREGATES", ""))
+    __aggregates = {}
+    __fsync = os.getenv("HBNB_STORAGE_FSYNC", "batched")
+    __fsync_interval = float(os.getenv("HBNB_STORAGE_FSYNC_INTERVAL", "1"))
+    __synced = None
+    __unsynced = None
+    __sync_timer = None
+    __sync_lock = threading.Lock()
+    __group_commit = os.getenv("HBNB_STORAGE_GROUP_COMMIT", "") == "1"
+    __group_interval = float(os.getenv("HBNB_STORAGE_GROUP_INTERVAL", "1"))
+    __group_size = int(os.getenv("HBNB_STORAGE_GROUP_SIZE", "100"))
+    __dirty = 0
+    __flushed = None
+    __atexit = False
+    __writer_mode = os.getenv("HBNB_STORAGE_WRITER", "") == "1"
+    __writer_backlog = int(os.getenv("HBNB_STORAGE_WRITER_BACKLOG", "8"))
+    __writer = None
+    __writer_queue = None
+    __writer_error = None
+    __failed = False
+    __sharded = os.getenv("HBNB_STORAGE_SHARDED", "") == "1"
+    __shard_counts = {k: int(v) for k, _, v in (
+        s.partition("=") for s in os.getenv(
+            "HBNB_STORAGE_SHARDS", "Place=4,Review=4").split(",") if s)}
+    __workers = int(os.getenv("HBNB_STORAGE_WORKERS", "0"))
+    __serializer = serializers[os.getenv("HBNB_STORAGE_FORMAT", "json")]
+    __shared = os.getenv("HBNB_STORAGE_SHARED", "") == "1"
+    __conflict_policy = os.getenv("HBNB_STORAGE_CONFLICT", "merge")
+    __signature = None
+    __base = {}
+    __conflicts = {}
+    __threadsafe = os.getenv("HBNB_STORAGE_THREADSAFE", "") == "1"
+    __class_locks = {}
+    __save_lock = threading.RLock()
+
+    def all(self, cls=None):
+        """Returns __objects dictionary, or the objects of class cls.
 
-    def all(self):
-        """Returns __objects dictionary."""
+        cls can be a class or a class name.
+        """
         # TODO: should this be a copy()?
-        return FileStorage.__objects
+        self.__refresh()
+        if cls is None:
+            self.__load()
+            objs = FileStorage.__objects
+        else:
+            if not isinstance(cls, str):
+                cls = cls.__name__
+            self.__load(cls)
+            objs = self.__index().get(cls, {})
+            if FileStorage.__threadsafe:
+                with self.__locked(cls):
+                    return dict(objs)
+        return dict(objs) if FileStorage.__threadsafe else objs
+
+    def get(self, cls, id):
+        """Returns the object of class cls with id, or None if not found.
+
+        cls can be a class or a class name.
+        """
+        if not isinstance(cls, str):
+            cls = cls.__name__
+        key = "{}.{}".format(cls, id)
+        self.__refresh()
+        self.__load(cls, key)
+        return FileStorage.__objects.get(key)
+
+    def count(self, cls=None):
+        """Returns the number of objects, or of objects of class cls."""
+        self.__refresh()
+        pending = self.__pending_records()
+        if cls is None:
+            return len(FileStorage.__objects) + sum(map(len,
+                                                        pending.values()))
+        if not isinstance(cls, str):
+            cls = cls.__name__
+        return len(self.__index().get(cls, {})) + len(pending.get(cls, {}))
+
+    def __pending_records(self):
+        """Returns the records of a lazy reload not built yet, by class.
+
+        They are dropped when __objects was replaced since the reload.
+        """
+        if (FileStorage.__pending and
+                FileStorage.__pending_of is not FileStorage.__objects):
+            FileStorage.__pending = {}
+        return FileStorage.__pending
+
+    def __load(self, cls=None, key=None):
+        """Builds the instances still pending from a lazy reload.
+
+        Only the instance of key, or else the instances of the class name
+        cls, are built when given. Records still held as JSON text are
+        decoded first.
+        """
+        pending = self.__pending_records()
+        if not pending:
+            return
+        if key is not None:
+            record = pending.get(cls, {}).pop(key, None)
+            records = {key: record} if record is not None else {}
+        elif cls is not None:
+            records = pending.pop(cls, {})
+        else:
+            records = {}
+            for v in pending.values():
+                records.update(v)
+            pending.clear()
+        if not records:
+            return
+        classes = self.classes()
+        self.__index()
+        for k, v in records.items():
+            if type(v) is str:
+                v = json.loads(v)
+            obj = classes[v["__class__"]](**v)
+            FileStorage.__objects[k] = obj
+            self.__register(k, obj)
+
+    def columns(self, cls):
+        """Returns the Columns of class cls, or None if it has none.
+
+        cls can be a class or a class name.
+        """
+        if not isinstance(cls, str):
+            cls = cls.__name__
+        self.all(cls)
+        return FileStorage.__columns.get(cls)
+
+    def aggregates(self, cls):
+        """Returns the Aggregates of class cls, by attribute and group.
+
+        cls can be a class or a class name.
+        """
+        if not isinstance(cls, str):
+            cls = cls.__name__
+        self.all(cls)
+        return FileStorage.__aggregates.get(cls, {})
+
+    def add_aggregate(self, cls, name=None, by=None):
+        """Declares an Aggregate of the attribute name of cls, by group.
+
+        With name None, it only counts the objects.
+        """
+        if not isinstance(cls, str):
+            cls = cls.__name__
+        specs = FileStorage.__aggregated.setdefault(cls, [])
+        if (name, by) not in specs:
+            specs.append((name, by))
+            self.__build_aggregate(cls, name, by, self.__index().get(cls, {}))
+
+    def find(self, cls, **kwargs):
+        """Returns the objects of class cls whose attributes equal kwargs.
+
+        Attributes with an index are looked up through it, the other
+        ones only filter the smallest matching set of objects. In
+        thread-safe mode it's copied while cls is locked.
+        """
+        if not isinstance(cls, str):
+            cls = cls.__name__
+        objs = self.all(cls)
+        with self.__locked(cls):
+            for name, value in kwargs.items():
+                index = FileStorage.__attr_index.get((cls, name))
+                if index is not None:
+                    bucket = index[0].get(value, {})
+                    if len(bucket) < len(objs):
+                        objs = bucket
+            if FileStorage.__threadsafe:
+                objs = dict(objs)
+        return {k: v for k, v in objs.items()
+                if all(getattr(v, name, None) == value
+                       for name, value in kwargs.items())}
+
+    def indexes(self):
+        """Returns the indexed attributes of each classname."""
+        return FileStorage.__indexes
+
+    def add_index(self, cls, name):
+        """Declares an index on the hashable attribute name of cls."""
+        if not isinstance(cls, str):
+            cls = cls.__name__
+        names = FileStorage.__indexes.setdefault(cls, [])
+        if name not in names:
+            names.append(name)
+            self.__build_index(cls, name, self.__index().get(cls, {}))
+
+    def __index(self):
+        """Returns the per-class index of __objects.
+
+        The per-class and attribute indexes are rebuilt when __objects
+        was replaced or modified behind the storage's back.
+        """
+        objects = FileStorage.__objects
+        by_class = FileStorage.__by_class
+        if (FileStorage.__indexed is not objects or
+                (not FileStorage.__threadsafe and
+                 sum(map(len, by_class.values())) != len(objects))):
+            by_class = {}
+            for k, v in objects.items():
+                by_class.setdefault(type(v).__name__, {})[k] = v
+            FileStorage.__by_class = by_class
+            FileStorage.__indexed = objects
+            FileStorage.__attr_index = {}
+            for classname, names in FileStorage.__indexes.items():
+                for name in names:
+                    self.__build_index(classname, name,
+                                       by_class.get(classname, {}))
+            FileStorage.__columns = {}
+            for classname in FileStorage.__columnar:
+                self.__build_columns(classname, by_class.get(classname, {}))
+            FileStorage.__aggregates = {}
+            for classname, specs in FileStorage.__aggregated.items():
+                for name, by in specs:
+                    self.__build_aggregate(classname, name, by,
+                                           by_class.get(classname, {}))
+        return by_class
+
+    def __build_columns(self, classname, objs):
+        """Builds the Columns of the numeric attributes of classname."""
+        numeric = {k: v for k, v in self.attributes()[classname].items()
+                   if v in (int, float)}
+        columns = Columns(numeric, FileStorage.__indexes.get(classname, ()))
+        for k, v in objs.items():
+            columns.add(k, v)
+        FileStorage.__columns[classname] = columns
+
+    def __build_aggregate(self, classname, name, by, objs):
+        """Builds the Aggregate of the attribute name of classname by."""
+        aggregate = Aggregate(name, by)
+        for k, v in objs.items():
+            aggregate.add(k, v)
+        FileStorage.__aggregates.setdefault(classname, {})[(name, by)] = (
+            aggregate)
+
+    def __register(self, key, obj):
+        """Adds obj under key to the class, attribute and column indexes."""
+        classname = type(obj).__name__
+        FileStorage.__by_class.setdefault(classname, {})[key] = obj
+        self.__reindex(classname, key, obj,
+                       FileStorage.__indexes.get(classname, ()))
+        columns = FileStorage.__columns.get(classname)
+        if columns is not None:
+            columns.add(key, obj)
+        for aggregate in FileStorage.__aggregates.get(classname, {}).values():
+            aggregate.add(key, obj)
+
+    def __unregister(self, key, obj):
+        """Removes obj under key from the indexes."""
+        classname = type(obj).__name__
+        FileStorage.__by_class[classname].pop(key, None)
+        self.__reindex(classname, key, None,
+                       FileStorage.__indexes.get(classname, ()))
+        columns = FileStorage.__columns.get(classname)
+        if columns is not None:
+            columns.remove(key)
+        for aggregate in FileStorage.__aggregates.get(classname, {}).values():
+            aggregate.remove(key)
+
+    def __build_index(self, classname, name, objs):
+        """Builds the index of attribute name over objs of classname."""
+        buckets = {}
+        values = {}
+        for k, v in objs.items():
+            value = getattr(v, name, None)
+            values[k] = value
+            buckets.setdefault(value, {})[k] = v
+        FileStorage.__attr_index[(classname, name)] = (buckets, values)
+
+    def __reindex(self, classname, key, obj, names):
+        """Moves key to the buckets of the current attribute values of obj.
+
+        obj is None when the object was deleted.
+        """
+        for name in names:
+            buckets, values = FileStorage.__attr_index[(classname, name)]
+            if key in values:
+                old = values.pop(key)
+                bucket = buckets[old]
+                del bucket[key]
+                if not bucket:
+                    del buckets[old]
+            if obj is not None:
+                value = getattr(obj, name, None)
+                values[key] = value
+                buckets.setdefault(value, {})[key] = obj
 
     def new(self, obj):
         """Sets new obj in __objects dictionary."""
         # TODO: should these be more precise specifiers?
         key = "{}.{}".format(type(obj).__name__, obj.id)
-        FileStorage.__objects[key] = obj
+        self.__index()
+        with self.__locked(type(obj).__name__):
+            self.__pending_records().get(type(obj).__name__, {}).pop(key,
+                                                                     None)
+            FileStorage.__objects[key] = obj
+            self.__register(key, obj)
+            FileStorage.__changes[key] = obj
+
+    def changed(self, obj, name=None):
+        """Marks obj as changed since the last save, if it's stored.
+
+        name is the changed attribute, or None if it's unknown. Objects
+        without an id yet, like during __init__(), can't be stored.
+        """
+        id = getattr(obj, "id", None)
+        if id is None:
+            return
+        key = "{}.{}".format(type(obj).__name__, id)
+        if FileStorage.__objects.get(key) is not obj:
+            return
+        classname = type(obj).__name__
+        names = FileStorage.__indexes.get(classname, ())
+        if name is not None:
+            names = [name] if name in names else ()
+        columns = FileStorage.__columns.get(classname)
+        aggregates = FileStorage.__aggregates.get(classname, {})
+        if names or columns is not None or aggregates:
+            self.__index()
+        with self.__locked(classname):
+            if FileStorage.__objects.get(key) is not obj:
+                return
+            FileStorage.__changes[key] = obj
+            if names:
+                self.__reindex(classname, key, obj, names)
+            if columns is not None:
+                columns.update(key, obj, name)
+            for aggregate in aggregates.values():
+                aggregate.update(key, obj, name)
+
+    def delete(self, obj=None):
+        """Deletes obj from __objects if it's inside."""
+        if obj is None:
+            return
+        key = "{}.{}".format(type(obj).__name__, obj.id)
+        self.__index()
+        with self.__locked(type(obj).__name__):
+            if FileStorage.__objects.pop(key, None) is not None:
+                self.__unregister(key, obj)
+                FileStorage.__changes[key] = None
+
+    def __locked(self, classname):
+        """Returns the lock of classname in thread-safe mode.
+
+        Each class has its own lock, held while one of its objects is
+        added, changed or deleted. Outside of thread-safe mode, a
+        context doing nothing is returned.
+        """
+        if not FileStorage.__threadsafe:
+            return contextlib.nullcontext()
+        lock = FileStorage.__class_locks.get(classname)
+        if lock is None:
+            lock = FileStorage.__class_locks.setdefault(classname,
+                                                        threading.RLock())
+        return lock
+
+    def __locked_all(self):
+        """Returns a context holding the locks of every class.
+
+        They're taken in the order of the class names, so two threads
+        taking them can't deadlock.
+        """
+        stack = contextlib.ExitStack()
+        if FileStorage.__threadsafe:
+            for classname in sorted(self.classes()):
+                stack.enter_context(self.__locked(classname))
+        return stack
+
+    def __saving(self):
+        """Returns the lock letting one thread save at a time."""
+        if not FileStorage.__threadsafe:
+            return contextlib.nullcontext()
+        return FileStorage.__save_lock
 
     def save(self):
-        """Serialzes __objects to JSON file."""
-        with open(FileStorage.__file_path, "w", encoding="utf-8") as f:
-            d = {k: v.to_dict() for k, v in FileStorage.__objects.items()}
-            json.dump(d, f)
+        """Serialzes __objects to JSON file.
+
+        In group commit mode the store is only marked dirty, and written
+        once __group_size saves were deferred or __group_interval seconds
+        passed since the last write. flush() writes it right away.
+        """
+        with self.__saving():
+            if not FileStorage.__group_commit:
+                self.__write()
+                return
+            self.__register_atexit()
+            FileStorage.__dirty += 1
+            now = time.monotonic()
+            if (FileStorage.__dirty >= FileStorage.__group_size or
+                    FileStorage.__flushed is None or
+                    now - FileStorage.__flushed >=
+                    FileStorage.__group_interval):
+                self.flush()
+
+    def flush(self):
+        """Writes the saves deferred by group commit mode, if any.
+
+        In writer mode, also waits until the writer thread wrote every
+        queued save, and raises the error of a failed write.
+        """
+        with self.__saving():
+            if FileStorage.__dirty:
+                self.__write()
+        if FileStorage.__writer_queue is not None:
+            FileStorage.__writer_queue.join()
+        self.__raise_writer_error()
+
+    def close(self):
+        """Writes the deferred saves and syncs the journal to disk."""
+        self.flush()
+        FileStorage.__sync_journal()
+
+    def __register_atexit(self):
+        """Makes sure the deferred saves are written and synced at exit."""
+        if not FileStorage.__atexit:
+            atexit.register(self.close)
+            FileStorage.__atexit = True
+
+    def __write(self):
+        """Writes the changes to the JSON file or to the journal.
+
+        In writer mode the changes are serialized right away, but
+        written by the writer thread. After a failed write, a full
+        snapshot is written in journal mode, as the changes of the
+        failed write, destroyed objects included, are unknown.
+        """
+        FileStorage.__dirty = 0
+        FileStorage.__flushed = time.monotonic()
+        if FileStorage.__shared:
+            self.__save_shared()
+            return
+        if FileStorage.__writer_error is not None:
+            FileStorage.__failed = True
+            FileStorage.__cached = None
+        full = FileStorage.__cached is not FileStorage.__objects
+        changes = self.__serialize()
+        if FileStorage.__sharded:
+            task = (self.__write_shards, self.__shards(changes, full))
+        elif FileStorage.__journal and not FileStorage.__failed:
+            task = (self.__append_journal, changes)
+        elif FileStorage.__writer_mode:
+            task = (self.__write_snapshot, dict(FileStorage.__cache))
+        else:
+            task = (self.__write_snapshot, FileStorage.__cache)
+        FileStorage.__failed = False
+        if FileStorage.__writer_mode:
+            self.__submit(task)
+            return
+        try:
+            task[0](task[1])
+        except BaseException:
+            FileStorage.__failed = True
+            FileStorage.__cached = None
+            raise
+
+    def __write_snapshot(self, cache):
+        """Writes the encoded objects of cache to the snapshot file.
+
+        A background compaction is waited for first, so its older merged
+        snapshot can't replace this one, and the journals it replaces
+        are then removed.
+        """
+        self.__join_compactor()
+        serializer = FileStorage.__serializer
+        self.__replace(self.__snapshot_path(),
+                       lambda f: serializer.dump_encoded(cache, f),
+                       serializer.binary)
+        self.__remove_journal()
+
+    def __snapshot_path(self):
+        """Returns the path of the snapshot, with the serializer extension.
+
+        It's __file_path itself for JSON snapshots.
+        """
+        return (os.path.splitext(FileStorage.__file_path)[0] +
+                FileStorage.__serializer.extension)
+
+    def __lock(self, exclusive):
+        """Returns the lock file of the store, locked by this process.
+
+        The lock is exclusive for writers and shared for readers, and
+        released when the file is closed.
+        """
+        f = open(FileStorage.__file_path + ".lock", "a")
+        if fcntl is not None:
+            fcntl.flock(f, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+        return f
+
+    def __signature_of(self):
+        """Returns what identifies the current version of the snapshot.
+
+        Every save in shared mode increments the generation of the
+        snapshot, as its inode may be reused and its modification time
+        too coarse to tell two saves apart. Its inode, modification time
+        and size still tell the saves of processes outside of shared
+        mode. None means no snapshot.
+        """
+        try:
+            st = os.stat(self.__snapshot_path())
+        except FileNotFoundError:
+            return None
+        return (self.__generation(), st.st_ino, st.st_mtime_ns, st.st_size)
+
+    def __generation(self):
+        """Returns the number of saves of the snapshot in shared mode."""
+        try:
+            with open(FileStorage.__file_path + ".generation", "r",
+                      encoding="utf-8") as f:
+                return int(f.read())
+        except (FileNotFoundError, ValueError):
+            return 0
+
+    def __refresh(self):
+        """Reads the objects saved by other processes, in shared mode."""
+        if (FileStorage.__shared and
+                self.__signature_of() != FileStorage.__signature):
+            with self.__lock(False):
+                self.__pull()
+
+    def __pull(self):
+        """Applies the changes saved by other processes since the last sync.
+
+        Objects changed here and not saved yet keep their changes; they
+        conflict if the other process changed them too. Must be called
+        with the lock held.
+        """
+        signature = self.__signature_of()
+        if signature == FileStorage.__signature:
+            return
+        theirs = {}
+        if signature is not None:
+            theirs = self.__read(self.__snapshot_path(), None, True,
+                                 FileStorage.__serializer)[0]
+        self.__load()
+        base = FileStorage.__base
+        for k in set(theirs) | set(base):
+            record = theirs.get(k)
+            if record == base.get(k):
+                continue
+            if k in FileStorage.__changes:
+                FileStorage.__conflicts.setdefault(k, base.get(k))
+            else:
+                self.__apply(k, record)
+        FileStorage.__base = theirs
+        FileStorage.__signature = signature
+
+    def __apply(self, key, record):
+        """Replaces the object of key by a new one built from record.
+
+        The object is removed when record is None.
+        """
+        self.__index()
+        old = FileStorage.__objects.pop(key, None)
+        if old is not None:
+            self.__unregister(key, old)
+        cache = FileStorage.__cache
+        if (FileStorage.__cached is not FileStorage.__objects or
+                cache is None):
+            cache = {}
+        if record is None:
+            cache.pop(key, None)
+            return None
+        obj = self.classes()[record["__class__"]](**record)
+        FileStorage.__objects[key] = obj
+        self.__register(key, obj)
+        cache[key] = FileStorage.__serializer.encode(key, record)
+        return obj
+
+    @staticmethod
+    def __merge(base, theirs, ours):
+        """Returns the three-way merge of the records of one object.
+
+        Attributes changed here since base take their value from ours,
+        the others from theirs. None stands for a deleted object.
+        """
+        if ours is None or theirs is None or base is None:
+            return ours
+        merged = dict(theirs)
+        for name in set(base) | set(ours):
+            if name not in ours:
+                if name in base:
+                    merged.pop(name, None)
+            elif name not in base or ours[name] != base[name]:
+                merged[name] = ours[name]
+        return merged
+
+    def __save_shared(self):
+        """Saves the changes over the latest snapshot of all processes.
+
+        The snapshot is read again under an exclusive lock if another
+        process saved since the last sync. Objects both processes
+        changed are merged attribute by attribute, or, with the fail
+        conflict policy, reset to the other process' version and
+        reported by a ConflictError before anything is written.
+        """
+        with self.__lock(True):
+            self.__pull()
+            changes = FileStorage.__changes
+            conflicts = {k: v for k, v in FileStorage.__conflicts.items()
+                         if k in changes}
+            FileStorage.__conflicts = {}
+            if conflicts and FileStorage.__conflict_policy == "fail":
+                for k in conflicts:
+                    del changes[k]
+                    self.__apply(k, FileStorage.__base.get(k))
+                raise ConflictError(*sorted(conflicts))
+            for k, base in conflicts.items():
+                ours = changes[k].to_dict() if changes[k] is not None \
+                    else None
+                merged = self.__merge(base, FileStorage.__base.get(k), ours)
+                changes[k] = self.__apply(k, merged)
+            full = FileStorage.__cached is not FileStorage.__objects
+            base = {} if full else dict(FileStorage.__base)
+            for k, v in self.__serialize().items():
+                if v is None:
+                    base.pop(k, None)
+                else:
+                    base[k] = v
+            cache = FileStorage.__cache
+            serializer = FileStorage.__serializer
+            self.__replace(self.__snapshot_path(),
+                           lambda f: serializer.dump_encoded(cache, f),
+                           serializer.binary)
+            generation = str(self.__generation() + 1)
+            self.__replace(FileStorage.__file_path + ".generation",
+                           lambda f: f.write(generation))
+            FileStorage.__signature = self.__signature_of()
+            FileStorage.__base = base
+
+    def __shard_dir(self):
+        """Returns the path of the directory of the shards."""
+        return FileStorage.__file_path + ".d"
+
+    def __shard(self, key):
+        """Returns the name of the shard of key.
+
+        Objects of a class listed in __shard_counts are spread over that
+        many shards by a hash of their id, the other classes have a
+        single shard named after them.
+        """
+        classname, _, id = key.partition(".")
+        n = FileStorage.__shard_counts.get(classname, 1)
+        if n <= 1:
+            return classname
+        return "{}.{}".format(classname, zlib.crc32(id.encode()) % n)
+
+    def __shard_names(self):
+        """Returns the names of the shards on disk."""
+        if not os.path.isdir(self.__shard_dir()):
+            return []
+        extension = FileStorage.__serializer.extension
+        return [name[:-len(extension)]
+                for name in os.listdir(self.__shard_dir())
+                if name.endswith(extension)]
+
+    def __manifest(self):
+        """Returns the path of the file holding the shard counts in use."""
+        return os.path.join(self.__shard_dir(), "MANIFEST")
+
+    def __layout(self):
+        """Returns the shard counts, as written to the manifest."""
+        return json.dumps({k: v for k, v in
+                           sorted(FileStorage.__shard_counts.items())
+                           if v > 1})
+
+    def __resharded(self):
+        """Returns True if the shards on disk have other shard counts."""
+        try:
+            with open(self.__manifest(), "r", encoding="utf-8") as f:
+                return f.read() != self.__layout()
+        except FileNotFoundError:
+            return True
+
+    def __write_manifest(self):
+        """Writes the shard counts in use to the manifest."""
+        layout = self.__layout()
+        self.__replace(self.__manifest(), lambda f: f.write(layout))
+
+    def __shards(self, changes, full=False):
+        """Returns the encoded objects of the shards touched by changes.
+
+        With full, every shard is returned, including the shards on disk
+        which are now empty.
+        """
+        cache = FileStorage.__cache
+        if full:
+            shards = {name: {} for name in self.__shard_names()}
+            keys = cache
+        else:
+            shards = {self.__shard(k): {} for k in changes}
+            classnames = {k.partition(".")[0] for k in changes}
+            by_class = self.__index()
+            pending = self.__pending_records()
+            keys = [k for c in classnames
+                    for objs in (by_class.get(c, {}), pending.get(c, {}))
+                    for k in objs]
+        for k in keys:
+            name = self.__shard(k)
+            if full or name in shards:
+                shards.setdefault(name, {})[k] = cache[k]
+        return shards
+
+    def __write_shards(self, shards):
+        """Writes the encoded objects of each shard to its file.
+
+        The file of a shard without objects is removed. The manifest is
+        written along with the first shards.
+        """
+        serializer = FileStorage.__serializer
+        os.makedirs(self.__shard_dir(), exist_ok=True)
+        if not os.path.isfile(self.__manifest()):
+            self.__write_manifest()
+        for name, records in shards.items():
+            path = os.path.join(self.__shard_dir(),
+                                name + serializer.extension)
+            if records:
+                self.__replace(path,
+                               lambda f, r=records: serializer.dump_encoded(
+                                   r, f),
+                               serializer.binary)
+            elif os.path.isfile(path):
+                os.remove(path)
+
+    def __migrate(self, records):
+        """Moves the records of the snapshot and its journal to shards.
+
+        It also spreads the records of shards written with other shard
+        counts over the current ones, and removes the other shards.
+        """
+        encode = FileStorage.__serializer.encode
+        shards = {}
+        for k, v in records.items():
+            shards.setdefault(self.__shard(k), {})[k] = encode(k, v)
+        for name in self.__shard_names():
+            shards.setdefault(name, {})
+        self.__write_shards(shards)
+        self.__write_manifest()
+        if os.path.isfile(self.__snapshot_path()):
+            os.remove(self.__snapshot_path())
+        self.__remove_journal()
+
+    def __submit(self, task):
+        """Queues task for the writer thread, starting it if needed.
+
+        Blocks while __writer_backlog tasks are already waiting. The
+        error of a previous failed write is raised once task is queued.
+        """
+        writer = FileStorage.__writer
+        if writer is None or not writer.is_alive():
+            FileStorage.__writer_queue = queue.Queue(
+                FileStorage.__writer_backlog)
+            writer = threading.Thread(target=self.__run_writer,
+                                      args=(FileStorage.__writer_queue,),
+                                      daemon=True)
+            FileStorage.__writer = writer
+            writer.start()
+            self.__register_atexit()
+        FileStorage.__writer_queue.put(task)
+        self.__raise_writer_error()
+
+    def __run_writer(self, tasks):
+        """Runs the queued writes, keeping the error of the last failed one.
+
+        The writer goes on after an error, so a later save can still
+        write a complete snapshot.
+        """
+        while True:
+            function, arg = tasks.get()
+            try:
+                function(arg)
+            except Exception as e:
+                FileStorage.__writer_error = e
+            finally:
+                tasks.task_done()
+
+    def __raise_writer_error(self):
+        """Raises the error of a failed write of the writer thread.
+
+        Every object is then serialized again by the next save, and
+        written as a full snapshot in journal mode, so the changes of the
+        failed write aren't lost.
+        """
+        error = FileStorage.__writer_error
+        if error is not None:
+            FileStorage.__writer_error = None
+            FileStorage.__failed = True
+            FileStorage.__cached = None
+            raise error
+
+    @staticmethod
+    def __replace(path, dump, binary=False):
+        """Atomically replaces the file at path with what dump writes.
+
+        dump is called with a temporary file, opened in binary mode if
+        binary is True and in text mode otherwise, which is synced to disk
+        and then renamed over path, so a crash leaves either the old or
+        the new file, never a truncated one. The directory is synced
+        too, unless the fsync policy is never. The temporary file is
+        named after the process and thread, so concurrent writers don't
+        share it.
+        """
+        tmp = "{}.{}.{}.tmp".format(path, os.getpid(), threading.get_ident())
+        try:
+            with (open(tmp, "wb") if binary else
+                  open(tmp, "w", encoding="utf-8")) as f:
+                dump(f)
+                synced = FileStorage.__sync(f, False)
+            os.replace(tmp, path)
+        except BaseException:
+            if os.path.isfile(tmp):
+                os.remove(tmp)
+            raise
+        if synced:
+            fd = os.open(os.path.dirname(os.path.abspath(path)), os.O_RDONLY)
+            try:
+                os.fsync(fd)
+            finally:
+                os.close(fd)
+
+    @staticmethod
+    def __sync(f, batched=True):
+        """Flushes f to disk according to the fsync policy.
+
+        With never (or none) no write is synced. Otherwise snapshots,
+        with batched False, always are, and so are journal writes with
+        always. With batched they're synced at most once every
+        __fsync_interval seconds: the writes in between are synced by a
+        timer at the end of the interval, or by close() or at exit.
+        Returns True if f was synced.
+        """
+        policy = FileStorage.__fsync
+        if policy in ("never", "none"):
+            return False
+        now = time.monotonic()
+        if (batched and policy == "batched" and
+                FileStorage.__synced is not None and
+                now - FileStorage.__synced < FileStorage.__fsync_interval):
+            with FileStorage.__sync_lock:
+                FileStorage.__unsynced = f.name
+                if FileStorage.__sync_timer is None:
+                    timer = threading.Timer(
+                        FileStorage.__fsync_interval -
+                        (now - FileStorage.__synced),
+                        FileStorage.__sync_journal)
+                    timer.daemon = True
+                    FileStorage.__sync_timer = timer
+                    timer.start()
+                    atexit.unregister(FileStorage.__sync_journal)
+                    atexit.register(FileStorage.__sync_journal)
+            return False
+        f.flush()
+        os.fsync(f.fileno())
+        FileStorage.__synced = now
+        return True
+
+    @staticmethod
+    def __sync_journal():
+        """Syncs the journal writes left by the batched fsync policy."""
+        with FileStorage.__sync_lock:
+            path = FileStorage.__unsynced
+            timer = FileStorage.__sync_timer
+            FileStorage.__unsynced = None
+            FileStorage.__sync_timer = None
+        if timer is not None:
+            timer.cancel()
+        if path is None:
+            return
+        try:
+            fd = os.open(path, os.O_RDONLY)
+        except FileNotFoundError:
+            return
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+        FileStorage.__synced = time.monotonic()
+
+    def __serialize(self):
+        """Refreshes the cached items of the changed objects.
+
+        The cache holds every object encoded by the serializer, so only
+        objects marked by new() or changed() since the last save go
+        through to_dict() and the encoder, and the snapshot is written
+        by joining the cached items. The cache is built by the first
+        save after a reload, and rebuilt when __objects was replaced or
+        modified behind the storage's back.
+
+        In thread-safe mode the changes are taken over, and __objects
+        copied, while every class is locked, so the objects can keep
+        changing during the serialization.
+
+        Returns the changed keys mapped to their dictionary, or to None
+        for deleted objects.
+        """
+        with self.__locked_all():
+            objects = FileStorage.__objects
+            changes = FileStorage.__changes
+            FileStorage.__changes = {}
+            snapshot = dict(objects) if FileStorage.__threadsafe else objects
+        encode = FileStorage.__serializer.encode
+        cache = FileStorage.__cache
+        records = self.__pending_records()
+        pending = sum(map(len, records.values()))
+        if FileStorage.__cached is not objects:
+            cache = {}
+            changes = dict(changes)
+            changes.update(snapshot)
+        elif cache is None:
+            cache = {k: encode(k, v.to_dict()) for k, v in snapshot.items()
+                     if k not in changes}
+            for v in records.values():
+                cache.update((k, encode(k, r)) for k, r in v.items())
+        d = {}
+        for k, v in changes.items():
+            if v is None:
+                cache.pop(k, None)
+                d[k] = None
+            elif snapshot.get(k) is v:
+                d[k] = v.to_dict()
+                cache[k] = encode(k, d[k])
+        if len(cache) != len(snapshot) + pending:
+            self.__load()
+            cache = {k: cache[k] if k in cache else encode(k, v.to_dict())
+                     for k, v in snapshot.items()}
+        FileStorage.__cache = cache
+        FileStorage.__cached = objects
+        return d
+
+    def __journal_paths(self):
+        """Returns the paths of the live and the compacting journals."""
+        path = FileStorage.__file_path + ".journal"
+        return path, path + ".compacting"
+
+    def __append_journal(self, changes):
+        """Appends changed objects and tombstones to the journal.
+
+        Each line maps one key to its dictionary, or to null when the
+        object was destroyed. The journal is compacted into the snapshot
+        in a background thread once it grows past __journal_limit lines.
+        """
+        if changes:
+            with open(self.__journal_paths()[0], "a",
+                      encoding="utf-8") as f:
+                for k, v in changes.items():
+                    f.write(json.dumps({k: v}))
+                    f.write("\n")
+                self.__sync(f)
+            FileStorage.__journal_size += len(changes)
+        if FileStorage.__journal_size >= FileStorage.__journal_limit:
+            self.compact()
+
+    def compact(self, wait=False):
+        """Folds the journal into the JSON snapshot in the background.
+
+        The live journal is renamed aside so that saves can keep
+        appending while the compactor merges it into file.json.
+        """
+        compactor = FileStorage.__compactor
+        if compactor is not None and compactor.is_alive():
+            if not wait:
+                return
+            compactor.join()
+        journal, compacting = self.__journal_paths()
+        if not os.path.isfile(compacting):
+            if not os.path.isfile(journal):
+                return
+            os.replace(journal, compacting)
+            FileStorage.__journal_size = 0
+        compactor = threading.Thread(target=self.__compact,
+                                     args=(self.__snapshot_path(),
+                                           compacting,
+                                           FileStorage.__serializer))
+        FileStorage.__compactor = compactor
+        compactor.start()
+        if wait:
+            compactor.join()
+
+    @staticmethod
+    def __compact(path, compacting, serializer):
+        """Merges the compacting journal into the snapshot at path."""
+        records = {}
+        if os.path.isfile(path):
+            records, objs = FileStorage.__read(path, None, True, serializer)
+        FileStorage.__replay(records, compacting)
+        FileStorage.__replace(path, lambda f: serializer.dump(records, f),
+                              serializer.binary)
+        os.remove(compacting)
+
+    @staticmethod
+    def __replay(records, journal, tombstones=False):
+        """Applies the entries of journal onto the records dictionary.
+
+        Destroyed objects are removed from records, or with tombstones
+        mapped to None. Returns the list of keys of the replayed entries.
+        """
+        keys = []
+        if not os.path.isfile(journal):
+            return keys
+        with open(journal, "r", encoding="utf-8") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                for k, v in json.loads(line).items():
+                    if v is None and not tombstones:
+                        records.pop(k, None)
+                    else:
+                        records[k] = v
+                    keys.append(k)
+        return keys
+
+    def __join_compactor(self):
+        """Waits for the background compaction, if any, to be done."""
+        compactor = FileStorage.__compactor
+        if compactor is not None:
+            compactor.join()
+            FileStorage.__compactor = None
+
+    def __remove_journal(self):
+        """Removes journal files made stale by a full snapshot."""
+        self.__join_compactor()
+        for path in self.__journal_paths():
+            if os.path.isfile(path):
+                os.remove(path)
+        FileStorage.__journal_size = 0
 
     def classes(self):
         """Returns a dictionary of valid classes and their references."""
@@ -45,18 +1114,162 @@ class FileStorage:
                    "Amenity": Amenity,
                    "Place": Place,
                    "Review": Review}
+        if FileStorage.__compact_models:
+            from models.engine.compact import compact_classes
+            return compact_classes(classes, self.attributes())
         return classes
 
     def reload(self):
-        """Deserializes JSON file into __objects."""
-        if not os.path.isfile(FileStorage.__file_path):
+        """Deserializes JSON file into __objects.
+
+        The file is decoded incrementally and each instance is built as
+        soon as its entry is read. Entries of the journal, if any, are
+        then replayed over the snapshot. The binary format is read in
+        place of JSON when selected.
+
+        In sharded mode the shards are read in parallel threads, and an
+        existing snapshot is migrated to shards.
+
+        In lazy mode only the records are kept, as undecoded text for
+        JSON files, and each instance is built the first time it's
+        looked up. Saves deferred by group
+        commit mode are written first.
+
+        In shared mode the snapshot is read under a shared lock, and
+        becomes the base of the changes of the next save.
+        """
+        self.flush()
+        if not FileStorage.__shared:
+            self.__reload()
             return
-        with open(FileStorage.__file_path, "r", encoding="utf-8") as f:
-            obj_dict = json.load(f)
-            obj_dict = {k: self.classes()[v["__class__"]](**v)
-                        for k, v in obj_dict.items()}
-            # TODO: should this overwrite or insert?
-            FileStorage.__objects = obj_dict
+        with self.__lock(False):
+            signature = self.__signature_of()
+            records = self.__reload()
+            FileStorage.__signature = signature
+            FileStorage.__base = records if signature is not None else {}
+            FileStorage.__conflicts = {}
+
+    def __reload(self):
+        """Reads the snapshot, its journal or its shards into __objects.
+
+        The records read are only kept when they're needed, by lazy or
+        shared mode or to migrate to shards or other shard counts, and
+        then returned; the instances are otherwise built one record at
+        a time. In lazy mode alone, the records of JSON files are kept
+        undecoded until their instance is built.
+        """
+        compactor = FileStorage.__compactor
+        if compactor is not None:
+            compactor.join()
+        journal, compacting = self.__journal_paths()
+        sharded = (FileStorage.__sharded and
+                   os.path.isdir(self.__shard_dir()))
+        snapshot = self.__snapshot_path()
+        if not (sharded or os.path.isfile(snapshot) or
+                os.path.isfile(journal) or os.path.isfile(compacting)):
+            return {}
+        classes = self.classes()
+        lazy = FileStorage.__lazy
+        migrate = FileStorage.__sharded and (not sharded or
+                                             self.__resharded())
+        keep = FileStorage.__shared or migrate
+        records = {}
+        obj_dict = {}
+        if sharded:
+            records, obj_dict = self.__read_files(
+                [os.path.join(self.__shard_dir(),
+                              name + FileStorage.__serializer.extension)
+                 for name in self.__shard_names()], classes, lazy, keep)
+        elif os.path.isfile(snapshot):
+            records, obj_dict = self.__read_files([snapshot], classes, lazy,
+                                                  keep)
+        if not (keep or lazy):
+            records = {}
+        replayed = {}
+        self.__replay(replayed, compacting, True)
+        FileStorage.__journal_size = len(self.__replay(replayed, journal,
+                                                       True))
+        for k, v in replayed.items():
+            if v is None:
+                records.pop(k, None)
+                obj_dict.pop(k, None)
+                continue
+            if keep or lazy:
+                records[k] = v
+            if not lazy:
+                obj_dict[k] = classes[v["__class__"]](**v)
+        pending = {}
+        if lazy:
+            for k, v in records.items():
+                pending.setdefault(k.partition(".")[0], {})[k] = v
+        # TODO: should this overwrite or insert?
+        FileStorage.__objects = obj_dict
+        FileStorage.__pending = pending
+        FileStorage.__pending_of = obj_dict
+        FileStorage.__changes = {}
+        FileStorage.__cache = None
+        FileStorage.__cached = obj_dict
+        self.__index()
+        if migrate:
+            self.__migrate(records)
+        return records
+
+    def __read_files(self, paths, classes, lazy, keep=True):
+        """Returns the records of the snapshots at paths and their objects.
+
+        The records are only kept with keep, or when lazy.
+
+        With __workers above 1, the instances of JSON files are built by
+        a pool of processes; the files are read sequentially if that
+        fails, and in parallel threads when there are several of them.
+        """
+        serializer = FileStorage.__serializer
+        if (FileStorage.__workers > 1 and not lazy and
+                not serializer.binary and
+                not FileStorage.__compact_models):
+            try:
+                result = read_parallel(paths, classes, FileStorage.__workers,
+                                       keep)
+            except (BrokenExecutor, OSError, ValueError):
+                result = None
+            if result is not None:
+                return result
+        records = {}
+        objs = {}
+        with ThreadPoolExecutor() as executor:
+            for r, o in executor.map(
+                    lambda path: self.__read(path, classes, lazy,
+                                             serializer, keep), paths):
+                records.update(r)
+                objs.update(o)
+        return records, objs
+
+    @staticmethod
+    def __read(path, classes, lazy, serializer, keep=True):
+        """Returns the records of the snapshot at path and their objects.
+
+        The file is decoded incrementally and each instance is built as
+        soon as its entry is read, unless lazy is True. The records are
+        only kept with keep, or when lazy. When lazy without keep, the
+        records of a JSON file are returned as their undecoded text if
+        it can be split without decoding it.
+        """
+        records = {}
+        objs = {}
+        with (open(path, "rb") if serializer.binary else
+              open(path, "r", encoding="utf-8")) as f:
+            if lazy and not keep and not serializer.binary:
+                records = raw_items(f.read())
+                if records is not None:
+                    return records, objs
+                records = {}
+                f.seek(0)
+            for k, v in serializer.items(f):
+                if keep or lazy:
+                    records[k] = v
+                if not lazy:
+                    objs[k] = classes[v["__class__"]](**v)
+        return records, objs
 
     def attributes(self):
         """Returns the valid attributes and their types for classname."""
@@ -0,0 +1,113 @@
+#!/usr/bin/python3
+"""Module for streaming decoding of JSON object files."""
+import json
+import json.scanner
+import re
+
+_scan_once = json.scanner.make_scanner(json.JSONDecoder())
+_whitespace = re.compile(r'[ \t\n\r]*')
+_number_tail = re.compile(r'[0-9.eE+-]*\Z')
+
+
+def iter_items(f, chunk_size=65536):
+    """Yields the (key, value) pairs of the JSON object stored in f.
+
+    The file is read chunk_size characters at a time and each value is
+    decoded as soon as it's complete, so neither the whole text nor the
+    whole dictionary are ever held in memory. Like json.load(), the
+    property names of the values share the same string objects.
+
+    While an item isn't complete, each read is as long as the text
+    already waiting for it, so a long item is only scanned again a
+    logarithmic number of times.
+    """
+    buf = ""
+    eof = False
+    while not eof and len(buf.strip()) < 2:
+        chunk = f.read(chunk_size)
+        eof = not chunk
+        buf += chunk
+    pos = _whitespace.match(buf).end()
+    if buf[pos:pos + 1] != "{":
+        raise ValueError("Expecting '{' at the start of the file")
+    pos = _whitespace.match(buf, pos + 1).end()
+    if buf[pos:pos + 1] == "}":
+        return
+    memo = {}
+    while True:
+        item = _scan_item(buf, pos)
+        if item is not None:
+            key, value, pos, c = item
+            if type(value) is dict:
+                value = {memo.setdefault(k, k): v for k, v in value.items()}
+            yield key, value
+            if c == "}":
+                return
+            continue
+        if eof:
+            raise ValueError("Unterminated object in the file")
+        chunk = f.read(max(chunk_size, len(buf) - pos))
+        eof = not chunk
+        buf = buf[pos:] + chunk
+        pos = 0
+
+
+def _scan_item(buf, pos):
+    """Decodes the item starting at pos in buf, and its separator.
+
+    Returns a (key, value, end, separator) tuple, or None if buf ends
+    before the separator following the value, which for a number may
+    go on in the next chunk.
+    """
+    if buf[pos:pos + 1] != '"':
+        pos = _whitespace.match(buf, pos).end()
+        if buf[pos:pos + 1] not in ('"', ""):
+            raise ValueError("Expecting a property name")
+    try:
+        key, end = _scan_once(buf, pos)
+        if buf.startswith(": ", end):
+            end += 2
+        else:
+            end = _whitespace.match(buf, end).end()
+            if buf[end:end + 1] != ":":
+                if buf[end:]:
+                    raise ValueError("Expecting ':' after " + key)
+                return None
+            end = _whitespace.match(buf, end + 1).end()
+        value, end = _scan_once(buf, end)
+    except (StopIteration, json.JSONDecodeError):
+        return None
+    if type(value) in (int, float) and _number_tail.match(buf, end):
+        return None
+    if buf.startswith(", ", end):
+        return key, value, end + 2, ","
+    end = _whitespace.match(buf, end).end()
+    c = buf[end:end + 1]
+    if c == ",":
+        end = _whitespace.match(buf, end + 1).end()
+    elif c != "}":
+        if buf[end:]:
+            raise ValueError("Expecting ',' or '}' after " + key)
+        return None
+    return key, value, end, c
+
+
+def raw_items(text):
+    """Returns the keys of the JSON object text mapped to their values' text.
+
+    The text is split between its items without decoding them, so each
+    value can be decoded with json.loads() only when it's needed. Like
+    parallel.split(), this relies on the layout json.dump() writes for
+    an object of flat objects. Returns None when the text isn't laid out
+    so, or when a key is escaped or a value holds braces, so the caller
+    can decode the text instead.
+    """
+    if not text.startswith('{"') or not text.endswith("}}"):
+        return None if text.strip() != "{}" else {}
+    items = {}
+    for item in text[2:-2].split('}, "'):
+        key, sep, value = item.partition('": {')
+        if not sep or "\\" in key or "{" in value or "}" in value:
+            return None
+        items[key] = "{" + value + "}"
+    return items
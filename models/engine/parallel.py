@@ -0,0 +1,79 @@
+#!/usr/bin/python3
+"""Module for the parallel decoding of JSON object files."""
+import json
+import mmap
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+
+def split(path, n):
+    """Returns up to n (start, end) byte ranges splitting the file at path.
+
+    The file holds a JSON object of flat objects, as written by
+    json.dump(), so outside of a string '}, "' can only end an item:
+    quotes inside strings are escaped. Each range holds whole items,
+    without the braces of the outer object.
+    """
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return []
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m:
+            start = m.find(b"{") + 1
+            end = m.rfind(b"}")
+            if start <= 0 or end < start or not m[start:end].strip():
+                return []
+            ranges = []
+            for i in range(1, n):
+                target = start + (end - start) * i // n
+                if target < start:
+                    continue
+                pos = m.find(b'}, "', target, end)
+                if pos == -1:
+                    break
+                ranges.append((start, pos + 1))
+                start = pos + 3
+            ranges.append((start, end))
+            return ranges
+
+
+def read_range(path, start, end, classes, keep=True):
+    """Returns the records of a byte range of path and their instances.
+
+    The records are only returned with keep, so they aren't sent back
+    from a worker process for nothing; an empty dictionary is otherwise.
+    """
+    with open(path, "rb") as f:
+        f.seek(start)
+        text = f.read(end - start).decode("utf-8")
+    records = json.loads("{" + text + "}")
+    objs = {k: classes[v["__class__"]](**v) for k, v in records.items()}
+    return records if keep else {}, objs
+
+
+def read_parallel(paths, classes, workers, keep=True):
+    """Returns the records of the files at paths and their instances.
+
+    The files are split into ranges decoded by a pool of worker
+    processes, forked so they share the loaded models. Returns None if
+    the platform can't fork, and raises ValueError if a range isn't
+    made of whole items, so the caller can read the files sequentially.
+    The records are only returned with keep, like read_range().
+    """
+    if "fork" not in multiprocessing.get_all_start_methods():
+        return None
+    n = max(1, workers * 2 // max(1, len(paths)))
+    tasks = [(path, start, end) for path in paths
+             for start, end in split(path, n)]
+    records = {}
+    objs = {}
+    context = multiprocessing.get_context("fork")
+    with ProcessPoolExecutor(workers, mp_context=context) as executor:
+        futures = [executor.submit(read_range, path, start, end, classes,
+                                   keep)
+                   for path, start, end in tasks]
+        for future in futures:
+            r, o = future.result()
+            records.update(r)
+            objs.update(o)
+    return records, objs
@@ -0,0 +1,206 @@
+#!/usr/bin/python3
+"""Module for the snapshot formats of FileStorage.
+
+Usage: python3 -m models.engine.serializers <source> <destination>
+converts a snapshot between formats, picked by the file extensions.
+"""
+import json
+import pickle
+import sys
+from datetime import datetime, timedelta
+from models.engine.json_stream import iter_items
+
+_epoch = datetime(1970, 1, 1)
+_microsecond = timedelta(microseconds=1)
+
+
+class JSONSerializer:
+
+    """Class for snapshots in JSON text, one object per record."""
+    name = "json"
+    extension = ".json"
+    binary = False
+
+    def dump(self, records, f):
+        """Writes the records dictionary to the text file f."""
+        json.dump(records, f)
+
+    def encode(self, key, record):
+        """Returns the item of key and record, as json.dump() writes it.
+
+        record can also be the JSON text of a record, written as is.
+        """
+        if type(record) is str:
+            return json.dumps(key) + ": " + record
+        return json.dumps(key) + ": " + json.dumps(record)
+
+    def dump_encoded(self, encoded, f):
+        """Writes the items returned by encode(), by key, to the file f.
+
+        The file is the same as the one dump() writes for their records.
+        """
+        f.write("{")
+        f.write(", ".join(encoded.values()))
+        f.write("}")
+
+    def items(self, f):
+        """Yields the (key, record) pairs stored in the text file f."""
+        return iter_items(f)
+
+
+class BinarySerializer:
+
+    """Class for compact binary snapshots.
+
+    The records are written with pickle protocol 5 as tuples of values
+    sharing a tuple of attribute names per class and schema. Keys are
+    rebuilt from the class name and the id, and timestamps are stored
+    as integer microseconds since the epoch. Records which don't fit,
+    like timestamps with a timezone, are stored whole.
+
+    Only builtin types are written, and loading refuses anything else,
+    so a snapshot can't run code. Like json.dump(), dump() raises
+    TypeError for other values, so a snapshot that couldn't be loaded
+    back is never written.
+    """
+    name = "binary"
+    extension = ".hbnb"
+    binary = True
+    version = 1
+
+    def dump(self, records, f):
+        """Writes the records dictionary to the binary file f."""
+        classes = {}
+        schemas = {}
+        rows = []
+        for k, v in records.items():
+            row = self.__encode(k, v, classes, schemas)
+            rows.append(row if row is not None else (-1, k, v))
+        _Pickler(f, protocol=5).dump({"format": "hbnb",
+                                      "version": self.version,
+                                      "classes": list(classes),
+                                      "schemas": list(schemas),
+                                      "rows": rows})
+
+    def encode(self, key, record):
+        """Returns record, as rows are only built by dump()."""
+        return record
+
+    def dump_encoded(self, encoded, f):
+        """Writes the records returned by encode(), by key, to the file f."""
+        self.dump(encoded, f)
+
+    def __encode(self, key, record, classes, schemas):
+        """Returns the row of record, or None if it must be stored whole."""
+        classname = record.get("__class__")
+        if (not isinstance(classname, str) or
+                key != "{}.{}".format(classname, record.get("id"))):
+            return None
+        try:
+            created_at = self.__timestamp(record["created_at"])
+            updated_at = self.__timestamp(record["updated_at"])
+        except (KeyError, TypeError, ValueError):
+            return None
+        names = tuple(n for n in record
+                      if n not in ("__class__", "id", "created_at",
+                                   "updated_at"))
+        schema = (classes.setdefault(classname, len(classes)), names)
+        index = schemas.setdefault(schema, len(schemas))
+        return (index, record["id"], created_at, updated_at) + tuple(
+            record[n] for n in names)
+
+    @staticmethod
+    def __timestamp(value):
+        """Returns the microseconds since the epoch of an isoformat string.
+
+        Raises ValueError if the string can't be rebuilt from them.
+        """
+        dt = datetime.fromisoformat(value)
+        if dt.tzinfo is not None or dt.isoformat() != value:
+            raise ValueError(value)
+        return (dt - _epoch) // _microsecond
+
+    def items(self, f):
+        """Yields the (key, record) pairs stored in the binary file f."""
+        data = _Unpickler(f).load()
+        if data.get("format") != "hbnb" or data.get("version") != 1:
+            raise ValueError("Unsupported snapshot format")
+        classes = data["classes"]
+        schemas = [(classes[c], names) for c, names in data["schemas"]]
+        for row in data["rows"]:
+            if row[0] == -1:
+                yield row[1], row[2]
+                continue
+            classname, names = schemas[row[0]]
+            record = {"id": row[1],
+                      "created_at": (_epoch + row[2] * _microsecond
+                                     ).isoformat(),
+                      "updated_at": (_epoch + row[3] * _microsecond
+                                     ).isoformat()}
+            record.update(zip(names, row[4:]))
+            record["__class__"] = classname
+            yield "{}.{}".format(classname, row[1]), record
+
+
+class _Pickler(pickle.Pickler):
+
+    """Pickler refusing every value _Unpickler couldn't load."""
+
+    def reducer_override(self, obj):
+        """Refuses to write obj, which isn't of a plain builtin type."""
+        raise TypeError("Object of type {} is not serializable".format(
+            type(obj).__name__))
+
+
+class _Unpickler(pickle.Unpickler):
+
+    """Unpickler refusing every global, so only builtin types load."""
+
+    def find_class(self, module, name):
+        """Refuses to load module.name."""
+        raise pickle.UnpicklingError(
+            "global '{}.{}' is forbidden".format(module, name))
+
+
+serializers = {s.name: s for s in (JSONSerializer(), BinarySerializer())}
+
+
+def by_extension(path):
+    """Returns the serializer of the file at path, from its extension."""
+    for serializer in serializers.values():
+        if path.endswith(serializer.extension):
+            return serializer
+    raise ValueError("Unknown snapshot format: {}".format(path))
+
+
+def read(path, serializer=None):
+    """Returns the records of the snapshot at path."""
+    serializer = serializer or by_extension(path)
+    if serializer.binary:
+        with open(path, "rb") as f:
+            return dict(serializer.items(f))
+    with open(path, "r", encoding="utf-8") as f:
+        return dict(serializer.items(f))
+
+
+def write(path, records, serializer=None):
+    """Writes records to a snapshot at path."""
+    serializer = serializer or by_extension(path)
+    if serializer.binary:
+        with open(path, "wb") as f:
+            serializer.dump(records, f)
+    else:
+        with open(path, "w", encoding="utf-8") as f:
+            serializer.dump(records, f)
+
+
+def convert(source, destination):
+    """Converts the snapshot at source to the format of destination."""
+    write(destination, read(source))
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 3:
+        print("Usage: {} <source> <destination>".format(sys.argv[0]))
+        sys.exit(1)
+    convert(sys.argv[1], sys.argv[2])
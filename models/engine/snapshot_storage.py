@@ -0,0 +1,199 @@
+#!/usr/bin/python3
+"""Module for SnapshotStorage class.
+
+Usage: python3 -m models.engine.snapshot_storage [source] [destination]
+builds the indexed snapshot destination (default file.snap) from the
+FileStorage snapshot source (default file.json).
+"""
+import json
+import mmap
+import os
+import struct
+import sys
+from models.engine.file_storage import FileStorage
+
+_header = struct.Struct("<8sIIQ")
+_magic = b"HBNBSNP1"
+
+
+def write(path, records):
+    """Writes the records dictionary to an indexed snapshot at path.
+
+    The file holds a header, the records as compact JSON one after the
+    other, then an index of fixed-width entries sorted by key, each with
+    the key padded with NUL bytes, the offset and the length of its
+    record.
+    """
+    keys = sorted((k.encode("utf-8"), k) for k in records)
+    width = max((len(k) for k, _ in keys), default=0)
+    entry = struct.Struct("<{}sQI".format(width))
+    offsets = []
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(_header.pack(_magic, 0, 0, 0))
+        for _, k in keys:
+            data = json.dumps(records[k], separators=(",", ":")).encode(
+                "utf-8")
+            offsets.append((f.tell(), len(data)))
+            f.write(data)
+        index = f.tell()
+        for (key, _), (offset, size) in zip(keys, offsets):
+            f.write(entry.pack(key, offset, size))
+        f.seek(0)
+        f.write(_header.pack(_magic, len(keys), width, index))
+    os.replace(tmp, path)
+
+
+class SnapshotStorage:
+
+    """Class for read-only access to an indexed snapshot.
+
+    The snapshot is memory-mapped, so every process reading it shares
+    the same page cache. Keys are found by binary search in the sorted
+    index, and records are decoded into instances only when they're
+    looked up; no instance is kept by the storage.
+    """
+    __file_path = os.getenv("HBNB_SNAPSHOT_PATH", "file.snap")
+    __map = None
+    __count = 0
+    __width = 0
+    __entry = struct.Struct("<0sQI")
+    __index = 0
+
+    def all(self, cls=None):
+        """Returns a dictionary of the objects, or of objects of class cls.
+
+        cls can be a class or a class name.
+        """
+        if cls is None:
+            start, end = 0, SnapshotStorage.__count
+        else:
+            start, end = self.__range(cls)
+        classes = self.classes()
+        return {self.__key(i): self.__decode(i, classes)
+                for i in range(start, end)}
+
+    def get(self, cls, id):
+        """Returns the object of class cls with id, or None if not found.
+
+        cls can be a class or a class name.
+        """
+        if not isinstance(cls, str):
+            cls = cls.__name__
+        key = "{}.{}".format(cls, id)
+        i = self.__search(key.encode("utf-8"))
+        if i < SnapshotStorage.__count and self.__key(i) == key:
+            return self.__decode(i, self.classes())
+        return None
+
+    def count(self, cls=None):
+        """Returns the number of objects, or of objects of class cls."""
+        if cls is None:
+            return SnapshotStorage.__count
+        start, end = self.__range(cls)
+        return end - start
+
+    def find(self, cls, **kwargs):
+        """Returns the objects of class cls whose attributes equal kwargs."""
+        return {k: v for k, v in self.all(cls).items()
+                if all(getattr(v, name, None) == value
+                       for name, value in kwargs.items())}
+
+    def new(self, obj):
+        """Refuses to add obj, as the storage is read-only."""
+        raise PermissionError("the snapshot storage is read-only")
+
+    def changed(self, obj, name=None):
+        """Does nothing, as objects of the snapshot are never saved."""
+        pass
+
+    def delete(self, obj=None):
+        """Refuses to delete obj, as the storage is read-only."""
+        if obj is not None:
+            raise PermissionError("the snapshot storage is read-only")
+
+    def save(self):
+        """Refuses to save, as the storage is read-only."""
+        raise PermissionError("the snapshot storage is read-only")
+
+    def flush(self):
+        """Does nothing, as there's never anything to write."""
+        pass
+
+    def reload(self):
+        """Maps the snapshot file, or a newer version of it, in memory."""
+        self.close()
+        path = SnapshotStorage.__file_path
+        if not os.path.isfile(path) or os.path.getsize(path) == 0:
+            return
+        with open(path, "rb") as f:
+            m = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, count, width, index = _header.unpack_from(m)
+        if magic != _magic:
+            m.close()
+            raise ValueError("{} isn't an indexed snapshot".format(path))
+        SnapshotStorage.__map = m
+        SnapshotStorage.__count = count
+        SnapshotStorage.__width = width
+        SnapshotStorage.__entry = struct.Struct("<{}sQI".format(width))
+        SnapshotStorage.__index = index
+
+    def close(self):
+        """Unmaps the snapshot file."""
+        if SnapshotStorage.__map is not None:
+            SnapshotStorage.__map.close()
+        SnapshotStorage.__map = None
+        SnapshotStorage.__count = 0
+
+    def classes(self):
+        """Returns a dictionary of valid classes and their references."""
+        return FileStorage.classes(self)
+
+    def attributes(self):
+        """Returns the valid attributes and their types for classname."""
+        return FileStorage.attributes(self)
+
+    def __entry_at(self, i):
+        """Returns the padded key, offset and length of entry i."""
+        entry = SnapshotStorage.__entry
+        return entry.unpack_from(SnapshotStorage.__map,
+                                 SnapshotStorage.__index + i * entry.size)
+
+    def __key(self, i):
+        """Returns the key of entry i."""
+        return self.__entry_at(i)[0].rstrip(b"\0").decode("utf-8")
+
+    def __search(self, key):
+        """Returns the first entry whose key isn't lower than key."""
+        width = SnapshotStorage.__width
+        key = key[:width].ljust(width, b"\0")
+        lo, hi = 0, SnapshotStorage.__count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self.__entry_at(mid)[0] < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def __range(self, cls):
+        """Returns the first and past the last entries of class cls.
+
+        cls can be a class or a class name.
+        """
+        if not isinstance(cls, str):
+            cls = cls.__name__
+        return (self.__search((cls + ".").encode("utf-8")),
+                self.__search((cls + "/").encode("utf-8")))
+
+    def __decode(self, i, classes):
+        """Returns the instance built from the record of entry i."""
+        key, offset, size = self.__entry_at(i)
+        record = json.loads(SnapshotStorage.__map[offset:offset + size])
+        return classes[record["__class__"]](**record)
+
+
+if __name__ == "__main__":
+    from models.engine.serializers import read
+    source = sys.argv[1] if len(sys.argv) > 1 else "file.json"
+    write(sys.argv[2] if len(sys.argv) > 2 else "file.snap", read(source))
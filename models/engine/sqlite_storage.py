@@ -0,0 +1,294 @@
+#!/usr/bin/python3
+"""Module for SQLiteStorage class."""
+import json
+import os
+import sqlite3
+import threading
+from models.engine.file_storage import FileStorage
+
+
+class SQLiteStorage:
+
+    """Class for storage of base classes in a SQLite database.
+
+    Each class has its own table, with a column per attribute of its
+    schema and an extra column holding the other attributes as JSON.
+    Objects are read from the database on demand and kept in an
+    identity map, so that each row is built only once. Only the objects
+    changed or deleted since the last save are written back.
+    """
+    __file_path = os.getenv("HBNB_SQLITE_PATH", "file.db")
+    __connection = None
+    __lock = threading.RLock()
+    __objects = {}
+    __by_class = {}
+    __complete = set()
+    __changes = {}
+    __indexes = {"City": ["state_id"],
+                 "Place": ["city_id", "user_id"],
+                 "Review": ["place_id", "user_id"]}
+    __types = {str: "TEXT", int: "INTEGER", float: "REAL"}
+
+    def all(self, cls=None):
+        """Returns the dictionary of objects, or of objects of class cls.
+
+        cls can be a class or a class name.
+        """
+        if cls is None:
+            for classname in self.classes():
+                self.__load_class(classname)
+            return SQLiteStorage.__objects
+        if not isinstance(cls, str):
+            cls = cls.__name__
+        return self.__load_class(cls)
+
+    def get(self, cls, id):
+        """Returns the object of class cls with id, or None if not found.
+
+        cls can be a class or a class name.
+        """
+        if not isinstance(cls, str):
+            cls = cls.__name__
+        key = "{}.{}".format(cls, id)
+        obj = SQLiteStorage.__objects.get(key)
+        if (obj is not None or cls not in self.classes() or
+                cls in SQLiteStorage.__complete or
+                key in SQLiteStorage.__changes):
+            return obj
+        row = self.__execute("SELECT * FROM {} WHERE id = ?".format(cls),
+                             (id,)).fetchone()
+        return self.__build(cls, row) if row is not None else None
+
+    def count(self, cls=None):
+        """Returns the number of objects, or of objects of class cls."""
+        if cls is None:
+            return sum(self.count(classname) for classname in self.classes())
+        if not isinstance(cls, str):
+            cls = cls.__name__
+        if cls not in self.classes():
+            return 0
+        if (cls in SQLiteStorage.__complete or
+                any(k.partition(".")[0] == cls
+                    for k in SQLiteStorage.__changes)):
+            return len(self.__load_class(cls))
+        return self.__execute("SELECT COUNT(*) FROM {}".format(cls)
+                              ).fetchone()[0]
+
+    def find(self, cls, **kwargs):
+        """Returns the objects of class cls whose attributes equal kwargs.
+
+        The attributes of the schema are looked up in the database, the
+        other ones only filter the matching rows.
+        """
+        if not isinstance(cls, str):
+            cls = cls.__name__
+        if cls not in self.classes():
+            return {}
+        columns = self.__columns(cls)
+        where = [(k, v) for k, v in kwargs.items()
+                 if k in columns and type(v) in SQLiteStorage.__types]
+        if cls in SQLiteStorage.__complete or not where:
+            objs = self.__load_class(cls)
+        else:
+            sql = "SELECT * FROM {} WHERE {}".format(
+                cls, " AND ".join("{} = ?".format(k) for k, v in where))
+            objs = {}
+            for row in self.__execute(sql, [v for k, v in where]):
+                obj = self.__build(cls, row)
+                if obj is not None:
+                    objs["{}.{}".format(cls, obj.id)] = obj
+            for k, v in SQLiteStorage.__changes.items():
+                if v is not None and type(v).__name__ == cls:
+                    objs[k] = v
+        return {k: v for k, v in objs.items()
+                if all(getattr(v, name, None) == value
+                       for name, value in kwargs.items())}
+
+    def indexes(self):
+        """Returns the indexed attributes of each classname."""
+        return SQLiteStorage.__indexes
+
+    def add_index(self, cls, name):
+        """Declares an index on the attribute name of cls."""
+        if not isinstance(cls, str):
+            cls = cls.__name__
+        names = SQLiteStorage.__indexes.setdefault(cls, [])
+        if name not in names:
+            names.append(name)
+            if (SQLiteStorage.__connection is not None and
+                    name in self.__columns(cls)):
+                self.__create_index(cls, name)
+
+    def new(self, obj):
+        """Adds obj to the objects to save."""
+        key = "{}.{}".format(type(obj).__name__, obj.id)
+        self.__add(key, obj)
+        SQLiteStorage.__changes[key] = obj
+
+    def changed(self, obj, name=None):
+        """Marks obj as changed since the last save, if it's stored."""
+        key = "{}.{}".format(type(obj).__name__, obj.id)
+        if SQLiteStorage.__objects.get(key) is obj:
+            SQLiteStorage.__changes[key] = obj
+
+    def delete(self, obj=None):
+        """Deletes obj from the objects if it's inside."""
+        if obj is None:
+            return
+        key = "{}.{}".format(type(obj).__name__, obj.id)
+        if SQLiteStorage.__objects.pop(key, None) is not None:
+            SQLiteStorage.__by_class[type(obj).__name__].pop(key, None)
+        SQLiteStorage.__changes[key] = None
+
+    def save(self):
+        """Writes the rows of the objects changed since the last save."""
+        changes = SQLiteStorage.__changes
+        SQLiteStorage.__changes = {}
+        connection = self.__connect()
+        with SQLiteStorage.__lock, connection:
+            for k, v in changes.items():
+                classname, _, id = k.partition(".")
+                if v is None:
+                    connection.execute(
+                        "DELETE FROM {} WHERE id = ?".format(classname),
+                        (id,))
+                    continue
+                row = self.__row(v)
+                connection.execute(
+                    "INSERT OR REPLACE INTO {} ({}) VALUES ({})".format(
+                        classname, ", ".join(row),
+                        ", ".join("?" * len(row))),
+                    list(row.values()))
+
+    def flush(self):
+        """Does nothing, as save() never defers its writes."""
+        pass
+
+    def reload(self):
+        """Opens the database and forgets the objects read so far."""
+        SQLiteStorage.__objects = {}
+        SQLiteStorage.__by_class = {}
+        SQLiteStorage.__complete = set()
+        SQLiteStorage.__changes = {}
+        self.__connect()
+
+    def close(self):
+        """Closes the database connection."""
+        if SQLiteStorage.__connection is not None:
+            SQLiteStorage.__connection.close()
+            SQLiteStorage.__connection = None
+
+    def classes(self):
+        """Returns a dictionary of valid classes and their references."""
+        return FileStorage.classes(self)
+
+    def attributes(self):
+        """Returns the valid attributes and their types for classname."""
+        return FileStorage.attributes(self)
+
+    def __connect(self):
+        """Returns the connection to the database, opening it if needed.
+
+        The tables and indexes are created if they don't exist yet. The
+        connection can be used from other threads, such as the one of an
+        AsyncStorage, its statements being run under __lock.
+        """
+        if SQLiteStorage.__connection is not None:
+            return SQLiteStorage.__connection
+        connection = sqlite3.connect(SQLiteStorage.__file_path,
+                                     check_same_thread=False)
+        SQLiteStorage.__connection = connection
+        with SQLiteStorage.__lock, connection:
+            for classname in self.classes():
+                columns = self.__columns(classname)
+                connection.execute(
+                    "CREATE TABLE IF NOT EXISTS {} "
+                    "(id TEXT PRIMARY KEY, {}, extra TEXT)".format(
+                        classname,
+                        ", ".join("{} {}".format(k, v)
+                                  for k, v in columns.items()
+                                  if k != "id")))
+                for name in self.indexes().get(classname, ()):
+                    if name in columns:
+                        self.__create_index(classname, name)
+        return connection
+
+    def __execute(self, sql, parameters=()):
+        """Executes sql and returns its cursor."""
+        with SQLiteStorage.__lock:
+            return self.__connect().execute(sql, parameters)
+
+    def __create_index(self, classname, name):
+        """Creates the index of column name in the table of classname."""
+        with SQLiteStorage.__lock:
+            SQLiteStorage.__connection.execute(
+                "CREATE INDEX IF NOT EXISTS {0}_{1} ON {0} ({1})".format(
+                    classname, name))
+
+    def __columns(self, classname):
+        """Returns the columns of the table of classname and their types."""
+        attributes = self.attributes()
+        schema = dict(attributes["BaseModel"])
+        schema.update(attributes.get(classname, {}))
+        return {k: SQLiteStorage.__types.get(v, "TEXT")
+                for k, v in schema.items()}
+
+    def __row(self, obj):
+        """Returns the values of the row of obj, by column."""
+        d = obj.to_dict()
+        del d["__class__"]
+        row = {}
+        for k, v in self.__columns(type(obj).__name__).items():
+            value = d.pop(k, None)
+            if value is not None and type(value) not in SQLiteStorage.__types:
+                value = json.dumps(value)
+            row[k] = value
+        row["extra"] = json.dumps(d) if d else None
+        return row
+
+    def __build(self, classname, row):
+        """Returns the object of a row of the table of classname.
+
+        The object in the identity map is returned if it was already
+        built, and None if it was deleted since the last save.
+        """
+        key = "{}.{}".format(classname, row[0])
+        if key in SQLiteStorage.__changes:
+            return SQLiteStorage.__changes[key]
+        if key in SQLiteStorage.__objects:
+            return SQLiteStorage.__objects[key]
+        attributes = self.attributes().get(classname, {})
+        d = {}
+        for k, v in zip(self.__columns(classname), row):
+            if v is None:
+                continue
+            if attributes.get(k) not in (None, str, int, float):
+                try:
+                    v = json.loads(v)
+                except (TypeError, ValueError):
+                    pass
+            d[k] = v
+        if row[-1] is not None:
+            d.update(json.loads(row[-1]))
+        d["__class__"] = classname
+        obj = self.classes()[classname](**d)
+        self.__add(key, obj)
+        return obj
+
+    def __add(self, key, obj):
+        """Adds obj under key to the identity map."""
+        SQLiteStorage.__objects[key] = obj
+        SQLiteStorage.__by_class.setdefault(type(obj).__name__, {})[key] = obj
+
+    def __load_class(self, classname):
+        """Reads every row of classname into the identity map.
+
+        Returns the objects of classname, by key.
+        """
+        if classname not in SQLiteStorage.__complete:
+            if classname in self.classes():
+                for row in self.__execute("SELECT * FROM {}".format(
+                        classname)):
+                    self.__build(classname, row)
+            SQLiteStorage.__complete.add(classname)
+        return SQLiteStorage.__by_class.setdefault(classname, {})
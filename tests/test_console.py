@@ -3,6 +3,7 @@
 
 from console import HBNBCommand
 from models.engine.file_storage import FileStorage
+from models import storage
 import unittest
 import datetime
 from unittest.mock import patch
@@ -10,6 +11,7 @@ import sys
 from io import StringIO
 import re
 import os
+import tempfile
 
 
 class TestHBNBCommand(unittest.TestCase):
@@ -53,7 +55,8 @@ class TestHBNBCommand(unittest.TestCase):
         s = """
 Documented commands (type help <topic>):
 ========================================
-EOF  all  count  create  destroy  help  quit  show  update
+EOF        all    create   explain  help    quit  source  where
+aggregate  count  destroy  export   import  show  update
 
 """
         self.assertEqual(s, f.getvalue())
@@ -140,6 +143,14 @@ EOF  all  count  create  destroy  help  quit  show  update
         self.assertTrue(len(msg) == 1)
         self.assertEqual("\n", msg)
 
+    def test_quit_flush(self):
+        """Tests quit and EOF write the saves deferred by the storage."""
+        for command in ("quit", "EOF"):
+            with patch('sys.stdout', new=StringIO()) as f:
+                with patch('models.storage.flush') as flush:
+                    HBNBCommand().onecmd(command)
+            flush.assert_called_once_with()
+
     def test_emptyline(self):
         """Tests emptyline functionality."""
         with patch('sys.stdout', new=StringIO()) as f:
@@ -357,6 +368,187 @@ EOF  all  count  create  destroy  help  quit  show  update
         self.assertTrue(len(s) > 0)
         self.assertIn(uid, s)
 
+    def test_do_all_output(self):
+        """Tests all prints the list of the string representations."""
+        with patch('sys.stdout', new=StringIO()) as f:
+            HBNBCommand().onecmd("all")
+        self.assertEqual(f.getvalue(), "[]\n")
+        for i in range(3):
+            self.create_class("Place")
+        self.create_class("User")
+        for line, cls in (("all", None), ("all Place", "Place"),
+                          ("Place.all()", "Place")):
+            expected = StringIO()
+            print([str(obj) for obj in storage.all(cls).values()],
+                  file=expected)
+            with patch('sys.stdout', new=StringIO()) as f:
+                HBNBCommand().onecmd(line)
+            self.assertEqual(f.getvalue(), expected.getvalue())
+
+    def test_do_all_paging(self):
+        """Tests all with --limit and --offset."""
+        for i in range(5):
+            self.create_class("Place")
+        self.create_class("User")
+        places = [str(obj) for obj in storage.all("Place").values()]
+        for options, expected in (("--limit 2", places[:2]),
+                                  ("--offset 3", places[3:]),
+                                  ("--limit 2 --offset 2", places[2:4]),
+                                  ("--offset 4 --limit 9", places[4:]),
+                                  ("--limit 0", [])):
+            with patch('sys.stdout', new=StringIO()) as f:
+                HBNBCommand().onecmd("all Place {}".format(options))
+            self.assertEqual(f.getvalue(), str(expected) + "\n")
+        with patch('sys.stdout', new=StringIO()) as f:
+            HBNBCommand().onecmd("all --limit 1")
+        self.assertEqual(f.getvalue().count("] ("), 1)
+        with patch('sys.stdout', new=StringIO()) as f:
+            HBNBCommand().onecmd("all Place --limit many")
+        self.assertEqual(f.getvalue(), "** invalid limit **\n")
+        with patch('sys.stdout', new=StringIO()) as f:
+            HBNBCommand().onecmd("all Place --offset -1")
+        self.assertEqual(f.getvalue(), "** invalid offset **\n")
+
+    def test_where(self):
+        """Tests where filters instances and projects attributes."""
+        objs = []
+        for i in range(6):
+            p = storage.classes()["Place"]()
+            p.name = "Place {}".format(i)
+            p.price_by_night = i * 50
+            p.max_guest = i
+            p.city_id = "c{}".format(i % 2)
+            objs.append(p)
+        objs[4].name = "Place 4, with a comma"
+        self.create_class("User")
+        for line, expected in (
+                ('where Place name="Place 4, with a comma", max_guest=4',
+                 objs[4:5]),
+                ("where Place price_by_night<100, max_guest>=1", objs[1:2]),
+                ("Place.where(price_by_night<=100, max_guest>=1)", objs[1:3]),
+                ('Place.where(name="Place 3")', objs[3:4]),
+                ('where Place city_id=c1, max_guest!=3', objs[1::4]),
+                ("where Place max_guest>9", []),
+                ("where Place", objs)):
+            with patch('sys.stdout', new=StringIO()) as f:
+                HBNBCommand().onecmd(line)
+            self.assertEqual(sorted(eval(f.getvalue())),
+                             sorted(str(o) for o in expected), line)
+        with patch('sys.stdout', new=StringIO()) as f:
+            HBNBCommand().onecmd("Place.where(max_guest=2, name, max_guest)")
+        self.assertEqual(f.getvalue(),
+                         "[{'name': 'Place 2', 'max_guest': 2}]\n")
+        for line, msg in (("where", "** class name missing **"),
+                          ("where Garbage", "** class doesn't exist **"),
+                          ("where Place max_guest>x",
+                           "** invalid condition: max_guest>x **"),
+                          ("where Place max guest",
+                           "** invalid condition: max guest **"),
+                          ('where Place amenity_ids="a"',
+                           '** invalid condition: amenity_ids="a" **')):
+            with patch('sys.stdout', new=StringIO()) as f:
+                HBNBCommand().onecmd(line)
+            self.assertEqual(f.getvalue(), msg + "\n")
+
+    def test_explain(self):
+        """Tests explain reports an index, the columns or a scan."""
+        for i in range(4):
+            c = storage.classes()["City"]()
+            c.state_id = "s{}".format(i % 2)
+            c.name = "City {}".format(i)
+        for line, plan in (
+                ("explain City state_id=s1", "index (state_id): 2"
+                 " candidates, 2 matches"),
+                ('City.explain(state_id="s0", name="City 0")',
+                 "index (state_id): 2 candidates, 1 matches"),
+                ("explain City name=x", "scan: 4 candidates, 0 matches")):
+            with patch('sys.stdout', new=StringIO()) as f:
+                HBNBCommand().onecmd(line)
+            self.assertEqual(f.getvalue(), plan + "\n")
+
+    def test_explain_columns(self):
+        """Tests where filters through the columns of places."""
+        FileStorage._FileStorage__columnar = ["Place"]
+        self.addCleanup(setattr, FileStorage, "_FileStorage__columnar", [])
+        self.resetStorage()
+        for i in range(5):
+            p = storage.classes()["Place"]()
+            p.price_by_night = i * 50
+        with patch('sys.stdout', new=StringIO()) as f:
+            HBNBCommand().onecmd("explain Place price_by_night<100")
+        self.assertEqual(f.getvalue(),
+                         "columns (price_by_night): 5 candidates, 2 matches\n")
+        with patch('sys.stdout', new=StringIO()) as f:
+            HBNBCommand().onecmd("where Place price_by_night>=100")
+        self.assertEqual(len(eval(f.getvalue())), 3)
+
+    def test_aggregate(self):
+        """Tests aggregate computes functions by group."""
+        for i in range(6):
+            p = storage.classes()["Place"]()
+            p.city_id = "c{}".format(i % 2)
+            p.price_by_night = i * 10
+            p.max_guest = i
+        storage.classes()["Place"]().city_id = "c2"
+        for line, expected in (
+                ("Place.aggregate(count())", "7"),
+                ("aggregate Place sum(price_by_night)", "150"),
+                ("Place.aggregate(avg(price_by_night), by=city_id)",
+                 "{'c0': 20.0, 'c1': 30.0, 'c2': 0.0}"),
+                ("Place.aggregate(max(max_guest), by=city_id, "
+                 "price_by_night<40)", "{'c0': 2, 'c1': 3, 'c2': 0}"),
+                ("Place.aggregate(min(price_by_night), count(), "
+                 "city_id=c1)",
+                 "{'min(price_by_night)': 10, 'count()': 3}"),
+                ("Place.aggregate(avg(max_guest), max_guest>9)", "None")):
+            with patch('sys.stdout', new=StringIO()) as f:
+                HBNBCommand().onecmd(line)
+            self.assertEqual(f.getvalue(), expected + "\n", line)
+        for line, msg in (("aggregate Place", "** function missing **"),
+                          ("aggregate Place sum()",
+                           "** invalid function: sum() **"),
+                          ("aggregate Place median(max_guest)",
+                           "** invalid function: median(max_guest) **"),
+                          ("aggregate Garbage count()",
+                           "** class doesn't exist **")):
+            with patch('sys.stdout', new=StringIO()) as f:
+                HBNBCommand().onecmd(line)
+            self.assertEqual(f.getvalue(), msg + "\n")
+
+    def test_aggregate_plans(self):
+        """Tests aggregate reads the maintained aggregates or columns."""
+        aggregated = FileStorage._FileStorage__aggregated
+        FileStorage._FileStorage__aggregated = {}
+        FileStorage._FileStorage__columnar = ["Place"]
+        self.addCleanup(setattr, FileStorage, "_FileStorage__aggregated",
+                        aggregated)
+        self.addCleanup(setattr, FileStorage, "_FileStorage__columnar", [])
+        self.resetStorage()
+        storage.add_aggregate("Place", "price_by_night", "city_id")
+        places = []
+        for i in range(4):
+            p = storage.classes()["Place"]()
+            p.city_id = "c{}".format(i % 2)
+            p.price_by_night = i * 10
+            places.append(p)
+        specs = [("avg", "price_by_night"), ("max", "price_by_night")]
+        console = HBNBCommand()
+        self.assertEqual(console._aggregate("Place", specs, "city_id", []),
+                         ("aggregates", [{"c0": 10.0, "c1": 20.0},
+                                         {"c0": 20, "c1": 30}]))
+        places[3].city_id = "c0"
+        storage.delete(places[2])
+        self.assertEqual(console._aggregate("Place", specs, "city_id", []),
+                         ("aggregates", [{"c0": 15.0, "c1": 10.0},
+                                         {"c0": 30, "c1": 10}]))
+        self.assertEqual(
+            console._aggregate("Place", specs, "city_id",
+                               [("price_by_night", ">", 0)]),
+            ("columns", [{"c0": 30.0, "c1": 10.0}, {"c0": 30, "c1": 10}]))
+        self.assertEqual(console._aggregate("Place", [("count", None)],
+                                            "name", []),
+                         ("scan", [{"": 3}]))
+
     def test_do_all_error(self):
         """Tests all command with errors."""
         with patch('sys.stdout', new=StringIO()) as f:
@@ -662,6 +854,198 @@ EOF  all  count  create  destroy  help  quit  show  update
         msg = f.getvalue()[:-1]
         self.assertEqual(msg, "** value missing **")
 
+    def write_script(self, lines):
+        """Writes a command file and returns its path."""
+        fd, path = tempfile.mkstemp(suffix=".hbnb")
+        with os.fdopen(fd, "w") as f:
+            f.write("\n".join(lines) + "\n")
+        self.addCleanup(os.remove, path)
+        return path
+
+    def test_source(self):
+        """Tests source runs a file with a single save."""
+        uid = self.create_class("User")
+        path = self.write_script(
+            ["# seed", "create Place", "create State",
+             'update User {} first_name "Betty"'.format(uid),
+             "User.count()"])
+        with patch('sys.stdout', new=StringIO()) as f:
+            with patch('models.storage.save',
+                       wraps=storage.save) as save:
+                HBNBCommand().onecmd("source {}".format(path))
+        save.assert_called_once_with()
+        lines = f.getvalue().splitlines()
+        self.assertEqual(len(lines), 3)
+        self.assertEqual(lines[2], "1")
+        storage.reload()
+        self.assertEqual(storage.count("Place"), 1)
+        self.assertEqual(storage.get("User", uid).first_name, "Betty")
+
+    def test_source_rollback(self):
+        """Tests source rolls back the changes when a command fails."""
+        uid = self.create_class("User")
+        other = self.create_class("State")
+        before = {k: v.to_dict() for k, v in storage.all().items()}
+        path = self.write_script(
+            ["create Place",
+             'update User {} first_name "Betty"'.format(uid),
+             "destroy State {}".format(other),
+             "show User 1234"])
+        with patch('sys.stdout', new=StringIO()) as f:
+            with patch('models.storage.save') as save:
+                self.assertFalse(HBNBCommand().source(path))
+        save.assert_not_called()
+        self.assertEqual(f.getvalue().splitlines()[1:],
+                         ["** no instance found **",
+                          "** {}:4: rolled back **".format(path)])
+        self.assertEqual({k: v.to_dict() for k, v in storage.all().items()},
+                         before)
+        self.assertEqual(storage.count("Place"), 0)
+
+    def test_source_nested(self):
+        """Tests a failure in a nested source fails the outer one."""
+        uid = self.create_class("User")
+        before = {k: v.to_dict() for k, v in storage.all().items()}
+        inner = self.write_script(["create Place",
+                                   "update User 1234 name Betty"])
+        path = self.write_script(["create State",
+                                  "source {}".format(inner),
+                                  "create City"])
+        with patch('sys.stdout', new=StringIO()) as f:
+            with patch('models.storage.save') as save:
+                self.assertFalse(HBNBCommand().source(path))
+        save.assert_not_called()
+        self.assertEqual(f.getvalue().splitlines()[2:],
+                         ["** no instance found **",
+                          "** {}:2: failed **".format(inner),
+                          "** {}:2: rolled back **".format(path)])
+        self.assertEqual({k: v.to_dict() for k, v in storage.all().items()},
+                         before)
+
+    def test_source_error(self):
+        """Tests source with a missing file."""
+        with patch('sys.stdout', new=StringIO()) as f:
+            HBNBCommand().onecmd("source")
+        self.assertEqual(f.getvalue(), "** file name missing **\n")
+        with patch('sys.stdout', new=StringIO()) as f:
+            HBNBCommand().onecmd("source /nonexistent.hbnb")
+        self.assertEqual(f.getvalue(), "** file doesn't exist **\n")
+
+    def test_import_jsonl(self):
+        """Tests import reads JSON Lines with typed values."""
+        uid = self.create_class("Place")
+        path = self.write_script(
+            ['{"name": "Loft", "number_rooms": "3", "latitude": 1}',
+             '{{"id": "{}", "__class__": "Place", "name": "Villa"}}'.format(
+                 uid),
+             '{"amenity_ids": ["a", "b"]}'])
+        with patch('sys.stdout', new=StringIO()) as f:
+            with patch.object(HBNBCommand, "chunk_size", 2):
+                with patch('models.storage.save',
+                           wraps=storage.save) as save:
+                    HBNBCommand().onecmd("import Place {}".format(path))
+        self.assertEqual(f.getvalue(), "3\n")
+        self.assertEqual(save.call_count, 2)
+        storage.reload()
+        places = sorted(storage.all("Place").values(),
+                        key=lambda p: getattr(p, "name", ""))
+        self.assertEqual(len(places), 3)
+        self.assertEqual(places[0].amenity_ids, ["a", "b"])
+        self.assertEqual((places[1].name, places[1].number_rooms,
+                          places[1].latitude), ("Loft", 3, 1.0))
+        self.assertEqual((places[2].id, places[2].name), (uid, "Villa"))
+
+    def test_import_invalid(self):
+        """Tests import stops at the first invalid record."""
+        path = self.write_script(['{"name": "Loft"}',
+                                  '{"number_rooms": "many"}',
+                                  '{"name": "Villa"}'])
+        with patch('sys.stdout', new=StringIO()) as f:
+            HBNBCommand().onecmd("import Place {}".format(path))
+        self.assertEqual(f.getvalue(),
+                         "** {}: record 2 is invalid **\n1\n".format(path))
+        self.assertEqual(storage.count("Place"), 1)
+        with patch('sys.stdout', new=StringIO()) as f:
+            HBNBCommand().onecmd("import Place")
+        self.assertEqual(f.getvalue(), "** file name missing **\n")
+        with patch('sys.stdout', new=StringIO()) as f:
+            HBNBCommand().onecmd("import Garbage {}".format(path))
+        self.assertEqual(f.getvalue(), "** class doesn't exist **\n")
+        fd, path = tempfile.mkstemp(suffix=".csv")
+        os.close(fd)
+        self.addCleanup(os.remove, path)
+        with open(path, "w") as f:
+            f.write("name\nLoft\n{}\n".format("x" * 200000))
+        with patch('sys.stdout', new=StringIO()) as f:
+            HBNBCommand().onecmd("import Place {}".format(path))
+        self.assertEqual(f.getvalue(), "** invalid file **\n1\n")
+        with open(path, "w") as f:
+            f.write("name,description\nLoft,Nice\nVilla,Big,EXTRA\n")
+        with patch('sys.stdout', new=StringIO()) as f:
+            HBNBCommand().onecmd("import Place {}".format(path))
+        self.assertEqual(f.getvalue(),
+                         "** {}: record 2 is invalid **\n1\n".format(path))
+
+    def test_export_import(self):
+        """Tests export writes files import reads back, in both formats."""
+        for i in range(3):
+            p = storage.classes()["Place"]()
+            p.name = "Place {}".format(i)
+            p.max_guest = i
+            p.amenity_ids = [str(i)]
+            p.save()
+        p.description = ""
+        p.name = '"Quoted", {}'.format(p.name)
+        p.save()
+        expected = {k: v.to_dict() for k, v in storage.all().items()}
+        for suffix in (".csv", ".jsonl"):
+            fd, path = tempfile.mkstemp(suffix=suffix)
+            os.close(fd)
+            self.addCleanup(os.remove, path)
+            with patch('sys.stdout', new=StringIO()) as f:
+                HBNBCommand().onecmd("export Place {}".format(path))
+            self.assertEqual(f.getvalue(), "3\n")
+            self.resetStorage()
+            with patch('sys.stdout', new=StringIO()) as f:
+                HBNBCommand().onecmd("import Place {}".format(path))
+            self.assertEqual(f.getvalue(), "3\n")
+            self.assertEqual(
+                {k: v.to_dict() for k, v in storage.all().items()}, expected)
+
+    def test_read_only(self):
+        """Tests commands changing instances with a read-only storage."""
+        from models.engine.snapshot_storage import SnapshotStorage, write
+        uid = self.create_class("Place")
+        write("test_file.snap",
+              {k: v.to_dict() for k, v in storage.all().items()})
+        self.addCleanup(os.remove, "test_file.snap")
+        with patch.object(SnapshotStorage, "_SnapshotStorage__file_path",
+                          "test_file.snap"):
+            snapshot = SnapshotStorage()
+            snapshot.reload()
+            self.addCleanup(snapshot.close)
+        path = self.write_script(['{"name": "Loft"}'])
+        with patch("console.storage", snapshot), \
+                patch("models.base_model.storage", snapshot):
+            for line in ("create Place", "destroy Place {}",
+                         'update Place {} name "Loft"',
+                         'Place.update("{}", {{"name": "Loft"}})',
+                         "import Place " + path):
+                with patch('sys.stdout', new=StringIO()) as f:
+                    HBNBCommand().onecmd(line.format(uid))
+                self.assertEqual(f.getvalue().splitlines()[0],
+                                 "** storage is read-only **", line)
+            batch = self.write_script(
+                ['update Place {} name "Loft"'.format(uid)])
+            with patch('sys.stdout', new=StringIO()) as f:
+                self.assertFalse(HBNBCommand().source(batch))
+            self.assertEqual(f.getvalue().splitlines(),
+                             ["** storage is read-only **",
+                              "** {}:1: rolled back **".format(batch)])
+            with patch('sys.stdout', new=StringIO()) as f:
+                HBNBCommand().onecmd("show Place {}".format(uid))
+            self.assertIn(uid, f.getvalue())
+
     def create_class(self, classname):
         """Creates a class for console tests."""
         with patch('sys.stdout', new=StringIO()) as f:
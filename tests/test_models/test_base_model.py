@@ -158,6 +158,18 @@ class TestBaseModel(unittest.TestCase):
         o = BaseModel(**d)
         self.assertEqual(o.to_dict(), d)
 
+    def test_4_instantiation_no_microseconds(self):
+        """Tests instantiation with timestamps without microseconds."""
+        d = {"__class__": "BaseModel",
+             "updated_at": datetime(2050, 12, 30, 23, 59, 59).isoformat(),
+             "created_at": datetime(2017, 9, 28, 21, 3, 54).isoformat(),
+             "id": str(uuid.uuid4())}
+        o = BaseModel(**d)
+        self.assertEqual(o.created_at, datetime(2017, 9, 28, 21, 3, 54))
+        self.assertEqual(o.updated_at, datetime(2050, 12, 30, 23, 59, 59))
+        self.assertEqual(o.to_dict(), d)
+        self.assertEqual(BaseModel(**o.to_dict()).to_dict(), d)
+
     def test_5_save(self):
         """Tests that storage.save() is called from save()."""
         self.resetStorage()
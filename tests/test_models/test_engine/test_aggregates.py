@@ -0,0 +1,116 @@
+#!/usr/bin/python3
+"""Unittest module for the Aggregate class."""
+
+import unittest
+import os
+from types import SimpleNamespace
+from models import storage
+from models.place import Place
+from models.engine.aggregates import Aggregate
+from models.engine.file_storage import FileStorage, _aggregated
+
+
+class TestAggregate(unittest.TestCase):
+    """Test Cases for the Aggregate class."""
+
+    def setUp(self):
+        """Sets up test methods."""
+        self.aggregate = Aggregate("price", "city")
+        for key, price, city in (("A", 10, "x"), ("B", 20, "y"),
+                                 ("C", "bad", "x"), ("D", 30, "x")):
+            self.aggregate.add(key, SimpleNamespace(price=price, city=city))
+
+    def test_result(self):
+        """Tests the results of each function."""
+        a = self.aggregate
+        self.assertEqual(a.result("count"), {"x": 2, "y": 1})
+        self.assertEqual(a.result("sum"), {"x": 40, "y": 20})
+        self.assertEqual(a.result("avg"), {"x": 20.0, "y": 20.0})
+        self.assertEqual(a.result("min"), {"x": 10, "y": 20})
+        self.assertEqual(a.result("max"), {"x": 30, "y": 20})
+        with self.assertRaises(ValueError):
+            a.result("median")
+        total = Aggregate()
+        self.assertEqual(total.result("count"), 0)
+        total.add(None, SimpleNamespace())
+        self.assertEqual(total.result("count"), 1)
+        with self.assertRaises(ValueError):
+            total.result("sum")
+        self.assertIsNone(Aggregate("price").result("max"))
+
+    def test_update_remove(self):
+        """Tests the results follow changed and removed rows."""
+        a = self.aggregate
+        a.update("D", SimpleNamespace(price=5, city="x"), "price")
+        self.assertEqual(a.result("max"), {"x": 10, "y": 20})
+        self.assertEqual(a.result("min"), {"x": 5, "y": 20})
+        a.update("B", SimpleNamespace(price=20, city="x"), "name")
+        self.assertEqual(a.result("count"), {"x": 2, "y": 1})
+        a.update("B", SimpleNamespace(price=20, city="x"))
+        self.assertEqual(a.result("count"), {"x": 3})
+        a.remove("A")
+        a.remove("A")
+        self.assertEqual(a.result("sum"), {"x": 25})
+        self.assertEqual(a.result("min"), {"x": 5})
+        self.assertEqual(a.result("max"), {"x": 20})
+        a.update("E", SimpleNamespace(price=1, city="x"))
+        self.assertEqual(a.result("count"), {"x": 2})
+
+    def test_aggregated(self):
+        """Tests parsing the aggregates of HBNB_STORAGE_AGGREGATES."""
+        self.assertEqual(_aggregated(""), {})
+        self.assertEqual(
+            _aggregated("Place.price_by_night:city_id,Review:user_id,User"),
+            {"Place": [("price_by_night", "city_id")],
+             "Review": [(None, "user_id")],
+             "User": [(None, None)]})
+
+
+class TestAggregatedStorage(unittest.TestCase):
+    """Test Cases for the aggregates maintained by FileStorage."""
+
+    def setUp(self):
+        """Sets up test methods."""
+        self.aggregated = FileStorage._FileStorage__aggregated
+        FileStorage._FileStorage__aggregated = {}
+        self.resetStorage()
+
+    def tearDown(self):
+        """Tears down test methods."""
+        FileStorage._FileStorage__aggregated = self.aggregated
+        self.resetStorage()
+
+    def resetStorage(self):
+        """Resets FileStorage data."""
+        FileStorage._FileStorage__objects = {}
+        if os.path.isfile(FileStorage._FileStorage__file_path):
+            os.remove(FileStorage._FileStorage__file_path)
+
+    def test_aggregates(self):
+        """Tests the aggregates follow the stored objects."""
+        a = Place()
+        a.city_id = "1"
+        a.price_by_night = 100
+        storage.add_aggregate(Place, "price_by_night", "city_id")
+        b = Place()
+        b.city_id = "2"
+        b.price_by_night = 50
+        c = Place()
+        c.city_id = "1"
+        aggregate = storage.aggregates("Place")[("price_by_night",
+                                                 "city_id")]
+        self.assertEqual(aggregate.result("sum"), {"1": 100, "2": 50})
+        c.price_by_night = 20
+        b.city_id = "1"
+        storage.delete(a)
+        self.assertEqual(aggregate.result("sum"), {"1": 70})
+        self.assertEqual(storage.aggregates("User"), {})
+        storage.save()
+        storage.reload()
+        aggregate = storage.aggregates("Place")[("price_by_night",
+                                                 "city_id")]
+        self.assertEqual(aggregate.result("avg"), {"1": 35.0})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,131 @@
+#!/usr/bin/python3
+"""Unittest module for the AsyncStorage class."""
+
+import unittest
+import asyncio
+import json
+import os
+import threading
+from unittest.mock import patch
+from models import storage
+from models.base_model import BaseModel
+from models.engine.async_storage import AsyncStorage
+from models.engine.file_storage import FileStorage
+from models.engine.sqlite_storage import SQLiteStorage
+
+
+class TestAsyncStorage(unittest.TestCase):
+    """Test Cases for the AsyncStorage class."""
+
+    def setUp(self):
+        """Sets up test methods."""
+        FileStorage._FileStorage__objects = {}
+        self.removeFile()
+
+    def tearDown(self):
+        """Tears down test methods."""
+        FileStorage._FileStorage__objects = {}
+        self.removeFile()
+
+    def removeFile(self):
+        """Removes the storage file."""
+        if os.path.isfile(FileStorage._FileStorage__file_path):
+            os.remove(FileStorage._FileStorage__file_path)
+
+    def test_asave_areload_aget(self):
+        """Tests asave(), areload() and aget() go through the storage."""
+        astorage = AsyncStorage()
+
+        async def run():
+            b = BaseModel()
+            await astorage.asave()
+            FileStorage._FileStorage__objects = {}
+            await astorage.areload()
+            return b, await astorage.aget("BaseModel", b.id)
+
+        b, found = asyncio.run(run())
+        self.assertEqual(found.to_dict(), b.to_dict())
+        self.assertEqual(astorage.count(), 1)
+
+    def test_asave_executor(self):
+        """Tests asave() writes outside of the event loop thread."""
+        threads = []
+        save = storage.save
+
+        def record():
+            threads.append(threading.current_thread())
+            save()
+
+        with patch.object(storage, "save", record):
+            asyncio.run(AsyncStorage().asave())
+        self.assertEqual(len(threads), 1)
+        self.assertIsNot(threads[0], threading.main_thread())
+
+    def test_asave_coalesce(self):
+        """Tests concurrent asave() calls share saves."""
+        astorage = AsyncStorage()
+        started = threading.Event()
+        release = threading.Event()
+        calls = []
+        save = storage.save
+
+        def slow():
+            calls.append(storage.count())
+            started.set()
+            release.wait(5)
+            save()
+
+        async def run():
+            BaseModel()
+            first = asyncio.ensure_future(astorage.asave())
+            await asyncio.get_running_loop().run_in_executor(
+                None, started.wait, 5)
+            BaseModel()
+            others = [astorage.asave() for i in range(10)]
+            waiting = asyncio.ensure_future(asyncio.gather(*others))
+            await asyncio.sleep(0)
+            release.set()
+            await first
+            await waiting
+
+        with patch.object(storage, "save", slow):
+            asyncio.run(run())
+        self.assertEqual(calls, [1, 2])
+        with open(FileStorage._FileStorage__file_path, "r") as f:
+            self.assertEqual(len(json.load(f)), 2)
+
+    def test_asave_sqlite(self):
+        """Tests asave() and aget() with a SQLite storage."""
+        SQLiteStorage._SQLiteStorage__file_path = "test_file.db"
+        sqlite = SQLiteStorage()
+        sqlite.close()
+        sqlite.reload()
+        astorage = AsyncStorage(sqlite)
+
+        async def run():
+            b = BaseModel()
+            sqlite.new(b)
+            await astorage.asave()
+            await astorage.areload()
+            return b, await astorage.aget("BaseModel", b.id)
+
+        try:
+            b, found = asyncio.run(run())
+            self.assertEqual(found.to_dict(), b.to_dict())
+        finally:
+            sqlite.close()
+            os.remove("test_file.db")
+            SQLiteStorage._SQLiteStorage__file_path = "file.db"
+
+    def test_base_model_asave(self):
+        """Tests BaseModel.asave() updates and saves the instance."""
+        b = BaseModel()
+        updated_at = b.updated_at
+        asyncio.run(b.asave())
+        self.assertGreater(b.updated_at, updated_at)
+        with open(FileStorage._FileStorage__file_path, "r") as f:
+            self.assertIn("BaseModel." + b.id, json.load(f))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,207 @@
+#!/usr/bin/python3
+"""Unittest module for the Columns class."""
+
+import unittest
+import os
+from types import SimpleNamespace
+from models import storage
+from models.place import Place
+from models.engine import columns as columns_module
+from models.engine.columns import Columns
+from models.engine.file_storage import FileStorage
+
+
+class TestColumns(unittest.TestCase):
+    """Test Cases for the Columns class."""
+
+    def setUp(self):
+        """Sets up test methods."""
+        self.columns = Columns({"rooms": int, "price": float}, ["city"])
+        self.rows = [("A", 1, 10.5, "x"), ("B", 3, 20.0, "y"),
+                     ("C", 2, "bad", "x"), ("D", 5, 30.0, "y")]
+        for key, rooms, price, city in self.rows:
+            self.columns.add(key, SimpleNamespace(rooms=rooms, price=price,
+                                                  city=city))
+
+    def run_both(self, test):
+        """Runs test with and without NumPy."""
+        test()
+        numpy = columns_module.numpy
+        if numpy is not None:
+            columns_module.numpy = None
+            try:
+                test()
+            finally:
+                columns_module.numpy = numpy
+
+    def test_filter(self):
+        """Tests filtering rows on conditions."""
+        def test():
+            c = self.columns
+            self.assertEqual(sorted(c.filter(("rooms", ">=", 2))),
+                             ["B", "C", "D"])
+            self.assertEqual(sorted(c.filter(("rooms", ">", 1),
+                                             ("city", "==", "x"))), ["C"])
+            self.assertEqual(sorted(c.filter(("price", "<", 25))),
+                             ["A", "B"])
+            self.assertEqual(c.filter(("city", "==", "z")), {})
+            self.assertEqual(len(c.filter()), 4)
+            with self.assertRaises(ValueError):
+                c.filter(("city", "<", "x"))
+            with self.assertRaises(KeyError):
+                c.filter(("name", "==", "x"))
+        self.run_both(test)
+
+    def test_aggregate(self):
+        """Tests aggregating numeric columns."""
+        def test():
+            c = self.columns
+            self.assertEqual(c.aggregate("count"), 4)
+            self.assertEqual(c.aggregate("count", "price"), 3)
+            self.assertEqual(c.aggregate("sum", "rooms"), 11)
+            self.assertIs(type(c.aggregate("sum", "rooms")), int)
+            self.assertAlmostEqual(c.aggregate("avg", "price"), 60.5 / 3)
+            self.assertEqual(c.aggregate("min", "price"), 10.5)
+            self.assertEqual(c.aggregate("max", "rooms"), 5)
+            self.assertEqual(c.aggregate("sum", "rooms", by="city"),
+                             {"x": 3, "y": 8})
+            self.assertEqual(c.aggregate("max", "price", by="city"),
+                             {"x": 10.5, "y": 30.0})
+            self.assertEqual(c.aggregate("count", by="city",
+                                         where=[("rooms", ">", 1)]),
+                             {"x": 1, "y": 2})
+            self.assertEqual(c.aggregate("count",
+                                         where=[("rooms", ">", 9)]), 0)
+            self.assertIsNone(c.aggregate("avg", "price",
+                                          where=[("rooms", ">", 9)]))
+            with self.assertRaises(ValueError):
+                c.aggregate("median", "price")
+            with self.assertRaises(ValueError):
+                c.aggregate("sum")
+        self.run_both(test)
+
+    @unittest.skipIf(columns_module.numpy is None, "NumPy isn't installed")
+    def test_numpy(self):
+        """Tests the NumPy queries match the ones looping in Python."""
+        numpy = columns_module.numpy
+        c = self.columns
+        mask = c.mask(("rooms", ">", 1), ("city", "==", "y"))
+        self.assertIsInstance(mask, numpy.ndarray)
+        self.assertEqual(mask.tolist(), [False, True, False, True])
+        queries = [("count", None, None, ()),
+                   ("count", "price", None, ()),
+                   ("sum", "rooms", None, ()),
+                   ("avg", "price", None, ()),
+                   ("min", "price", "city", ()),
+                   ("max", "rooms", "city", [("price", ">", 15)]),
+                   ("avg", "rooms", "city", [("city", "!=", "x")]),
+                   ("count", None, "city", [("rooms", ">", 9)]),
+                   ("sum", "price", None, [("rooms", ">", 9)])]
+        results = [c.aggregate(*q) for q in queries]
+        filtered = c.filter(("price", ">=", 20), ("city", "==", "y"))
+        columns_module.numpy = None
+        try:
+            self.assertEqual(results, [c.aggregate(*q) for q in queries])
+            self.assertEqual(filtered, c.filter(("price", ">=", 20),
+                                                ("city", "==", "y")))
+        finally:
+            columns_module.numpy = numpy
+        for result in results:
+            values = result.values() if isinstance(result, dict) \
+                else [result]
+            for value in values:
+                self.assertIn(type(value), (int, float, type(None)))
+
+    @unittest.skipIf(columns_module.numpy is None, "NumPy isn't installed")
+    def test_numpy_empty(self):
+        """Tests the NumPy queries over no rows."""
+        c = Columns({"rooms": int}, ["city"])
+        self.assertEqual(c.mask().tolist(), [])
+        self.assertEqual(c.filter(("rooms", ">", 1)), {})
+        self.assertEqual(c.aggregate("count"), 0)
+        self.assertIsNone(c.aggregate("max", "rooms"))
+        self.assertEqual(c.aggregate("sum", "rooms", by="city"), {})
+
+    def test_update_remove(self):
+        """Tests updating and removing rows."""
+        c = self.columns
+        o = c.objs[c.rows["A"]]
+        o.rooms = 7
+        c.update("A", o, "rooms")
+        self.assertEqual(c.aggregate("max", "rooms"), 7)
+        c.remove("A")
+        c.remove("A")
+        self.assertEqual(len(c), 3)
+        self.assertEqual(sorted(c.keys), ["B", "C", "D"])
+        self.assertEqual(c.aggregate("max", "rooms"), 5)
+        self.assertEqual(sorted(c.filter(("city", "==", "y"))), ["B", "D"])
+        for key in list(c.keys):
+            c.remove(key)
+        self.assertEqual(c.aggregate("count"), 0)
+
+
+class TestColumnarStorage(unittest.TestCase):
+    """Test Cases for the columnar mode of FileStorage."""
+
+    def setUp(self):
+        """Sets up test methods."""
+        FileStorage._FileStorage__columnar = ["Place"]
+        self.resetStorage()
+
+    def tearDown(self):
+        """Tears down test methods."""
+        FileStorage._FileStorage__columnar = []
+        self.resetStorage()
+
+    def resetStorage(self):
+        """Resets FileStorage data."""
+        FileStorage._FileStorage__objects = {}
+        if os.path.isfile(FileStorage._FileStorage__file_path):
+            os.remove(FileStorage._FileStorage__file_path)
+
+    def test_columns(self):
+        """Tests the columns follow the stored objects."""
+        self.assertIsNone(storage.columns("User"))
+        a = Place()
+        a.city_id = "1"
+        a.number_rooms = 3
+        b = Place()
+        b.city_id = "2"
+        b.price_by_night = 100
+        c = Place()
+        c.city_id = "1"
+        c.number_rooms = 5
+        columns = storage.columns(Place)
+        self.assertEqual(len(columns), 3)
+        self.assertEqual(columns.aggregate("sum", "number_rooms",
+                                           by="city_id"),
+                         {"1": 8, "2": 0})
+        self.assertEqual(columns.filter(("price_by_night", ">", 50)),
+                         {"Place." + b.id: b})
+        storage.delete(a)
+        self.assertEqual(columns.aggregate("sum", "number_rooms"), 5)
+        a.save()
+        storage.reload()
+        columns = storage.columns("Place")
+        self.assertEqual(len(columns), 3)
+        self.assertEqual(columns.aggregate("sum", "number_rooms"), 8)
+        self.assertEqual(set(columns.filter(("city_id", "==", "1"))),
+                         {"Place." + a.id, "Place." + c.id})
+
+    def test_lazy(self):
+        """Tests the columns of lazily reloaded objects."""
+        for i in range(3):
+            o = Place()
+            o.number_rooms = i
+        storage.save()
+        FileStorage._FileStorage__lazy = True
+        try:
+            storage.reload()
+            self.assertEqual(storage.columns("Place").aggregate(
+                "max", "number_rooms"), 2)
+        finally:
+            FileStorage._FileStorage__lazy = False
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,132 @@
+#!/usr/bin/python3
+"""Unittest module for the compact model classes."""
+
+import unittest
+import json
+import os
+import tracemalloc
+from datetime import datetime
+from models import storage
+from models.base_model import BaseModel
+from models.engine.file_storage import FileStorage
+from models.engine.compact import compact_classes
+
+
+class TestCompact(unittest.TestCase):
+    """Test Cases for the compact model classes."""
+
+    def setUp(self):
+        """Sets up test methods."""
+        FileStorage._FileStorage__compact_models = True
+        self.classes = storage.classes()
+
+    def tearDown(self):
+        """Tears down test methods."""
+        FileStorage._FileStorage__compact_models = False
+        self.resetStorage()
+
+    def resetStorage(self):
+        """Resets FileStorage data."""
+        FileStorage._FileStorage__objects = {}
+        if os.path.isfile(FileStorage._FileStorage__file_path):
+            os.remove(FileStorage._FileStorage__file_path)
+
+    def test_classes(self):
+        """Tests the compact classes are subclasses of the models."""
+        FileStorage._FileStorage__compact_models = False
+        classes = storage.classes()
+        self.assertEqual(list(self.classes), list(classes))
+        for classname, cls in self.classes.items():
+            self.assertTrue(issubclass(cls, classes[classname]))
+            self.assertEqual(cls.__name__, classname)
+            self.assertIs(cls, compact_classes(classes,
+                                               storage.attributes())
+                          [classname])
+
+    def test_no_dict(self):
+        """Tests compact instances don't hold their attributes in __dict__."""
+        for classname, cls in self.classes.items():
+            o = cls()
+            o.name = "Laura"
+            o.foo = 108
+            self.assertEqual(object.__getattribute__(o, "__dict__"), {})
+
+    def test_memory(self):
+        """Tests compact instances take less memory than regular ones."""
+        record = {k: v() for k, v in storage.attributes()["Place"].items()}
+        record.update(created_at="2017-09-28T21:05:54",
+                      updated_at="2017-09-28T21:05:54")
+        sizes = []
+        for compact in (False, True):
+            FileStorage._FileStorage__compact_models = compact
+            cls = storage.classes()["Place"]
+            tracemalloc.start()
+            objs = [cls(id=str(i), **record) for i in range(1000)]
+            sizes.append(tracemalloc.get_traced_memory()[0])
+            tracemalloc.stop()
+            self.assertEqual(len(objs), 1000)
+        self.assertLess(sizes[1], sizes[0] * 0.75)
+
+    def test_attributes(self):
+        """Tests the schema attributes and their defaults."""
+        for classname, cls in self.classes.items():
+            o = cls()
+            for k, v in storage.attributes()[classname].items():
+                self.assertTrue(hasattr(o, k))
+                self.assertEqual(type(getattr(o, k, None)), v)
+
+    def test_extra_attributes(self):
+        """Tests attributes outside of the schema."""
+        cls = self.classes["Place"]
+        o = cls()
+        o.foo = "bar"
+        o.max_guest = 4
+        self.assertEqual(o.foo, "bar")
+        self.assertEqual(o.max_guest, 4)
+        del o.foo
+        self.assertFalse(hasattr(o, "foo"))
+        with self.assertRaises(AttributeError):
+            o.bar
+
+    def test_to_dict(self):
+        """Tests to_dict() matches the one of the regular classes."""
+        FileStorage._FileStorage__compact_models = False
+        for classname, cls in storage.classes().items():
+            o = cls()
+            o.name = "Holberton"
+            o.my_number = 89
+            d = o.to_dict()
+            c = self.classes[classname](**d)
+            self.assertEqual(c.to_dict(), d)
+            self.assertEqual(c.created_at, o.created_at)
+            self.assertIn("'my_number': 89", str(c))
+            self.assertTrue(str(c).startswith(
+                "[{}] ({}) ".format(classname, o.id)))
+
+    def test_storage(self):
+        """Tests compact instances are saved and reloaded."""
+        self.resetStorage()
+        objs = [cls() for cls in self.classes.values()]
+        objs[0].name = "Laura"
+        objs[1].save()
+        d = {k: v.to_dict() for k, v in storage.all().items()}
+        with open(FileStorage._FileStorage__file_path,
+                  "r", encoding="utf-8") as f:
+            self.assertEqual(json.load(f), d)
+        storage.reload()
+        self.assertEqual({k: v.to_dict() for k, v in storage.all().items()},
+                         d)
+        for k, v in storage.all().items():
+            self.assertIs(type(v), self.classes[k.split(".")[0]])
+
+    def test_changed(self):
+        """Tests attribute changes reach the storage indexes."""
+        self.resetStorage()
+        o = self.classes["Review"]()
+        o.place_id = "1"
+        self.assertEqual(storage.find("Review", place_id="1"),
+                         {"Review." + o.id: o})
+
+
+if __name__ == '__main__':
+    unittest.main()
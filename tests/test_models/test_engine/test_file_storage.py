@@ -10,6 +10,9 @@ from models import storage
 import re
 import json
 import os
+import shutil
+import threading
+from unittest.mock import patch
 
 
 class TestFileStorage(unittest.TestCase):
@@ -150,10 +153,91 @@ class TestFileStorage(unittest.TestCase):
         """Tests all() with too many arguments."""
         self.resetStorage()
         with self.assertRaises(TypeError) as e:
-            FileStorage.all(self, 98)
-        msg = "all() takes 1 positional argument but 2 were given"
+            FileStorage.all(self, 98, 99)
+        msg = "all() takes from 1 to 2 positional arguments but 3 were given"
         self.assertEqual(str(e.exception), msg)
 
+    def help_test_all_class(self, classname):
+        """Helps test all() method with a class for classname."""
+        self.resetStorage()
+        objs = {c: cls() for c, cls in storage.classes().items()}
+        o = objs[classname]
+        key = "{}.{}".format(classname, o.id)
+        self.assertEqual(storage.all(classname), {key: o})
+        self.assertEqual(storage.all(type(o)), {key: o})
+        self.assertEqual(storage.count(classname), 1)
+        storage.delete(o)
+        self.assertEqual(storage.all(classname), {})
+        self.assertEqual(storage.count(classname), 0)
+        self.assertEqual(storage.count(), len(objs) - 1)
+
+    def test_5_all_class(self):
+        """Tests all() and count() with a class for every class."""
+        for classname in storage.classes():
+            self.help_test_all_class(classname)
+
+    def test_5_all_class_reset(self):
+        """Tests all() with a class after __objects was replaced."""
+        self.resetStorage()
+        BaseModel()
+        FileStorage._FileStorage__objects = {}
+        self.assertEqual(storage.all(BaseModel), {})
+        self.assertEqual(storage.count(BaseModel), 0)
+        b = BaseModel()
+        storage.save()
+        storage.reload()
+        self.assertEqual(list(storage.all(BaseModel)),
+                         ["BaseModel." + b.id])
+
+    def test_5_find(self):
+        """Tests find() through an attribute index."""
+        self.resetStorage()
+        from models.review import Review
+        reviews = [Review() for i in range(6)]
+        for i, r in enumerate(reviews):
+            r.place_id = str(i % 2)
+        even = {"Review." + r.id: r for r in reviews[::2]}
+        self.assertEqual(storage.find(Review, place_id="0"), even)
+        self.assertEqual(storage.find("Review", place_id="2"), {})
+        reviews[0].place_id = "2"
+        del even["Review." + reviews[0].id]
+        self.assertEqual(storage.find(Review, place_id="0"), even)
+        self.assertEqual(list(storage.find(Review, place_id="2")),
+                         ["Review." + reviews[0].id])
+        storage.delete(reviews[2])
+        del even["Review." + reviews[2].id]
+        self.assertEqual(storage.find(Review, place_id="0"), even)
+        storage.save()
+        storage.reload()
+        self.assertEqual(list(storage.find(Review, place_id="0")),
+                         list(even))
+
+    def test_5_find_many_attributes(self):
+        """Tests find() with indexed and unindexed attributes."""
+        self.resetStorage()
+        from models.place import Place
+        places = [Place() for i in range(4)]
+        for i, p in enumerate(places):
+            p.city_id = "c"
+            p.max_guest = i
+        self.assertEqual(storage.find(Place, city_id="c", max_guest=2),
+                         {"Place." + places[2].id: places[2]})
+        self.assertEqual(storage.find(Place, max_guest=3),
+                         {"Place." + places[3].id: places[3]})
+
+    def test_5_add_index(self):
+        """Tests add_index() on an existing attribute."""
+        self.resetStorage()
+        from models.user import User
+        self.addCleanup(storage.indexes().pop, "User")
+        u = User()
+        u.email = "laura@hbnb.io"
+        storage.add_index(User, "email")
+        self.assertEqual(storage.find(User, email="laura@hbnb.io"),
+                         {"User." + u.id: u})
+        u.email = "arthur@hbnb.io"
+        self.assertEqual(storage.find(User, email="laura@hbnb.io"), {})
+
     def help_test_new(self, classname):
         """Helps tests new() method for classname."""
         self.resetStorage()
@@ -369,6 +453,627 @@ class TestFileStorage(unittest.TestCase):
         msg = "reload() takes 1 positional argument but 2 were given"
         self.assertEqual(str(e.exception), msg)
 
+    def resetJournal(self):
+        """Resets the journal mode and removes journal files."""
+        storage.compact(True)
+        FileStorage._FileStorage__journal = False
+        FileStorage._FileStorage__changes = {}
+        FileStorage._FileStorage__journal_size = 0
+        journal = FileStorage._FileStorage__file_path + ".journal"
+        for path in (journal, journal + ".compacting"):
+            if os.path.isfile(path):
+                os.remove(path)
+
+    def test_5_journal_save(self):
+        """Tests save() appends only changed objects to the journal."""
+        self.resetStorage()
+        self.addCleanup(self.resetJournal)
+        FileStorage._FileStorage__journal = True
+        b1 = BaseModel()
+        b2 = BaseModel()
+        storage.save()
+        b1.name = "Laura"
+        b1.save()
+        journal = FileStorage._FileStorage__file_path + ".journal"
+        with open(journal, "r", encoding="utf-8") as f:
+            lines = [json.loads(line) for line in f]
+        self.assertEqual(len(lines), 3)
+        self.assertEqual(lines[-1], {"BaseModel." + b1.id: b1.to_dict()})
+        self.assertFalse(os.path.isfile(FileStorage._FileStorage__file_path))
+
+    def test_5_journal_delete(self):
+        """Tests delete() appends a tombstone to the journal."""
+        self.resetStorage()
+        self.addCleanup(self.resetJournal)
+        FileStorage._FileStorage__journal = True
+        b = BaseModel()
+        storage.save()
+        key = "BaseModel." + b.id
+        storage.delete(b)
+        storage.save()
+        self.assertNotIn(key, storage.all())
+        journal = FileStorage._FileStorage__file_path + ".journal"
+        with open(journal, "r", encoding="utf-8") as f:
+            lines = [json.loads(line) for line in f]
+        self.assertEqual(lines[-1], {key: None})
+        storage.reload()
+        self.assertNotIn(key, storage.all())
+
+    def test_5_journal_reload(self):
+        """Tests reload() replays the journal over the snapshot."""
+        self.resetStorage()
+        self.addCleanup(self.resetJournal)
+        objs = [storage.classes()[c]() for c in storage.classes()]
+        storage.save()
+        FileStorage._FileStorage__journal = True
+        objs[0].name = "Laura"
+        objs[0].save()
+        storage.delete(objs[1])
+        storage.save()
+        expected = {k: v.to_dict() for k, v in storage.all().items()}
+        storage.reload()
+        self.assertEqual(
+            {k: v.to_dict() for k, v in storage.all().items()}, expected)
+
+    def test_5_reload_records(self):
+        """Tests reload() doesn't keep the records it reads."""
+        self.resetStorage()
+        objs = [BaseModel() for i in range(3)]
+        storage.save()
+        read = FileStorage._FileStorage__read
+        path = FileStorage._FileStorage__file_path
+        serializer = FileStorage._FileStorage__serializer
+        records, objs = read(path, storage.classes(), False, serializer,
+                             False)
+        self.assertEqual(records, {})
+        self.assertEqual(len(objs), 3)
+        records, objs = read(path, storage.classes(), True, serializer,
+                             False)
+        self.assertEqual(len(records), 3)
+        self.assertEqual(objs, {})
+
+    def test_5_journal_compact(self):
+        """Tests the journal is compacted into the snapshot."""
+        self.resetStorage()
+        self.addCleanup(self.resetJournal)
+        FileStorage._FileStorage__journal = True
+        objs = [BaseModel() for i in range(10)]
+        storage.save()
+        storage.delete(objs[0])
+        storage.save()
+        storage.compact(True)
+        journal = FileStorage._FileStorage__file_path + ".journal"
+        self.assertFalse(os.path.isfile(journal))
+        self.assertFalse(os.path.isfile(journal + ".compacting"))
+        expected = {k: v.to_dict() for k, v in storage.all().items()}
+        with open(FileStorage._FileStorage__file_path,
+                  "r", encoding="utf-8") as f:
+            self.assertEqual(json.load(f), expected)
+        storage.reload()
+        self.assertEqual(
+            {k: v.to_dict() for k, v in storage.all().items()}, expected)
+
+    def test_5_save_changed_only(self):
+        """Tests save() serializes only changed objects."""
+        self.resetStorage()
+        objs = [BaseModel() for i in range(10)]
+        storage.save()
+        calls = []
+        to_dict = BaseModel.to_dict
+
+        def counting_to_dict(obj):
+            calls.append(obj)
+            return to_dict(obj)
+        BaseModel.to_dict = counting_to_dict
+        try:
+            objs[3].name = "Laura"
+            storage.save()
+            storage.save()
+        finally:
+            BaseModel.to_dict = to_dict
+        self.assertEqual(calls, [objs[3]])
+        d = {k: v.to_dict() for k, v in storage.all().items()}
+        with open(FileStorage._FileStorage__file_path,
+                  "r", encoding="utf-8") as f:
+            self.assertEqual(json.load(f), d)
+
+    def test_5_changed_without_id(self):
+        """Tests setting attributes of instances without an id."""
+        self.resetStorage()
+        b = BaseModel(name="x")
+        b.foo = 1
+        self.assertEqual(b.foo, 1)
+        self.assertEqual(storage.all(), {})
+        storage.changed(b, "foo")
+        self.assertEqual(storage.all(), {})
+
+    def test_5_save_external_changes(self):
+        """Tests save() notices objects removed behind its back."""
+        self.resetStorage()
+        objs = [BaseModel() for i in range(3)]
+        storage.save()
+        del storage.all()["BaseModel." + objs[0].id]
+        storage.save()
+        d = {k: v.to_dict() for k, v in storage.all().items()}
+        with open(FileStorage._FileStorage__file_path,
+                  "r", encoding="utf-8") as f:
+            self.assertEqual(json.load(f), d)
+
+    def test_5_save_encoded(self):
+        """Tests save() only encodes the changed objects again."""
+        self.resetStorage()
+        objs = [BaseModel() for i in range(3)]
+        storage.save()
+        storage.reload()
+        objs = list(storage.all().values())
+        storage.save()
+        objs[0].name = "Betty"
+        storage.changed(objs[0])
+        with patch.object(BaseModel, "to_dict",
+                          autospec=True,
+                          side_effect=BaseModel.to_dict) as to_dict:
+            storage.save()
+        self.assertEqual(to_dict.call_count, 1)
+        d = {k: v.to_dict() for k, v in storage.all().items()}
+        with open(FileStorage._FileStorage__file_path,
+                  "r", encoding="utf-8") as f:
+            self.assertEqual(json.load(f), d)
+
+    def resetLazy(self):
+        """Resets the lazy mode."""
+        FileStorage._FileStorage__lazy = False
+        FileStorage._FileStorage__pending = {}
+
+    def test_5_lazy_reload(self):
+        """Tests reload() in lazy mode builds instances on access."""
+        self.resetStorage()
+        self.addCleanup(self.resetLazy)
+        from models.user import User
+        objs = [storage.classes()[c]() for c in storage.classes()]
+        objs += [User() for i in range(5)]
+        storage.save()
+        expected = {k: v.to_dict() for k, v in storage.all().items()}
+        FileStorage._FileStorage__lazy = True
+        storage.reload()
+        self.assertEqual(FileStorage._FileStorage__objects, {})
+        pending = FileStorage._FileStorage__pending
+        self.assertIsInstance(pending["User"]["User." + objs[-1].id], str)
+        self.assertEqual(storage.count(), len(objs))
+        self.assertEqual(storage.count(User), 6)
+        o = storage.get(User, objs[-1].id)
+        self.assertEqual(o.to_dict(), objs[-1].to_dict())
+        self.assertEqual(list(FileStorage._FileStorage__objects),
+                         ["User." + o.id])
+        self.assertIs(storage.get("User", o.id), o)
+        self.assertIsNone(storage.get("User", "6524359"))
+        self.assertEqual(len(storage.all(User)), 6)
+        self.assertEqual(len(FileStorage._FileStorage__objects), 6)
+        self.assertEqual(storage.count(), len(objs))
+        self.assertEqual(
+            {k: v.to_dict() for k, v in storage.all().items()}, expected)
+
+    def test_5_lazy_save(self):
+        """Tests save() in lazy mode keeps the pending records."""
+        self.resetStorage()
+        self.addCleanup(self.resetLazy)
+        objs = [BaseModel() for i in range(5)]
+        storage.save()
+        FileStorage._FileStorage__lazy = True
+        storage.reload()
+        o = storage.get(BaseModel, objs[0].id)
+        o.name = "Laura"
+        storage.delete(storage.get(BaseModel, objs[1].id))
+        b = BaseModel()
+        storage.save()
+        self.assertEqual(len(FileStorage._FileStorage__objects), 2)
+        with open(FileStorage._FileStorage__file_path,
+                  "r", encoding="utf-8") as f:
+            d = json.load(f)
+        self.assertEqual(len(d), 5)
+        self.assertEqual(d["BaseModel." + o.id]["name"], "Laura")
+        self.assertNotIn("BaseModel." + objs[1].id, d)
+        self.assertIn("BaseModel." + b.id, d)
+
+    def test_5_lazy_reset(self):
+        """Tests pending records are dropped with __objects."""
+        self.resetStorage()
+        self.addCleanup(self.resetLazy)
+        BaseModel()
+        storage.save()
+        FileStorage._FileStorage__lazy = True
+        storage.reload()
+        self.resetStorage()
+        self.assertEqual(storage.count(), 0)
+        self.assertEqual(storage.all(), {})
+
+
+    def resetFsync(self):
+        """Resets the fsync policy."""
+        FileStorage._FileStorage__fsync = "batched"
+        FileStorage._FileStorage__fsync_interval = 1.0
+        FileStorage._FileStorage__sync_journal()
+        FileStorage._FileStorage__synced = None
+
+    def test_5_save_atomic(self):
+        """Tests a failed save() leaves the previous file intact."""
+        self.resetStorage()
+        BaseModel()
+        storage.save()
+        with open(FileStorage._FileStorage__file_path,
+                  "r", encoding="utf-8") as f:
+            before = f.read()
+        BaseModel()
+        serializer = FileStorage._FileStorage__serializer
+        with patch.object(serializer, "dump_encoded",
+                          side_effect=OSError("disk full")):
+            with self.assertRaises(OSError):
+                storage.save()
+        with open(FileStorage._FileStorage__file_path,
+                  "r", encoding="utf-8") as f:
+            self.assertEqual(f.read(), before)
+        self.assertEqual([n for n in os.listdir(".") if n.endswith(".tmp")],
+                         [])
+
+    def test_5_save_fsync(self):
+        """Tests the fsync policies of save()."""
+        self.resetStorage()
+        self.addCleanup(self.resetFsync)
+        BaseModel()
+        for policy, syncs in (("always", 6), ("never", 0), ("none", 0),
+                              ("batched", 6)):
+            FileStorage._FileStorage__fsync = policy
+            FileStorage._FileStorage__synced = None
+            with patch("os.fsync") as fsync:
+                for i in range(3):
+                    storage.save()
+            self.assertEqual(fsync.call_count, syncs, policy)
+
+    def test_5_save_fsync_batched(self):
+        """Tests the journal writes left by batched fsync are synced."""
+        self.resetStorage()
+        self.addCleanup(self.resetJournal)
+        self.addCleanup(self.resetFsync)
+        FileStorage._FileStorage__journal = True
+        FileStorage._FileStorage__fsync_interval = 3600
+        FileStorage._FileStorage__synced = None
+        b = BaseModel()
+        with patch("os.fsync") as fsync:
+            for i in range(3):
+                b.name = str(i)
+                b.save()
+            self.assertEqual(fsync.call_count, 1)
+            storage.close()
+            self.assertEqual(fsync.call_count, 2)
+            storage.close()
+            self.assertEqual(fsync.call_count, 2)
+        FileStorage._FileStorage__fsync_interval = 0.2
+        FileStorage._FileStorage__synced = time.monotonic()
+        with patch("os.fsync") as fsync:
+            b.save()
+            b.save()
+            self.assertEqual(fsync.call_count, 0)
+            time.sleep(0.6)
+            self.assertEqual(fsync.call_count, 1)
+
+    def resetGroupCommit(self):
+        """Resets group commit mode."""
+        FileStorage._FileStorage__group_commit = False
+        FileStorage._FileStorage__group_size = 100
+        FileStorage._FileStorage__group_interval = 1.0
+        FileStorage._FileStorage__dirty = 0
+        FileStorage._FileStorage__flushed = None
+
+    def test_5_group_commit(self):
+        """Tests saves are coalesced in group commit mode."""
+        self.resetStorage()
+        self.addCleanup(self.resetGroupCommit)
+        self.resetGroupCommit()
+        FileStorage._FileStorage__group_commit = True
+        FileStorage._FileStorage__group_size = 3
+        FileStorage._FileStorage__group_interval = 3600
+        path = FileStorage._FileStorage__file_path
+        serializer = FileStorage._FileStorage__serializer
+        with patch.object(serializer, "dump_encoded",
+                          wraps=serializer.dump_encoded) as dump:
+            for i in range(6):
+                BaseModel().save()
+            self.assertEqual(dump.call_count, 2)
+            with open(path, "r", encoding="utf-8") as f:
+                self.assertEqual(len(json.load(f)), 4)
+            storage.flush()
+            storage.flush()
+            self.assertEqual(dump.call_count, 3)
+        with open(path, "r", encoding="utf-8") as f:
+            self.assertEqual(len(json.load(f)), 6)
+
+    def test_5_group_commit_reload(self):
+        """Tests reload() writes the deferred saves first."""
+        self.resetStorage()
+        self.addCleanup(self.resetGroupCommit)
+        self.resetGroupCommit()
+        FileStorage._FileStorage__group_commit = True
+        FileStorage._FileStorage__group_interval = 3600
+        BaseModel().save()
+        b = BaseModel()
+        b.save()
+        storage.reload()
+        self.assertIn("BaseModel." + b.id, storage.all())
+
+    def resetWriter(self):
+        """Resets writer mode."""
+        storage.flush()
+        FileStorage._FileStorage__writer_mode = False
+
+    def test_5_writer(self):
+        """Tests saves are written by the writer thread."""
+        self.resetStorage()
+        self.addCleanup(self.resetWriter)
+        FileStorage._FileStorage__writer_mode = True
+        objs = [BaseModel() for i in range(5)]
+        for o in objs:
+            o.name = o.id
+            o.save()
+        storage.flush()
+        self.assertTrue(FileStorage._FileStorage__writer.is_alive())
+        with open(FileStorage._FileStorage__file_path,
+                  "r", encoding="utf-8") as f:
+            d = json.load(f)
+        self.assertEqual(d, {k: v.to_dict()
+                             for k, v in storage.all().items()})
+
+    def test_5_writer_error(self):
+        """Tests a failed write is raised by the next flush."""
+        self.resetStorage()
+        self.addCleanup(self.resetWriter)
+        FileStorage._FileStorage__writer_mode = True
+        b = BaseModel()
+        with patch.object(FileStorage, "_FileStorage__replace",
+                          side_effect=OSError("disk full")):
+            b.save()
+            with self.assertRaises(OSError):
+                storage.flush()
+        storage.flush()
+        self.assertFalse(os.path.isfile(FileStorage._FileStorage__file_path))
+        b.save()
+        storage.flush()
+        storage.reload()
+        self.assertIn("BaseModel." + b.id, storage.all())
+
+    def test_5_full_snapshot_compacting(self):
+        """Tests a full snapshot isn't replaced by a running compaction."""
+        self.resetStorage()
+        self.addCleanup(self.resetJournal)
+        self.addCleanup(setattr, FileStorage, "_FileStorage__journal_limit",
+                        FileStorage._FileStorage__journal_limit)
+        FileStorage._FileStorage__journal = True
+        FileStorage._FileStorage__journal_limit = 3
+        replace = FileStorage._FileStorage__replace
+
+        def slow(*args):
+            if threading.current_thread() is not threading.main_thread():
+                time.sleep(0.3)
+            replace(*args)
+
+        with patch.object(FileStorage, "_FileStorage__replace",
+                          staticmethod(slow)):
+            objs = [BaseModel() for i in range(3)]
+            storage.save()
+            FileStorage._FileStorage__failed = True
+            b = BaseModel()
+            storage.save()
+        with open(FileStorage._FileStorage__file_path,
+                  "r", encoding="utf-8") as f:
+            self.assertIn("BaseModel." + b.id, json.load(f))
+        storage.reload()
+        self.assertEqual(storage.count(), 4)
+
+    def test_5_writer_error_journal(self):
+        """Tests a failed journal write isn't lost by the next saves."""
+        self.resetStorage()
+        self.addCleanup(self.resetJournal)
+        self.addCleanup(self.resetWriter)
+        FileStorage._FileStorage__writer_mode = True
+        FileStorage._FileStorage__journal = True
+        a, b, c = BaseModel(), BaseModel(), BaseModel()
+        storage.save()
+        storage.flush()
+        with patch.object(FileStorage, "_FileStorage__append_journal",
+                          side_effect=OSError("disk full")):
+            storage.delete(b)
+            storage.save()
+            FileStorage._FileStorage__writer_queue.join()
+        storage.delete(c)
+        with self.assertRaises(OSError):
+            storage.save()
+        storage.flush()
+        storage.reload()
+        self.assertIn("BaseModel." + a.id, storage.all())
+        self.assertNotIn("BaseModel." + b.id, storage.all())
+        self.assertNotIn("BaseModel." + c.id, storage.all())
+
+    def resetSharded(self):
+        """Resets sharded mode and removes the shards."""
+        FileStorage._FileStorage__sharded = False
+        FileStorage._FileStorage__shard_counts = {"Place": 4, "Review": 4}
+        path = FileStorage._FileStorage__file_path + ".d"
+        if os.path.isdir(path):
+            shutil.rmtree(path)
+
+    def shards(self):
+        """Returns the contents of the shard files, by name."""
+        path = FileStorage._FileStorage__file_path + ".d"
+        shards = {}
+        for name in os.listdir(path):
+            if not name.endswith(".json"):
+                continue
+            with open(os.path.join(path, name), "r", encoding="utf-8") as f:
+                shards[name] = json.load(f)
+        return shards
+
+    def test_5_sharded_save(self):
+        """Tests save() writes one file per class or hash shard."""
+        self.resetStorage()
+        self.addCleanup(self.resetSharded)
+        FileStorage._FileStorage__sharded = True
+        objs = {c: [storage.classes()[c]() for i in range(20)]
+                for c in ("Amenity", "Review", "User")}
+        storage.save()
+        shards = self.shards()
+        self.assertEqual(sorted(shards), ["Amenity.json", "Review.0.json",
+                                          "Review.1.json", "Review.2.json",
+                                          "Review.3.json", "User.json"])
+        self.assertEqual(len(shards["Amenity.json"]), 20)
+        self.assertEqual(sum(len(v) for k, v in shards.items()
+                             if k.startswith("Review")), 20)
+        self.assertFalse(os.path.isfile(FileStorage._FileStorage__file_path))
+        objs["Amenity"][0].name = "Wifi"
+        with patch.object(FileStorage, "_FileStorage__replace",
+                          wraps=FileStorage._FileStorage__replace) as replace:
+            storage.save()
+        self.assertEqual([c[0][0] for c in replace.call_args_list],
+                         [os.path.join(FileStorage._FileStorage__file_path +
+                                       ".d", "Amenity.json")])
+        for o in objs["User"]:
+            storage.delete(o)
+        storage.save()
+        self.assertNotIn("User.json", self.shards())
+        storage.reload()
+        self.assertEqual(storage.count(), 40)
+        self.assertEqual(storage.get("Amenity", objs["Amenity"][0].id).name,
+                         "Wifi")
+
+    def test_5_sharded_full(self):
+        """Tests a full save removes the shards of dropped objects."""
+        self.resetStorage()
+        self.addCleanup(self.resetSharded)
+        FileStorage._FileStorage__sharded = True
+        BaseModel()
+        storage.save()
+        FileStorage._FileStorage__objects = {}
+        u = storage.classes()["User"]()
+        storage.save()
+        self.assertEqual(list(self.shards()), ["User.json"])
+
+    def test_5_sharded_migrate(self):
+        """Tests reload() migrates file.json to shards."""
+        self.resetStorage()
+        self.addCleanup(self.resetSharded)
+        objs = [storage.classes()[c]() for c in storage.classes()]
+        storage.save()
+        expected = {k: v.to_dict() for k, v in storage.all().items()}
+        FileStorage._FileStorage__sharded = True
+        storage.reload()
+        self.assertFalse(os.path.isfile(FileStorage._FileStorage__file_path))
+        records = {}
+        for v in self.shards().values():
+            records.update(v)
+        self.assertEqual(records, expected)
+        storage.reload()
+        self.assertEqual(
+            {k: v.to_dict() for k, v in storage.all().items()}, expected)
+
+    def test_5_sharded_counts(self):
+        """Tests reload() moves objects to shards of new shard counts."""
+        self.resetStorage()
+        self.addCleanup(self.resetSharded)
+        FileStorage._FileStorage__sharded = True
+        objs = [storage.classes()["Review"]() for i in range(20)]
+        storage.save()
+        FileStorage._FileStorage__shard_counts = {"Review": 2}
+        storage.reload()
+        self.assertEqual(sorted(self.shards()),
+                         ["Review.0.json", "Review.1.json"])
+        for o in storage.all().values():
+            o.text = "Great"
+            storage.changed(o, "text")
+            break
+        storage.save()
+        storage.reload()
+        self.assertEqual(storage.count("Review"), 20)
+        self.assertEqual(len(storage.find("Review", text="Great")), 1)
+        FileStorage._FileStorage__shard_counts = {}
+        storage.reload()
+        self.assertEqual(list(self.shards()), ["Review.json"])
+        self.assertEqual(len(self.shards()["Review.json"]), 20)
+
+    def resetThreadsafe(self):
+        """Resets thread-safe mode."""
+        FileStorage._FileStorage__threadsafe = False
+
+    def test_5_threadsafe(self):
+        """Tests objects change in threads while others save."""
+        self.resetStorage()
+        self.addCleanup(self.resetThreadsafe)
+        FileStorage._FileStorage__threadsafe = True
+        classes = storage.classes()
+        errors = []
+
+        def work(classname):
+            try:
+                for i in range(50):
+                    o = classes[classname]()
+                    o.number = i
+                    if i % 2:
+                        storage.delete(o)
+                    if i % 10 == 0:
+                        storage.save()
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=work, args=(c,))
+                   for c in ("BaseModel", "User", "Place", "Review") * 2]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(errors, [])
+        self.assertEqual(storage.count(), 8 * 25)
+        self.assertEqual(storage.count("Place"), 2 * 25)
+        storage.save()
+        expected = {k: v.to_dict() for k, v in storage.all().items()}
+        with open(FileStorage._FileStorage__file_path, "r") as f:
+            self.assertEqual(json.load(f), expected)
+
+    def test_5_threadsafe_all(self):
+        """Tests all() returns a copy in thread-safe mode."""
+        self.resetStorage()
+        self.addCleanup(self.resetThreadsafe)
+        FileStorage._FileStorage__threadsafe = True
+        b = BaseModel()
+        objs = storage.all()
+        BaseModel()
+        self.assertEqual(list(objs), ["BaseModel." + b.id])
+        self.assertEqual(len(storage.all("BaseModel")), 2)
+
+    def test_5_threadsafe_find(self):
+        """Tests find() while objects are added in other threads."""
+        from models.place import Place
+        self.resetStorage()
+        self.addCleanup(self.resetThreadsafe)
+        FileStorage._FileStorage__threadsafe = True
+        for city_id in ("a", "b", "c"):
+            Place().city_id = city_id
+        for o in storage.all("Place").values():
+            storage.changed(o)
+        errors = []
+
+        def work():
+            try:
+                for i in range(200):
+                    o = Place()
+                    o.city_id = "a"
+                    storage.changed(o)
+                    storage.find("Place", city_id="a")
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=work) for i in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(errors, [])
+        self.assertEqual(len(storage.find("Place", city_id="a")), 801)
 
 if __name__ == '__main__':
     unittest.main()
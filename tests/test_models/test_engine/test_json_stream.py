@@ -0,0 +1,99 @@
+#!/usr/bin/python3
+"""Unittest module for the json_stream module."""
+
+import unittest
+import json
+import random
+from io import StringIO
+from models.engine.json_stream import iter_items, raw_items
+
+
+class TestJsonStream(unittest.TestCase):
+    """Test Cases for the iter_items and raw_items functions."""
+
+    records = {
+        "BaseModel.1": {"id": "1", "__class__": "BaseModel",
+                        "name": "a \"quoted\" }, string"},
+        "Place.2": {"id": "2", "__class__": "Place",
+                    "amenity_ids": ["x", "y"], "latitude": 3.14,
+                    "nested": {"a": [1, {"b": None}]}},
+        "User.3": {"id": "3", "__class__": "User", "email": "\u00e9"}
+    }
+
+    def help_test_iter_items(self, text, chunk_size):
+        """Helps test iter_items() for a text and a chunk size."""
+        items = list(iter_items(StringIO(text), chunk_size))
+        self.assertEqual(items, list(json.loads(text).items()))
+
+    def test_iter_items(self):
+        """Tests iter_items() with all chunk sizes."""
+        text = json.dumps(self.records)
+        for chunk_size in range(1, 40):
+            self.help_test_iter_items(text, chunk_size)
+        self.help_test_iter_items(text, 65536)
+
+    def test_iter_items_whitespace(self):
+        """Tests iter_items() with indented JSON."""
+        text = json.dumps(self.records, indent=4)
+        for chunk_size in (1, 7, 65536):
+            self.help_test_iter_items(text, chunk_size)
+
+    def test_iter_items_empty(self):
+        """Tests iter_items() with an empty object."""
+        self.assertEqual(list(iter_items(StringIO("{}"))), [])
+        self.assertEqual(list(iter_items(StringIO(" { \n } "), 1)), [])
+
+    def test_iter_items_scalars(self):
+        """Tests iter_items() with scalars split across chunks."""
+        rand = random.Random(89)
+        values = [0, -7, 12345678901234, 3.14, -0.25, 1.5e-10, 6.02e+23,
+                  True, False, None, "", "x", [], {}, [1.5, -2], {"a": 1e5}]
+        for i in range(20):
+            d = {str(k): rand.choice(values) for k in range(10)}
+            for separators in ((", ", ": "), (",", ":")):
+                text = json.dumps(d, separators=separators)
+                for chunk_size in range(1, 65):
+                    self.help_test_iter_items(text, chunk_size)
+
+    def test_iter_items_reads(self):
+        """Tests iter_items() doesn't read a long item in small chunks."""
+        text = json.dumps({"a": "x" * 100000, "b": 1})
+        f = StringIO(text)
+        reads = []
+        read = f.read
+        f.read = lambda size: reads.append(size) or read(size)
+        self.assertEqual(list(iter_items(f, 1)),
+                         list(json.loads(text).items()))
+        self.assertLess(len(reads), 50)
+
+    def test_iter_items_errors(self):
+        """Tests iter_items() with malformed files."""
+        for text in ("", "[]", '{"a": 1', '{"a" 1}', '{"a": 1 "b": 2}',
+                     '{"a": {"b": 1}'):
+            with self.assertRaises(ValueError):
+                list(iter_items(StringIO(text), 2))
+
+    def test_raw_items(self):
+        """Tests raw_items() splits the items without decoding them."""
+        records = {
+            "BaseModel.1": {"id": "1", "name": "a \"quoted\" string"},
+            "Place.2": {"id": "2", "amenity_ids": ["x", "y"]},
+            "User.3": {}
+        }
+        items = raw_items(json.dumps(records))
+        self.assertEqual(list(items), list(records))
+        for k, v in items.items():
+            self.assertIsInstance(v, str)
+            self.assertEqual(json.loads(v), records[k])
+        self.assertEqual(raw_items("{}"), {})
+
+    def test_raw_items_fallback(self):
+        """Tests raw_items() returns None for texts it can't split."""
+        for records in (self.records, {"a": 1}, {"a\"b": {"id": "1"}},
+                        {"a": {"name": "}"}}):
+            self.assertIsNone(raw_items(json.dumps(records)))
+        self.assertIsNone(raw_items(json.dumps(self.records, indent=4)))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,96 @@
+#!/usr/bin/python3
+"""Unittest module for the parallel decoding of JSON object files."""
+
+import unittest
+import json
+import os
+from models import storage
+from models.base_model import BaseModel
+from models.engine.file_storage import FileStorage
+from models.engine.parallel import split, read_range, read_parallel
+
+
+class TestParallel(unittest.TestCase):
+    """Test Cases for the parallel decoding of JSON object files."""
+
+    path = "test_parallel.json"
+
+    def tearDown(self):
+        """Tears down test methods."""
+        FileStorage._FileStorage__workers = 0
+        FileStorage._FileStorage__objects = {}
+        for path in (self.path, FileStorage._FileStorage__file_path):
+            if os.path.isfile(path):
+                os.remove(path)
+
+    def write(self, d):
+        """Writes d to the test file like save() does."""
+        with open(self.path, "w", encoding="utf-8") as f:
+            json.dump(d, f)
+
+    def records(self, n):
+        """Returns n records of every class, by key."""
+        d = {}
+        for classname, cls in storage.classes().items():
+            for i in range(n):
+                o = cls(id="{}-{}".format(classname, i),
+                        created_at="2017-09-28T21:05:54.119427",
+                        updated_at="2017-09-28T21:05:54.119572",
+                        name='}, "tricky" {' + str(i))
+                d["{}.{}".format(classname, o.id)] = o.to_dict()
+        return d
+
+    def test_split(self):
+        """Tests the ranges hold every item once."""
+        d = self.records(30)
+        self.write(d)
+        for n in (1, 2, 7, 1000):
+            ranges = split(self.path, n)
+            self.assertLessEqual(len(ranges), n)
+            records = {}
+            for start, end in ranges:
+                r, o = read_range(self.path, start, end, storage.classes())
+                self.assertEqual(set(r), set(o))
+                records.update(r)
+            self.assertEqual(records, d)
+        self.write({})
+        self.assertEqual(split(self.path, 4), [])
+
+    def test_read_parallel(self):
+        """Tests the records and instances built by worker processes."""
+        d = self.records(20)
+        self.write(d)
+        records, objs = read_parallel([self.path], storage.classes(), 3)
+        self.assertEqual(records, d)
+        self.assertEqual({k: v.to_dict() for k, v in objs.items()}, d)
+        records, objs = read_parallel([self.path], storage.classes(), 3,
+                                      False)
+        self.assertEqual(records, {})
+        self.assertEqual({k: v.to_dict() for k, v in objs.items()}, d)
+
+    def test_nested(self):
+        """Tests ranges splitting an item are reported."""
+        self.write({"BaseModel.{}".format(i): {
+            "__class__": "BaseModel", "id": str(i),
+            "created_at": "2017-09-28T21:05:54.119427",
+            "updated_at": "2017-09-28T21:05:54.119572",
+            "d": {"a": {"b": "x" * 100}, "c": {"e": "y" * 100}}}
+            for i in range(5)})
+        with self.assertRaises(ValueError):
+            read_parallel([self.path], storage.classes(), 8)
+
+    def test_reload(self):
+        """Tests reload() with worker processes."""
+        objs = [BaseModel() for i in range(50)]
+        objs[0].d = {"a": {"b": 1}, "c": 2}
+        storage.save()
+        expected = {k: v.to_dict() for k, v in storage.all().items()}
+        for workers in (2, 4):
+            FileStorage._FileStorage__workers = workers
+            storage.reload()
+            self.assertEqual(
+                {k: v.to_dict() for k, v in storage.all().items()}, expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,127 @@
+#!/usr/bin/python3
+"""Unittest module for the snapshot formats of FileStorage."""
+
+import unittest
+import io
+import os
+import pickle
+from datetime import datetime
+from models import storage
+from models.engine.file_storage import FileStorage
+from models.engine.serializers import (serializers, by_extension, convert,
+                                       read, write)
+
+
+class TestSerializers(unittest.TestCase):
+    """Test Cases for the snapshot formats of FileStorage."""
+
+    def tearDown(self):
+        """Tears down test methods."""
+        FileStorage._FileStorage__serializer = serializers["json"]
+        FileStorage._FileStorage__objects = {}
+        for path in ("file.json", "file.hbnb", "test.json", "test.hbnb"):
+            if os.path.isfile(path):
+                os.remove(path)
+
+    def records(self):
+        """Returns records of every class, with odd ones."""
+        d = {}
+        for classname, cls in storage.classes().items():
+            o = cls()
+            o.name = "Laura"
+            o.number = 89
+            o.ids = ["a", 1, 2.5, None]
+            d["{}.{}".format(classname, o.id)] = o.to_dict()
+        d["BaseModel.other"] = {"__class__": "BaseModel", "id": "89",
+                                "created_at": "2017-09-28T21:05:54",
+                                "updated_at": "2017-09-28T21:05:54.1"}
+        d["User.tz"] = {"__class__": "User", "id": "tz",
+                        "created_at": "2017-09-28T21:05:54+02:00",
+                        "updated_at": "2017-09-28T21:05:54.119572"}
+        FileStorage._FileStorage__objects = {}
+        return d
+
+    def test_round_trip(self):
+        """Tests every format gives back the records in order."""
+        d = self.records()
+        for serializer in serializers.values():
+            f = io.BytesIO() if serializer.binary else io.StringIO()
+            serializer.dump(d, f)
+            f.seek(0)
+            items = list(serializer.items(f))
+            self.assertEqual(items, list(d.items()), serializer.name)
+
+    def test_encoded(self):
+        """Tests dump_encoded() writes the file dump() writes."""
+        d = self.records()
+        for serializer in serializers.values():
+            f, g = io.BytesIO(), io.BytesIO()
+            if not serializer.binary:
+                f, g = io.StringIO(), io.StringIO()
+            serializer.dump(d, f)
+            serializer.dump_encoded(
+                {k: serializer.encode(k, v) for k, v in d.items()}, g)
+            self.assertEqual(g.getvalue(), f.getvalue())
+
+    def test_binary_size(self):
+        """Tests the binary format is smaller than JSON."""
+        d = self.records()
+        write("test.json", d)
+        write("test.hbnb", d)
+        self.assertLess(os.path.getsize("test.hbnb"),
+                        os.path.getsize("test.json"))
+
+    def test_binary_safe(self):
+        """Tests binary snapshots can't load other types."""
+        f = io.BytesIO()
+        pickle.dump({"format": "hbnb", "version": 1, "classes": [],
+                     "schemas": [], "rows": [(-1, "k", os.getcwd)]}, f)
+        f.seek(0)
+        with self.assertRaises(pickle.UnpicklingError):
+            list(serializers["binary"].items(f))
+
+    def test_convert(self):
+        """Tests converting snapshots between formats."""
+        d = self.records()
+        write("test.json", d)
+        convert("test.json", "test.hbnb")
+        self.assertEqual(read("test.hbnb"), d)
+        os.remove("test.json")
+        convert("test.hbnb", "test.json")
+        self.assertEqual(read("test.json"), d)
+        with self.assertRaises(ValueError):
+            by_extension("test.txt")
+
+    def test_storage(self):
+        """Tests FileStorage saves and reloads binary snapshots."""
+        FileStorage._FileStorage__serializer = serializers["binary"]
+        objs = [cls() for cls in storage.classes().values()]
+        objs[0].name = "Laura"
+        storage.save()
+        self.assertTrue(os.path.isfile("file.hbnb"))
+        self.assertFalse(os.path.isfile("file.json"))
+        expected = {k: v.to_dict() for k, v in storage.all().items()}
+        storage.reload()
+        self.assertEqual({k: v.to_dict()
+                          for k, v in storage.all().items()}, expected)
+        self.assertEqual(storage.get("BaseModel", objs[0].id).name, "Laura")
+
+    def test_storage_unsafe(self):
+        """Tests saving a value binary snapshots can't load fails."""
+        FileStorage._FileStorage__serializer = serializers["binary"]
+        b = storage.classes()["BaseModel"]()
+        storage.save()
+        b.when = datetime.now()
+        with self.assertRaises(TypeError):
+            storage.save()
+        self.assertEqual([n for n in os.listdir(".") if n.endswith(".tmp")],
+                         [])
+        storage.reload()
+        self.assertIsNotNone(storage.get("BaseModel", b.id))
+        self.assertFalse(hasattr(storage.get("BaseModel", b.id), "when"))
+        with self.assertRaises(TypeError):
+            serializers["binary"].dump({"k": {"v": 1j}}, io.BytesIO())
+
+
+if __name__ == '__main__':
+    unittest.main()
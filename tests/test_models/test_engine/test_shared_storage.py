@@ -0,0 +1,143 @@
+#!/usr/bin/python3
+"""Unittest module for the shared mode of FileStorage."""
+
+import unittest
+import json
+import multiprocessing
+import os
+from unittest.mock import patch
+from models import storage
+from models.base_model import BaseModel
+from models.engine.file_storage import FileStorage, ConflictError
+
+
+def other_process(function):
+    """Runs function in another process, on its own reloaded storage."""
+    def run():
+        storage.reload()
+        function()
+    p = multiprocessing.get_context("fork").Process(target=run)
+    p.start()
+    p.join()
+    if p.exitcode != 0:
+        raise RuntimeError("the other process failed")
+
+
+class TestSharedStorage(unittest.TestCase):
+    """Test Cases for the shared mode of FileStorage."""
+
+    def setUp(self):
+        """Sets up test methods."""
+        FileStorage._FileStorage__shared = True
+        FileStorage._FileStorage__objects = {}
+        self.removeFiles()
+        storage.reload()
+
+    def tearDown(self):
+        """Tears down test methods."""
+        FileStorage._FileStorage__shared = False
+        FileStorage._FileStorage__conflict_policy = "merge"
+        FileStorage._FileStorage__objects = {}
+        self.removeFiles()
+
+    def removeFiles(self):
+        """Removes the files of the store."""
+        path = FileStorage._FileStorage__file_path
+        for p in (path, path + ".lock", path + ".generation"):
+            if os.path.isfile(p):
+                os.remove(p)
+
+    def stored(self):
+        """Returns the records of file.json."""
+        with open(FileStorage._FileStorage__file_path,
+                  "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def test_no_lost_update(self):
+        """Tests saves of two processes keep each other's objects."""
+        a = BaseModel()
+        a.save()
+        other_process(lambda: BaseModel().save())
+        b = BaseModel()
+        b.save()
+        d = self.stored()
+        self.assertEqual(len(d), 3)
+        self.assertIn("BaseModel." + a.id, d)
+        self.assertIn("BaseModel." + b.id, d)
+        self.assertEqual(sorted(storage.all()), sorted(d))
+
+    def test_refresh(self):
+        """Tests reads see the objects saved by another process."""
+        a = BaseModel()
+        a.save()
+
+        def change():
+            o = storage.get("BaseModel", a.id)
+            o.name = "Betty"
+            o.save()
+            storage.delete(o)
+            BaseModel().save()
+        other_process(change)
+        self.assertEqual(storage.count(), 1)
+        self.assertIsNone(storage.get("BaseModel", a.id))
+
+    def test_refresh_generation(self):
+        """Tests reads see saves which left the same file attributes."""
+        a = BaseModel()
+        a.name = "Laura"
+        a.save()
+        st = os.stat(FileStorage._FileStorage__file_path)
+
+        def change():
+            o = storage.get("BaseModel", a.id)
+            o.name = "Betty"
+            o.save()
+        other_process(change)
+        with patch("os.stat", return_value=st):
+            self.assertEqual(storage.get("BaseModel", a.id).name, "Betty")
+
+    def test_merge(self):
+        """Tests objects changed by both processes are merged."""
+        a = BaseModel()
+        a.name = "Laura"
+        a.save()
+
+        def change():
+            o = storage.get("BaseModel", a.id)
+            o.name = "Betty"
+            o.save()
+        a.number = 89
+        other_process(change)
+        a.save()
+        record = self.stored()["BaseModel." + a.id]
+        self.assertEqual(record["name"], "Betty")
+        self.assertEqual(record["number"], 89)
+        self.assertEqual(storage.get("BaseModel", a.id).name, "Betty")
+
+    def test_conflict(self):
+        """Tests the fail policy reports conflicting objects."""
+        FileStorage._FileStorage__conflict_policy = "fail"
+        a = BaseModel()
+        b = BaseModel()
+        storage.save()
+
+        def change():
+            o = storage.get("BaseModel", a.id)
+            o.name = "Betty"
+            o.save()
+        a.name = "Laura"
+        b.name = "Holberton"
+        other_process(change)
+        with self.assertRaises(ConflictError) as e:
+            storage.save()
+        self.assertEqual(e.exception.args, ("BaseModel." + a.id,))
+        self.assertNotIn("name", self.stored()["BaseModel." + b.id])
+        self.assertEqual(storage.get("BaseModel", a.id).name, "Betty")
+        storage.save()
+        d = self.stored()
+        self.assertEqual(d["BaseModel." + a.id]["name"], "Betty")
+        self.assertEqual(d["BaseModel." + b.id]["name"], "Holberton")
+
+
+if __name__ == '__main__':
+    unittest.main()
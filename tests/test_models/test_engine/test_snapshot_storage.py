@@ -0,0 +1,83 @@
+#!/usr/bin/python3
+"""Unittest module for the SnapshotStorage class."""
+
+import unittest
+import os
+from models import storage
+from models.base_model import BaseModel
+from models.engine.file_storage import FileStorage
+from models.engine.snapshot_storage import SnapshotStorage, write
+
+
+class TestSnapshotStorage(unittest.TestCase):
+    """Test Cases for the SnapshotStorage class."""
+
+    def setUp(self):
+        """Sets up test methods."""
+        SnapshotStorage._SnapshotStorage__file_path = "test_file.snap"
+        self.snapshot = SnapshotStorage()
+        FileStorage._FileStorage__objects = {}
+        self.objs = [cls() for cls in storage.classes().values()
+                     for i in range(3)]
+        self.objs[0].name = "Laura"
+        self.objs[-1].place_id = "89"
+        self.records = {k: v.to_dict() for k, v in storage.all().items()}
+        write("test_file.snap", self.records)
+        self.snapshot.reload()
+
+    def tearDown(self):
+        """Tears down test methods."""
+        self.snapshot.close()
+        SnapshotStorage._SnapshotStorage__file_path = "file.snap"
+        FileStorage._FileStorage__objects = {}
+        if os.path.isfile("test_file.snap"):
+            os.remove("test_file.snap")
+
+    def test_all(self):
+        """Tests all() decodes every record."""
+        d = self.snapshot.all()
+        self.assertEqual(sorted(d), sorted(self.records))
+        self.assertEqual({k: v.to_dict() for k, v in d.items()},
+                         self.records)
+        self.assertEqual(len(self.snapshot.all("Place")), 3)
+        self.assertEqual(self.snapshot.all("Foo"), {})
+
+    def test_get_count(self):
+        """Tests get() and count() through the index."""
+        o = self.objs[0]
+        got = self.snapshot.get(type(o), o.id)
+        self.assertEqual(got.to_dict(), o.to_dict())
+        self.assertIsNot(got, o)
+        self.assertIsNone(self.snapshot.get("BaseModel", "nope"))
+        self.assertIsNone(self.snapshot.get("BaseModel", o.id + "0" * 50))
+        self.assertIsNone(self.snapshot.get("User", o.id))
+        self.assertEqual(self.snapshot.count(), len(self.records))
+        self.assertEqual(self.snapshot.count(BaseModel), 3)
+        self.assertEqual(self.snapshot.count("State"), 3)
+        self.assertEqual(self.snapshot.count("Foo"), 0)
+        self.assertEqual(list(self.snapshot.find("Review", place_id="89")),
+                         ["Review." + self.objs[-1].id])
+
+    def test_read_only(self):
+        """Tests the storage refuses writes."""
+        with self.assertRaises(PermissionError):
+            self.snapshot.save()
+        with self.assertRaises(PermissionError):
+            self.snapshot.new(self.objs[0])
+        with self.assertRaises(PermissionError):
+            self.snapshot.delete(self.objs[0])
+
+    def test_empty(self):
+        """Tests a missing or empty snapshot."""
+        write("test_file.snap", {})
+        self.snapshot.reload()
+        self.assertEqual(self.snapshot.all(), {})
+        self.assertEqual(self.snapshot.count("User"), 0)
+        self.assertIsNone(self.snapshot.get("User", "89"))
+        os.remove("test_file.snap")
+        self.snapshot.reload()
+        self.assertEqual(self.snapshot.count(), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,135 @@
+#!/usr/bin/python3
+"""Unittest module for the SQLiteStorage class."""
+
+import unittest
+import os
+import sqlite3
+from models.base_model import BaseModel
+from models.place import Place
+from models.review import Review
+from models.user import User
+from models.engine.sqlite_storage import SQLiteStorage
+
+
+class TestSQLiteStorage(unittest.TestCase):
+    """Test Cases for the SQLiteStorage class."""
+
+    def setUp(self):
+        """Sets up test methods."""
+        SQLiteStorage._SQLiteStorage__file_path = "test_file.db"
+        self.resetStorage()
+
+    def tearDown(self):
+        """Tears down test methods."""
+        self.storage.close()
+        if os.path.isfile("test_file.db"):
+            os.remove("test_file.db")
+        SQLiteStorage._SQLiteStorage__file_path = "file.db"
+
+    def resetStorage(self):
+        """Resets SQLiteStorage data."""
+        self.storage = SQLiteStorage()
+        self.storage.close()
+        if os.path.isfile("test_file.db"):
+            os.remove("test_file.db")
+        self.storage.reload()
+
+    def add(self, cls, **kwargs):
+        """Returns a new instance of cls added to the storage."""
+        o = cls()
+        for k, v in kwargs.items():
+            setattr(o, k, v)
+        self.storage.new(o)
+        return o
+
+    def rows(self, classname):
+        """Returns the rows of the table of classname."""
+        with sqlite3.connect("test_file.db") as db:
+            return db.execute("SELECT * FROM {}".format(classname)).fetchall()
+
+    def test_tables(self):
+        """Tests a table is created for every class."""
+        with sqlite3.connect("test_file.db") as db:
+            tables = [r[0] for r in db.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'table'")]
+            indexes = [r[0] for r in db.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'index'")]
+        self.assertEqual(sorted(tables), sorted(self.storage.classes()))
+        self.assertIn("Place_city_id", indexes)
+        self.assertIn("Review_place_id", indexes)
+
+    def test_save_reload(self):
+        """Tests objects are saved and reloaded."""
+        p = self.add(Place, name="Loft", number_rooms=3, latitude=1.5,
+                     amenity_ids=["a", "b"], foo="bar")
+        u = self.add(User, email="a@b.c")
+        b = self.add(BaseModel)
+        self.storage.save()
+        d = {k: v.to_dict() for k, v in self.storage.all().items()}
+        self.storage.reload()
+        self.assertEqual(self.storage.count(), 3)
+        self.assertEqual({k: v.to_dict()
+                          for k, v in self.storage.all().items()}, d)
+        o = self.storage.get("Place", p.id)
+        self.assertIsNot(o, p)
+        self.assertIs(type(o), Place)
+        self.assertEqual(o.amenity_ids, ["a", "b"])
+        self.assertEqual(o.created_at, p.created_at)
+        self.assertIs(self.storage.get(Place, p.id), o)
+        self.assertIsNone(self.storage.get("Place", u.id))
+        self.assertIsNone(self.storage.get("Foo", u.id))
+
+    def test_per_row_writes(self):
+        """Tests save() only writes changed and deleted rows."""
+        a = self.add(User, email="a")
+        b = self.add(User, email="b")
+        self.storage.save()
+        self.assertEqual(len(self.rows("User")), 2)
+        with sqlite3.connect("test_file.db") as db:
+            db.execute("UPDATE User SET email = 'x' WHERE id = ?", (b.id,))
+        a.first_name = "Betty"
+        self.storage.changed(a, "first_name")
+        self.storage.save()
+        rows = {r[0]: r for r in self.rows("User")}
+        self.assertIn("Betty", rows[a.id])
+        self.assertIn("x", rows[b.id])
+        self.storage.delete(b)
+        self.assertIsNone(self.storage.get("User", b.id))
+        self.assertEqual(self.storage.count("User"), 1)
+        self.storage.save()
+        self.assertEqual(sorted(rows), sorted([a.id, b.id]))
+        self.assertEqual([r[0] for r in self.rows("User")], [a.id])
+
+    def test_all_count(self):
+        """Tests all() and count() with a class."""
+        places = [self.add(Place) for i in range(3)]
+        self.add(User)
+        self.assertEqual(self.storage.count("Place"), 3)
+        self.storage.save()
+        self.storage.reload()
+        self.assertEqual(self.storage.count(Place), 3)
+        self.assertEqual(self.storage.count("Amenity"), 0)
+        self.assertEqual(sorted(self.storage.all(Place)),
+                         sorted("Place." + p.id for p in places))
+        self.assertEqual(self.storage.all("Foo"), {})
+
+    def test_find(self):
+        """Tests find() through the database and the unsaved objects."""
+        r1 = self.add(Review, place_id="1", text="good")
+        r2 = self.add(Review, place_id="2", text="good")
+        self.storage.save()
+        self.storage.reload()
+        r3 = self.add(Review, place_id="1", text="bad")
+        found = self.storage.find("Review", place_id="1")
+        self.assertEqual(sorted(found), sorted(["Review." + r1.id,
+                                                "Review." + r3.id]))
+        self.assertEqual(list(self.storage.find(Review, place_id="1",
+                                                text="bad")),
+                         ["Review." + r3.id])
+        self.assertEqual(list(self.storage.find("Review", place_id="2")),
+                         ["Review." + r2.id])
+        self.assertEqual(self.storage.find("Foo", place_id="1"), {})
+
+
+if __name__ == '__main__':
+    unittest.main()